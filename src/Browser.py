@@ -1,5 +1,10 @@
-from src.setup_logging import logger
+from src.setup_logging import call_log, logger
+import html
+import os
+import tempfile
 import webbrowser
+from pathlib import Path
+from src.playlist_shared_utils import YOUTUBE_EMBED_URL, extract_video_id
 
 
 class Browser:
@@ -8,12 +13,21 @@ class Browser:
     Attributes:
         browser_executable_path (str): Path to the browser executable.
         browser_logger (Logger): Logger instance for logging events.
+        controller (webbrowser.BaseBrowser): The browser controller, looked up once on first use.
     """
 
-    def __init__(self, browser_executable_path: str, browser_logger: logger):
+    def __init__(self, browser_executable_path: str, browser_logger: logger, controller=None):
         self.browser_executable_path = browser_executable_path
         self.browser_logger = browser_logger
+        self._controller = controller
 
+    @property
+    def controller(self):
+        if self._controller is None:
+            self._controller = webbrowser.get(self.browser_executable_path)
+        return self._controller
+
+    @call_log
     def open_browser_with_url(self, url: str):
         """Opens the browser to load the given URL.
 
@@ -23,8 +37,54 @@ class Browser:
         Returns:
             None
         """
-        self.browser_logger.info(self.browser_executable_path, url)
+        self.browser_logger.info("opening %s with %s", url, self.browser_executable_path)
         try:
-            webbrowser.get(self.browser_executable_path).open(url, 2)
+            self.controller.open(url, 2)
         except webbrowser.Error as e:
             self.browser_logger.info(f"issue opening web browser with this url: {e}")
+
+    @staticmethod
+    def write_playlist_page(songs: list[tuple[str, str]], page_file_name: str) -> str:
+        """Writes a local html page that plays the songs in order, with a link to each.
+
+        The songs with a YouTube video id play one after another in an embedded player.
+
+        Args:
+            songs (list): Name and url tuples of the songs, in play order.
+            page_file_name (str): File to write the page to.
+
+        Returns:
+            str: The file url of the page.
+        """
+        video_ids = [video_id for video_id in (extract_video_id(url) for _, url in songs) if video_id]
+        lines = ["<!DOCTYPE html>", "<html>", "<head><meta charset=\"utf-8\"><title>random music</title></head>",
+                 "<body>"]
+        if video_ids:
+            embed_url = f"{YOUTUBE_EMBED_URL}{video_ids[0]}?autoplay=1&playlist={','.join(video_ids[1:])}"
+            lines.append(
+                f"<iframe width=\"960\" height=\"540\" src=\"{html.escape(embed_url)}\" "
+                f"allow=\"autoplay; encrypted-media\" allowfullscreen></iframe>"
+            )
+        lines.append("<ol>")
+        lines.extend(f"<li><a href=\"{html.escape(url)}\">{html.escape(name)}</a></li>" for name, url in songs)
+        lines.extend(["</ol>", "</body>", "</html>"])
+        with open(page_file_name, "w", encoding="utf-8") as page_handle:
+            page_handle.write("\n".join(lines) + "\n")
+        return Path(os.path.abspath(page_file_name)).as_uri()
+
+    def open_playlist_page(self, songs: list[tuple[str, str]], page_file_name: str = None):
+        """Writes the songs to a local playlist page and opens it with one browser launch.
+
+        Args:
+            songs (list): Name and url tuples of the songs, in play order.
+            page_file_name (str): File to write the page to, a new temporary file when not given.
+
+        Returns:
+            str: The file url of the page.
+        """
+        if page_file_name is None:
+            page_handle, page_file_name = tempfile.mkstemp(prefix="random_music_", suffix=".html")
+            os.close(page_handle)
+        page_url = self.write_playlist_page(songs, page_file_name)
+        self.open_browser_with_url(page_url)
+        return page_url
@@ -0,0 +1,344 @@
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from functools import partial
+from src.metrics import count_rows
+from src.myhtmlparser import BookmarksStreamParser
+from src.read_handlers.readhandler import ReadHandler
+from src.setup_logging import call_log, logger, raise_and_log
+from src.songnormalizer import normalize_songs
+
+# watch mode for a bookmarks export that grows while a long running process holds its songs.
+# the last parse is remembered as the byte offset it stopped at, the checksum of every byte before that
+# offset and the stream parser itself, folder stack included.  while the bytes before the offset are
+# unchanged only the lines after it are parsed and their songs appended; any other change, such as
+# chrome re-exporting with a bookmark inserted part way through, is parsed again from the start.
+
+HASH_BLOCK_SIZE = 2 ** 20
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify(7) constants, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+INOTIFY_READ_SIZE = 64 * 1024
+
+
+class BookmarksTail:
+    """Parses a bookmarks export incrementally, reading only the complete lines added since the last read.
+
+    Attributes:
+        file_name (str): Path of the export.
+        offset (int): Offset just past the last line parsed.
+        checksum (str): blake2b checksum of the bytes before offset.
+    """
+
+    def __init__(self, file_name: str, url_filter: bytes = b"youtube"):
+        self.file_name = file_name
+        self.url_filter = url_filter
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self._hasher = hashlib.blake2b(digest_size=16)
+        self.checksum = self._hasher.hexdigest()
+        self._parser = BookmarksStreamParser(self.url_filter)
+
+    def _prefix_unchanged(self, file_handle, size: int) -> bool:
+        if size < self.offset:
+            return False
+        hasher = hashlib.blake2b(digest_size=16)
+        remaining = self.offset
+        while remaining:
+            block = file_handle.read(min(HASH_BLOCK_SIZE, remaining))
+            if not block:
+                return False
+            hasher.update(block)
+            remaining -= len(block)
+        return hasher.hexdigest() == self.checksum
+
+    def read(self) -> tuple[list[tuple[str, str, int, str]], bool]:
+        """Parses what was added to the export since the last read.
+
+        A trailing line without its newline is left for the next read, as the export may still be being written.
+
+        Args:
+            No parameters
+
+        Returns:
+            tuple: The name, url, add date and folder tuples of the links read, and whether the export was
+                parsed from the start because content before the last offset changed.
+        """
+        try:
+            file_handle = open(self.file_name, "rb")
+        except FileNotFoundError as e:
+            raise_and_log(FileNotFoundError, f"Playlist file {self.file_name} does not exist to watch: {e}")
+        with file_handle:
+            size = os.fstat(file_handle.fileno()).st_size
+            full_parse = self.offset == 0 or not self._prefix_unchanged(file_handle, size)
+            if full_parse and self.offset:
+                self.reset()
+            file_handle.seek(self.offset)
+            added = file_handle.read(size - self.offset)
+        complete = added[:added.rfind(b"\n") + 1]
+        for line in complete.splitlines(keepends=True):
+            self._parser.feed_line(line)
+        self._hasher.update(complete)
+        self.offset += len(complete)
+        self.checksum = self._hasher.hexdigest()
+        return self._parser.pop_links(), full_parse
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class PollingWatcher:
+    """Notices changes to a file by polling its size and modification time."""
+
+    def __init__(self, file_name: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.file_name = file_name
+        self.poll_interval = poll_interval
+        self._last_state = self._state()
+
+    def _state(self):
+        try:
+            stat = os.stat(self.file_name)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits for the file to change.
+
+        Args:
+            timeout (float): Longest time to wait in seconds, forever when not given.
+
+        Returns:
+            bool: Whether the file changed before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self._state()
+            if state != self._last_state:
+                self._last_state = state
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval if deadline is None
+                       else max(0.0, min(self.poll_interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Notices changes to a file through Linux inotify, watching its folder so replacing the file is seen too."""
+    EVENT_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self, file_name: str, libc):
+        folder, base_name = os.path.split(os.path.abspath(file_name))
+        self.file_name = file_name
+        self._base_name = os.fsencode(base_name)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(folder), self.EVENT_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+
+    def _names_changed(self) -> list[bytes]:
+        try:
+            events = os.read(self._fd, INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return []
+        names = []
+        position = 0
+        while position + INOTIFY_EVENT_HEADER.size <= len(events):
+            _, _, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(events, position)
+            position += INOTIFY_EVENT_HEADER.size
+            names.append(events[position:position + name_length].rstrip(b"\0"))
+            position += name_length
+        return names
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits for the file to change.
+
+        Args:
+            timeout (float): Longest time to wait in seconds, forever when not given.
+
+        Returns:
+            bool: Whether the file changed before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if readable and self._base_name in self._names_changed():
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self):
+        os.close(self._fd)
+
+
+def file_watcher(file_name: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+    """Makes an inotify watcher for a file where the platform has inotify, a polling watcher otherwise.
+
+    Args:
+        file_name (str): Path of the file to watch.
+        poll_interval (float): Seconds between checks when polling.
+
+    Returns:
+        InotifyWatcher or PollingWatcher: The watcher.
+    """
+    libc = _load_libc()
+    if libc is not None:
+        try:
+            return InotifyWatcher(file_name, libc)
+        except OSError as e:
+            logger.info("inotify is unavailable, polling %s instead: %s", file_name, e)
+    return PollingWatcher(file_name, poll_interval)
+
+
+def _songs_added(result, *args, **kwargs) -> int:
+    return count_rows(result)
+
+
+def _run_now(change):
+    change()
+
+
+class BookmarksWatch:
+    """Keeps a PlayList's songs in step with a bookmarks export while a long running process serves picks.
+
+    Attributes:
+        playlist (PlayList): Playlist whose song list is kept up to date.
+        tail (BookmarksTail): Incremental parse state of the export.
+        poll_interval (float): Seconds between checks when the platform has no inotify.
+        dispatch (callable): Runs each change to the playlist, called with a function taking no arguments.
+            Changes run straight away by default; a process serving picks from another thread hands them
+            to that thread instead, such as with an event loop's call_soon_threadsafe.
+    """
+
+    def __init__(self, playlist, file_name: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.playlist = playlist
+        self.tail = BookmarksTail(file_name)
+        self.poll_interval = poll_interval
+        self.dispatch = _run_now
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @call_log(rows=_songs_added)
+    def refresh(self) -> list[tuple[str, str, int, str]]:
+        """Brings the playlist's songs up to date with the export, through dispatch.
+
+        Args:
+            No parameters
+
+        Returns:
+            list: Name, url, add date and folder tuples of the links read.
+        """
+        with self._refresh_lock:
+            links, _ = self._parse()
+        return links
+
+    def _parse(self):
+        import pandas as pd
+
+        links, full_parse = self.tail.read()
+        names, urls, add_dates, folders = zip(*links) if links else ((), (), (), ())
+        songs = pd.DataFrame({
+            ReadHandler.SONG_NAME_COLUMN: list(names),
+            ReadHandler.SONG_URL_COLUMN: list(urls),
+            ReadHandler.SONG_ADD_DATE_COLUMN: list(add_dates),
+            ReadHandler.SONG_FOLDER_COLUMN: list(folders),
+        })
+        songs = normalize_songs(songs, self.playlist.drop_invalid_songs)
+        # dispatched while the lock is held, so changes reach the playlist in the order they were parsed
+        if full_parse:
+            self.dispatch(partial(self.playlist.replace_songs, songs))
+            logger.info("parsed %s again from the start, %d songs", self.tail.file_name, len(songs))
+        elif links:
+            self.dispatch(partial(self.playlist.append_songs, songs))
+            logger.info("added %d new songs from %s", len(songs), self.tail.file_name)
+        return links, songs
+
+    def reload(self):
+        """Parses the whole export again, discarding the incremental state.
+
+        Args:
+            No parameters
+
+        Returns:
+            dataframe: The songs parsed, which replace the playlist's songs through dispatch.
+        """
+        with self._refresh_lock:
+            self.tail.reset()
+            _, songs = self._parse()
+        return songs
+
+    def run(self):
+        """Refreshes the songs every time the export changes, until stop is called.
+
+        Args:
+            No parameters
+
+        Returns:
+            None
+        """
+        watcher = file_watcher(self.tail.file_name, self.poll_interval)
+        try:
+            # catches anything added between the last refresh and the watcher starting
+            self.refresh()
+            while not self._stop.is_set():
+                # a bounded wait so stop is noticed without a change to the export
+                if not watcher.wait(timeout=max(self.poll_interval, DEFAULT_POLL_INTERVAL)):
+                    continue
+                try:
+                    self.refresh()
+                except (OSError, ValueError) as e:
+                    logger.error("failed to refresh songs from %s: %s", self.tail.file_name, e)
+        finally:
+            watcher.close()
+
+    def start(self) -> threading.Thread:
+        """Starts watching in a daemon thread.
+
+        Args:
+            No parameters
+
+        Returns:
+            threading.Thread: The watching thread.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="bookmarks-watch", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,91 @@
+import argparse
+from src.read_handlers.readhandler import ReadHandler
+from src.read_handlers.readcsvhandler import ReadCSVHandler
+from src.read_handlers.readarrowhandler import ReadArrowHandler
+from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
+from src.read_handlers.readchromejsonhandler import ReadChromeJsonHandler
+from src.read_handlers.readcachedhandler import CachedReadHandler
+from src.read_handlers.readmultisourcehandler import ReadMultiSourceHandler
+from src.playlist_write_handlers import (
+    ArrowWriteHandler, CSVWriteHandler, ExcelWriteHandler, MultiWriteHandler, WriteHandler
+)
+from src.setup_logging import logger
+
+# picks the read and write handlers from parsed command line arguments, shared by the command line
+# and the jukebox server
+
+
+def select_read_songlist_handler(args: argparse.Namespace) -> ReadHandler:
+    """Choose a read handler
+
+    Args:
+        args: dict: arguments passed to program
+    Returns:
+        ReadHandler
+    """
+    if args.read_from_sources:
+        return ReadMultiSourceHandler(logger, args.read_from_sources)
+    if args.read_from_arrow:
+        return ReadArrowHandler(logger, args.read_from_arrow)
+    if args.read_from_chrome_json:
+        return ReadChromeJsonHandler(logger, args.read_from_chrome_json)
+    if args.read_from_bookmarks:
+        return ReadBookmarksHandler(logger, args.read_from_bookmarks, args.fast_scan)
+    elif args.read_from_csv:
+        return ReadCSVHandler(logger, args.read_from_csv)
+    raise ValueError("No read handler identified by cli arguments")
+
+
+def cache_read_songlist_handler(read_handler: ReadHandler, args: argparse.Namespace, configs: dict) -> ReadHandler:
+    """Put the song list cache in front of a read handler unless the cache is turned off
+
+    Arrow files are left uncached: they load memory mapped, which a pickled copy could only slow down.
+
+    Args:
+        read_handler: ReadHandler: handler chosen for the read source
+        args: dict: arguments passed to program
+        configs: dict: configs loaded at runtime
+    Returns:
+        ReadHandler
+    """
+    if args.no_cache or args.read_from_sources or isinstance(read_handler, ReadArrowHandler):
+        return read_handler
+    return CachedReadHandler(
+        logger,
+        read_handler,
+        configs.get("cache_dir", ".cache"),
+        configs.get("cache_max_bytes", CachedReadHandler.DEFAULT_MAX_BYTES),
+        hash_contents=args.hash_cache,
+        refresh=args.refresh_cache
+    )
+
+
+def select_write_songlist_handler(args: argparse.Namespace, configs: dict) -> WriteHandler:
+    """Choose a write handler and set the write file name based on args and configs
+
+    Args:
+        args: dict: arguments passed to program
+        configs: dict: configs loaded at runtime
+    Returns:
+        WriteHandler
+    """
+    if args.write_all:
+        write_handlers = [
+            ExcelWriteHandler(configs["xlsx_file_name"], skip_unchanged=not args.force_write),
+            CSVWriteHandler(configs["csv_file_name"], skip_unchanged=not args.force_write, append=args.append_csv),
+        ]
+        if args.wa:
+            write_handlers.append(ArrowWriteHandler(args.wa, skip_unchanged=not args.force_write))
+        return MultiWriteHandler(write_handlers)
+    if args.wa:
+        return ArrowWriteHandler(args.wa, skip_unchanged=not args.force_write)
+    # xlsx is written by default, so asking for a csv, or for appending to one, takes priority
+    if args.wc or args.append_csv:
+        return CSVWriteHandler(
+            args.wc or configs.get("csv_file_name", "write_playlist.csv"),
+            skip_unchanged=not args.force_write,
+            append=args.append_csv
+        )
+    if args.wx:
+        return ExcelWriteHandler(args.wx, skip_unchanged=not args.force_write)
+    raise ValueError("No write handler identified by cli arguments")
@@ -0,0 +1,58 @@
+import argparse
+import json
+import socket
+
+# thin client for the jukebox server in src/jukebox_server.py; imports nothing heavier than the socket module.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def send_jukebox_command(
+        command: str,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_socket: str = None,
+        timeout: float = 5.0
+) -> dict:
+    """Sends one command to a jukebox server and returns its response.
+
+    Args:
+        command (str): "pick", "pick N" or "reload".
+        host (str): Address of the server.
+        port (int): Port of the server.
+        unix_socket (str): Path of the server's unix domain socket, used instead of host and port.
+        timeout (float): Seconds to wait for the server.
+
+    Returns:
+        dict: The server's json response.
+    """
+    if unix_socket:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        connection.connect(unix_socket)
+    else:
+        connection = socket.create_connection((host, port), timeout=timeout)
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(command.encode("utf-8") + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Random music jukebox client")
+    parser.add_argument("command", nargs="+", help='"pick", "pick N" or "reload"')
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix_socket", type=str, help='unix domain socket path of the server')
+    args = parser.parse_args()
+    response = send_jukebox_command(" ".join(args.command), args.host, args.port, args.unix_socket)
+    if "songs" in response:
+        for song in response["songs"]:
+            print(f"{song['name']}\t{song['url']}")
+    else:
+        print(json.dumps(response))
+
+
+if __name__ == '__main__':
+    main()
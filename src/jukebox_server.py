@@ -0,0 +1,206 @@
+import argparse
+import asyncio
+import json
+from src.bookmarkswatcher import DEFAULT_POLL_INTERVAL, BookmarksWatch
+from src.jukebox_client import DEFAULT_HOST, DEFAULT_PORT
+from src.handler_selection import select_read_songlist_handler
+from src.playlist import PlayList
+from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
+from src.playlist_shared_utils import read_config_file
+from src.setup_logging import logger, start_logging
+
+# long running jukebox: loads the song list once and answers picks over a local socket.
+# the protocol is one command per line, answered with one line of json:
+#   pick          -> {"songs": [{"name": ..., "url": ...}]}
+#   pick N        -> {"songs": [... N different songs, fewer if the song list is smaller ...]}
+#   reload        -> {"reloaded": song_count}
+# anything else   -> {"error": message}
+
+MAX_PICKS_PER_REQUEST = 10_000
+
+
+class JukeboxServer:
+    """Serves random picks from a PlayList kept loaded in memory.
+
+    Attributes:
+        playlist (PlayList): Playlist holding the song list, with its read handler set.
+        host (str): Address to listen on for tcp connections.
+        port (int): Port to listen on for tcp connections.
+        unix_socket (str): Path of a unix domain socket to listen on instead of tcp.
+        watch (BookmarksWatch): Watch keeping the song list up to date with a bookmarks export, if any.
+    """
+
+    def __init__(
+            self,
+            playlist: PlayList,
+            host: str = DEFAULT_HOST,
+            port: int = DEFAULT_PORT,
+            unix_socket: str = None,
+            watch: BookmarksWatch = None
+    ):
+        self.playlist = playlist
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.watch = watch
+        self._reload_lock = asyncio.Lock()
+
+    def handle_command(self, command: str) -> dict:
+        """Answers one pick command.
+
+        Args:
+            command (str): The request line without its line ending.
+
+        Returns:
+            dict: The json response.
+        """
+        words = command.split()
+        if not words or words[0] != "pick" or len(words) > 2:
+            return {"error": f"unknown command {command!r}"}
+        try:
+            count = int(words[1]) if len(words) == 2 else 1
+        except ValueError:
+            return {"error": f"pick count must be a number, not {words[1]!r}"}
+        if not 0 < count <= MAX_PICKS_PER_REQUEST:
+            return {"error": f"pick count must be between 1 and {MAX_PICKS_PER_REQUEST}"}
+        picks = self.playlist.pick_songs(count)
+        return {"songs": [{"name": name, "url": url} for name, url in picks]}
+
+    async def reload(self) -> dict:
+        """Re-reads the song list in a worker thread, serving picks from the old list meanwhile.
+
+        The new list is swapped in on the event loop, between picks, never while one is running.
+
+        Args:
+            No parameters
+
+        Returns:
+            dict: The json response.
+        """
+        async with self._reload_lock:
+            if self.watch:
+                # the watch hands the new songs to the event loop itself
+                songs = await asyncio.to_thread(self.watch.reload)
+            else:
+                songs = await asyncio.to_thread(self.playlist.load_songs)
+                self.playlist.replace_songs(songs)
+        logger.info(f"jukebox reloaded {len(songs)} songs")
+        return {"reloaded": len(songs)}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                command = line.decode("utf-8", errors="replace").strip()
+                try:
+                    if command == "reload":
+                        response = await self.reload()
+                    else:
+                        response = self.handle_command(command)
+                except Exception as e:
+                    logger.error(f"jukebox failed to answer {command!r}: {e}")
+                    response = {"error": str(e)}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> asyncio.AbstractServer:
+        """Starts listening, returning the asyncio server.
+
+        Args:
+            No parameters
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+        """
+        if self.unix_socket:
+            server = await asyncio.start_unix_server(self.handle_client, path=self.unix_socket)
+            logger.info(f"jukebox listening on {self.unix_socket}")
+        else:
+            server = await asyncio.start_server(self.handle_client, self.host, self.port)
+            logger.info(f"jukebox listening on {self.host}:{self.port}")
+        return server
+
+    async def serve_forever(self):
+        server = await self.start()
+        if self.watch:
+            # picks run on the event loop, so the watch thread's changes to the playlist are run there too
+            self.watch.dispatch = asyncio.get_running_loop().call_soon_threadsafe
+            self.watch.start()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.watch:
+                self.watch.stop()
+
+
+def get_server_args(configs: dict) -> argparse.Namespace:
+    """Set up the jukebox server arg parser and return parsed values.
+
+    Args:
+        configs (dict): Configurations loaded from the config file
+
+    Returns:
+        parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Random music jukebox server")
+    parser.add_argument("-rb", "--read_from_bookmarks", type=str, nargs='?',
+                        default=configs.get("bookmarks"), help='bookmarks file name to read from')
+    parser.add_argument("-rc", "--read_from_csv", type=str, nargs='?', help='csv file name to read from')
+    parser.add_argument("-rj", "--read_from_chrome_json", type=str, nargs='?',
+                        const=configs.get("chrome_bookmarks"), help="Chrome's native Bookmarks json file to read from")
+    parser.add_argument("-ra", "--read_from_arrow", type=str, nargs='?',
+                        help='Arrow IPC (feather) file name to read from, memory mapped')
+    parser.add_argument("-rs", "--read_from_sources", type=str, nargs='+',
+                        help='bookmarks, csv or xlsx files or glob patterns to read from and merge')
+    parser.add_argument("--host", type=str, default=configs.get("jukebox_host", DEFAULT_HOST))
+    parser.add_argument("--port", type=int, default=configs.get("jukebox_port", DEFAULT_PORT))
+    parser.add_argument("--unix_socket", type=str, default=configs.get("jukebox_socket"),
+                        help='unix domain socket path to listen on instead of tcp')
+    parser.add_argument("--compact", action="store_true", help='hold the song list in a compact song store')
+    parser.add_argument("--fast_scan", action="store_true",
+                        help='read bookmarks with the memory mapped multi-process scanner')
+    parser.add_argument("--watch", action="store_true",
+                        help='keep the songs up to date as the bookmarks file changes, parsing only added lines')
+    parser.add_argument("--poll_interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help='seconds between checks of the watched file where inotify is unavailable')
+    return parser.parse_args()
+
+
+def serve_jukebox():
+    """Loads the song list once and serves picks until interrupted.
+
+    Args:
+        No parameters
+
+    Returns:
+        None
+    """
+    configs = read_config_file()
+    args = get_server_args(configs)
+    start_logging()
+    playlist = PlayList(None, logger)
+    playlist.compact_songs = args.compact
+    if args.read_from_csv:
+        args.read_from_bookmarks = None
+    playlist.read_songlist_handler = select_read_songlist_handler(args)
+    watch = None
+    if args.watch and isinstance(playlist.read_songlist_handler, ReadBookmarksHandler):
+        watch = BookmarksWatch(playlist, playlist.read_songlist_handler.read_file_name, args.poll_interval)
+        watch.refresh()
+    else:
+        if args.watch:
+            logger.info("watching only applies to a bookmarks file, the songs will not be kept up to date")
+        playlist.read_songs()
+    server = JukeboxServer(playlist, args.host, args.port, args.unix_socket, watch)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("jukebox stopped")
+
+
+if __name__ == '__main__':
+    serve_jukebox()
@@ -0,0 +1,173 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from src.playlist_shared_utils import canonical_video_url, extract_video_id
+from src.setup_logging import logger
+
+
+class HostRateLimiter:
+    """Token bucket per host, shared by the checker's worker threads.
+
+    Attributes:
+        requests_per_second (float): Sustained request rate allowed per host.
+    """
+
+    def __init__(self, requests_per_second: float):
+        self.requests_per_second = requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host: str):
+        """Blocks until the host's next request slot.
+
+        Args:
+            host (str): Host about to be requested.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 1.0 / self.requests_per_second
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class LinkHealthChecker:
+    """Checks whether song urls still lead to a playable video.
+
+    Urls are checked concurrently through one pooled HTTP session, against an oEmbed style endpoint that
+    answers 403 for private videos and 404 for deleted ones.  It answers 401 for videos whose owner turned off
+    embedding, which still play, so those count as alive.  Only YouTube urls are checked.  Results are cached in
+    the link_health table of the library database and only re-checked once older than ttl_seconds.
+
+    Attributes:
+        db_conn (sqlite3.Connection): Connection holding the result cache.
+        logger (Logger): Logger instance for logging events.
+        check_url_template (str): Url to request for a song, with {url} standing for the quoted song url.
+        ttl_seconds (float): Age after which a cached result is re-checked.
+        max_workers (int): Number of concurrent checks.
+        timeout (float): Seconds to wait for each response.
+        retries (int): Extra attempts after a connection error, 429 or 5xx response.
+    """
+    OEMBED_URL_TEMPLATE = "https://www.youtube.com/oembed?format=json&url={url}"
+    DEAD_STATUSES = {403, 404, 410}
+    PLAYABLE_STATUSES = {401}
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS link_health (
+            video_url TEXT PRIMARY KEY,
+            alive INTEGER NOT NULL,
+            status INTEGER,
+            checked_at REAL NOT NULL
+        );
+    """
+
+    def __init__(
+            self,
+            db_conn: sqlite3.Connection,
+            checker_logger: logger = logger,
+            check_url_template: str = OEMBED_URL_TEMPLATE,
+            ttl_seconds: float = 7 * 24 * 3600,
+            max_workers: int = 16,
+            requests_per_host_per_second: float = 20.0,
+            timeout: float = 5.0,
+            retries: int = 2
+    ):
+        self.db_conn = db_conn
+        self.logger = checker_logger
+        self.check_url_template = check_url_template
+        self.ttl_seconds = ttl_seconds
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self._rate_limiter = HostRateLimiter(requests_per_host_per_second)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self.db_conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self._session.close()
+
+    def _check_url(self, video_url: str) -> tuple[str, bool | None, int | None]:
+        check_url = self.check_url_template.format(url=quote(video_url, safe=""))
+        host = urlsplit(check_url).netloc
+        status = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(0.1 * 2 ** attempt)
+            self._rate_limiter.wait(host)
+            try:
+                response = self._session.get(check_url, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.logger.info("checking %s failed on attempt %d: %s", video_url, attempt + 1, e)
+                continue
+            status = response.status_code
+            response.close()
+            if status < 400 or status in self.PLAYABLE_STATUSES:
+                return video_url, True, status
+            if status in self.DEAD_STATUSES:
+                return video_url, False, status
+        # still unknown after every retry, so the url is neither cached nor treated as dead
+        return video_url, None, status
+
+    def stale_urls(self, video_urls: set[str]) -> set[str]:
+        """Finds the urls with no cached result younger than the ttl.
+
+        Args:
+            video_urls (set): Canonical song urls.
+
+        Returns:
+            set: The urls that need checking.
+        """
+        fresh_after = time.time() - self.ttl_seconds
+        fresh = {
+            row[0] for row in self.db_conn.execute(
+                "SELECT video_url FROM link_health WHERE checked_at >= ?", (fresh_after,)
+            )
+        }
+        return video_urls - fresh
+
+    def check_urls(self, urls: list[str]) -> int:
+        """Checks every url whose cached result is missing or stale, and caches the results.
+
+        Urls without a YouTube video id are left unchecked, so they are never found dead.
+
+        Args:
+            urls (list): Song urls, in any YouTube url form.
+
+        Returns:
+            int: Number of urls checked.
+        """
+        stale = self.stale_urls({canonical_video_url(url) for url in urls if extract_video_id(url) is not None})
+        if not stale:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._check_url, sorted(stale)))
+        checked_at = time.time()
+        with self.db_conn:
+            self.db_conn.executemany(
+                "INSERT OR REPLACE INTO link_health (video_url, alive, status, checked_at) VALUES (?, ?, ?, ?)",
+                [(video_url, int(alive), status, checked_at) for video_url, alive, status in results
+                 if alive is not None]
+            )
+        dead = sum(1 for _, alive, _ in results if alive is False)
+        self.logger.info(f"checked {len(results)} song links, {dead} are dead")
+        return len(results)
+
+    def dead_links(self) -> set[str]:
+        """Returns the canonical urls last found dead.
+
+        Args:
+            No parameters
+
+        Returns:
+            set: Canonical song urls.
+        """
+        return {row[0] for row in self.db_conn.execute("SELECT video_url FROM link_health WHERE alive = 0")}
@@ -1,14 +1,20 @@
+import cProfile
 import json
-from src.setup_logging import logger
+from contextlib import contextmanager
+import logging
+from src.setup_logging import configure_logging, logger, start_logging
 import argparse
 import sqlite3
-from src.read_handlers.readhandler import ReadHandler
-from src.read_handlers.readcsvhandler import ReadCSVHandler
-from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
-from playlist_write_handlers import CSVWriteHandler, ExcelWriteHandler, WriteHandler
+from typing import TYPE_CHECKING
+from src.handler_selection import (
+    cache_read_songlist_handler, select_read_songlist_handler, select_write_songlist_handler
+)
 from Browser import Browser
-from playlist import PlayList
-from playlist_shared_utils import check_file_type
+from playlist_shared_utils import check_file_type, read_config_file  # noqa: F401
+from src.metrics import metrics
+
+if TYPE_CHECKING:
+    from playlist import PlayList
 
 # i went class happy here.  kinda demonstrates how even clean coding using a design pattern can contribute
 # to difficulty reading code.  glad to denormalize it at some point in the future, but will leave as-is for now.
@@ -23,37 +29,33 @@ from playlist_shared_utils import check_file_type
 # am playing here and in future scripting changes to find a good balance.
 
 
-def get_db_connection(db_path: str) -> sqlite3.connect:
-    """opens a sqlite3 connection.
+def __getattr__(name: str):
+    """Imports PlayList the first time it is looked up on this module, so importing main stays free of pandas.
 
     Args:
-        db_path: str: path to database
+        name: str: name of the missing module attribute
 
     Returns:
-        sqlite3.connect: connection.
+        type: the PlayList class
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # Optional, for dict-like row access
-    return conn
+    if name == "PlayList":
+        from playlist import PlayList
+        return PlayList
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def read_config_file(config_file_name: str = "./config.json") -> json:
-    """Loads configuration from a JSON file.
+def get_db_connection(db_path: str) -> sqlite3.connect:
+    """opens a sqlite3 connection.
 
     Args:
-        config_file_name (str): The name of the json configuration file.
+        db_path: str: path to database
 
     Returns:
-        dict: Dictionary with configuration settings.
+        sqlite3.connect: connection.
     """
-    check_file_type(config_file_name, ['.json'])
-    try:
-        with open(config_file_name) as config_handle:
-            loaded_configs: json = json.load(config_handle)
-        logger.info(f"loaded program configurations from {config_file_name}")
-    except FileNotFoundError as e:
-        logger.info(f'configuration file not found at {config_file_name} producing error {e}')
-    return loaded_configs
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row  # Optional, for dict-like row access
+    return conn
 
 
 def get_args(configs: dict):
@@ -72,7 +74,8 @@ def get_args(configs: dict):
             "kwargs": {
                 "type": str,
                 "nargs": '?',
-                "help": "xlsx file name to write to",
+                "help": "xlsx file name to write to, the default output",
+                "const": configs.get("xlsx_file_name", "write_playlist.xlsx"),
                 "default": configs.get("xlsx_file_name", "write_playlist.xlsx"),
             }
         },
@@ -81,8 +84,8 @@ def get_args(configs: dict):
             "kwargs": {
                 "type": str,
                 "nargs": '?',
-                "help": "csv file name to write to",
-                "default": configs.get("csv_file_name", "write_playlist.csv"),
+                "help": "csv file name to write to instead of the xlsx file",
+                "const": configs.get("csv_file_name", "write_playlist.csv"),
             }
         },
         {
@@ -102,6 +105,205 @@ def get_args(configs: dict):
                 "help": 'csv file name to read from',
                 "default": configs.get("csv_file_name", "default_playlist.csv"),
             }
+        },
+        {
+            "flags": ["-rs", "--read_from_sources"],
+            "kwargs": {
+                "type": str,
+                "nargs": '+',
+                "help": 'bookmarks, csv or xlsx files or glob patterns to read from in parallel and merge',
+            }
+        },
+        {
+            "flags": ["-lib", "--library"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'pick from the sqlite song library, importing the source only when it changed',
+            }
+        },
+        {
+            "flags": ["--no_cache"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'always parse the read source instead of using the song list cache',
+            }
+        },
+        {
+            "flags": ["--refresh_cache"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'parse the read source and replace its song list cache entry',
+            }
+        },
+        {
+            "flags": ["--hash_cache"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'include a hash of the read source contents in the song list cache key',
+            }
+        },
+        {
+            "flags": ["--stream"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'pick in one streaming pass over the read source without loading or writing a song list',
+            }
+        },
+        {
+            "flags": ["--compact"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'hold the song list in a compact song store instead of a dataframe',
+            }
+        },
+        {
+            "flags": ["--check_links"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'check song links not checked recently and skip songs whose link is dead',
+            }
+        },
+        {
+            "flags": ["--weighted"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'weight picks by play history: skip recent plays, favour songs never or long ago played',
+            }
+        },
+        {
+            "flags": ["--append_csv"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'append only the songs added since the last csv write instead of rewriting the file',
+            }
+        },
+        {
+            "flags": ["--force_write"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'write the song list even if it is unchanged since the last write',
+            }
+        },
+        {
+            "flags": ["--profile"],
+            "kwargs": {
+                "type": str,
+                "nargs": '?',
+                "const": "random_music_profile.json",
+                "help": 'time the read, selection, browser and write hot paths and dump a json metrics report',
+            }
+        },
+        {
+            "flags": ["--pstats"],
+            "kwargs": {
+                "type": str,
+                "help": 'also run under cProfile and dump the stats to this file, for pstats or snakeviz',
+            }
+        },
+        {
+            "flags": ["--log_level"],
+            "kwargs": {
+                "type": str,
+                "default": configs.get("log_level", "INFO"),
+                "choices": ["DEBUG", "INFO", "WARNING", "ERROR"],
+                "help": 'lowest level of log messages to write',
+            }
+        },
+        {
+            "flags": ["--log_json"],
+            "kwargs": {
+                "action": "store_true",
+                "default": configs.get("log_json", False),
+                "help": 'write log messages as json lines',
+            }
+        },
+        {
+            "flags": ["-n", "--play_count"],
+            "kwargs": {
+                "type": int,
+                "default": 1,
+                "help": 'number of different songs to play in one browser launch, as a youtube queue',
+            }
+        },
+        {
+            "flags": ["--playlist_page"],
+            "kwargs": {
+                "type": str,
+                "nargs": '?',
+                "const": "random_music_playlist.html",
+                "help": 'play the songs from a local html playlist page written to this file instead of a queue',
+            }
+        },
+        {
+            "flags": ["--fast_scan"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'read bookmarks with the memory mapped multi-process scanner, for very large exports',
+            }
+        },
+        {
+            "flags": ["-rj", "--read_from_chrome_json"],
+            "kwargs": {
+                "type": str,
+                "nargs": '?',
+                "const": configs.get("chrome_bookmarks"),
+                "help": "Chrome's native Bookmarks json file to read from, instead of a bookmarks export",
+            }
+        },
+        {
+            "flags": ["-m", "--match"],
+            "kwargs": {
+                "type": str,
+                "help": 'only pick songs whose name or folder contains all of these words, e.g. "blade runner"',
+            }
+        },
+        {
+            "flags": ["--write_all"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'write the song list to the xlsx, the csv and, with --wa, the arrow file in parallel',
+            }
+        },
+        {
+            "flags": ["-ra", "--read_from_arrow"],
+            "kwargs": {
+                "type": str,
+                "help": 'arrow ipc (feather) file name to read from, memory mapped; needs pyarrow',
+            }
+        },
+        {
+            "flags": ["-write_to_arrow", "--wa"],
+            "kwargs": {
+                "type": str,
+                "nargs": '?',
+                "const": configs.get("arrow_file_name", "write_playlist.arrow"),
+                "help": 'arrow ipc (feather) file name to write to; needs pyarrow',
+            }
+        },
+        {
+            "flags": ["--indexed"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'pick by seeking into the bookmarks or csv source through a sidecar offset index, '
+                        'without loading or writing a song list',
+            }
+        },
+        {
+            "flags": ["--keep_invalid"],
+            "kwargs": {
+                "action": "store_true",
+                "help": 'keep and only report songs without a name or YouTube video id instead of dropping them',
+            }
+        },
+        {
+            "flags": ["--radio"],
+            "kwargs": {
+                "type": int,
+                "nargs": '?',
+                "const": 50,
+                "help": 'play this many songs related by name and folder to a random seed song, one matching '
+                        '--match if given',
+            }
         }
     ]
     for spec in arg_specs:
@@ -109,35 +311,80 @@ def get_args(configs: dict):
     return parser.parse_args()
 
 
-def select_read_songlist_handler(args: argparse.Namespace) -> ReadHandler:
-    """Choose a read handler
+def check_song_links(my_playlist: "PlayList", db_conn: sqlite3.Connection, configs: dict) -> set:
+    """Checks the playlist's song links that have no fresh cached result and returns the dead ones.
+
+    Args:
+        my_playlist: PlayList: playlist with its songs read
+        db_conn: sqlite3.Connection: connection holding the link health cache
+        configs: dict: configs loaded at runtime
+
+    Returns:
+        set: canonical urls of the dead links
+    """
+    from src.linkhealth import LinkHealthChecker
+
+    checker = LinkHealthChecker(
+        db_conn,
+        logger,
+        configs.get("link_check_url_template", LinkHealthChecker.OEMBED_URL_TEMPLATE),
+        ttl_seconds=configs.get("link_check_ttl_seconds", 7 * 24 * 3600)
+    )
+    try:
+        checker.check_urls(my_playlist.song_urls())
+        return checker.dead_links()
+    finally:
+        checker.close()
+
+
+def play_from_library(args: argparse.Namespace, db_conn: sqlite3.Connection, browser: Browser) -> bool:
+    """Syncs the song library with the read source and plays a random song from it.
 
     Args:
         args: dict: arguments passed to program
+        db_conn: sqlite3.Connection: connection to the library database
+        browser: Browser: browser to play the song with
+
     Returns:
-        ReadHandler
+        bool: True for success.
     """
-    if args.read_from_bookmarks:
-        return ReadBookmarksHandler(logger, args.read_from_bookmarks)
-    elif args.read_from_csv:
-        return ReadCSVHandler(logger, args.read_from_csv)
-    raise ValueError("No read handler identified by cli arguments")
+    from src.playhistory import PlayHistory
+    from src.songlibrary import SongLibrary
+
+    song_library = SongLibrary(db_conn, logger)
+    song_library.sync(select_read_songlist_handler(args))
+    song_name, song_url = song_library.pick_random()
+    logger.info(f"opening {song_name} using {song_url}")
+    browser.open_browser_with_url(song_url)
+    PlayHistory(db_conn, logger).record_play(song_url)
+    return True
 
 
-def select_write_songlist_handler(args: argparse.Namespace, configs: dict) -> WriteHandler:
-    """Choose a write handler and set the write file name based on args and configs
+@contextmanager
+def profiling(args: argparse.Namespace):
+    """Records hot path metrics and cProfile stats around a run when asked for by the cli arguments.
 
     Args:
         args: dict: arguments passed to program
-        configs: dict: configs loaded at runtime
+
     Returns:
-        WriteHandler
+        Iterator[None]
     """
-    if args.wx:
-        return ExcelWriteHandler(configs["xlsx_file_name"])
-    elif args.wc:
-        return CSVWriteHandler(configs["csv_file_name"])
-    raise ValueError("No write handler identified by cli arguments")
+    metrics.enabled = bool(args.profile)
+    profiler = cProfile.Profile() if args.pstats else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.pstats)
+            logger.info(f"wrote cProfile stats to {args.pstats}")
+        if args.profile:
+            metrics.dump(args.profile)
+            metrics.enabled = False
+            logger.info(f"wrote metrics report to {args.profile}")
 
 
 def execute_random_song_selection():
@@ -150,19 +397,62 @@ def execute_random_song_selection():
         None
     """
 
+    # the playlist pulls in numpy and pandas, so it is only imported once the arguments ask for a run
+    from playlist import PlayList
+    from src.playhistory import PlayHistory, SelectionPolicy
+
     configs: json = read_config_file()
     chrome_browser = Browser(configs["chrome_path"] + " %s", logger)
     args = get_args(configs)
-    db_conn = get_db_connection(configs["db_path"])
-    my_playlist = PlayList(chrome_browser, logger)
-    my_playlist.read_songlist_handler = select_read_songlist_handler(args)
-    my_playlist.read_songs()
-    if my_playlist.songs.bool:
-        my_playlist.play_random()
-        my_playlist.write_songlist_handler = select_write_songlist_handler(args, configs)
-        if my_playlist.write_songlist_handler:
-            my_playlist.write_songlist_handler.write_songlist(my_playlist.songs)
-    db_conn.close()
+    configure_logging(getattr(logging, args.log_level), args.log_json)
+    start_logging()
+    with profiling(args):
+        db_conn = get_db_connection(configs["db_path"])
+        if args.library:
+            play_from_library(args, db_conn, chrome_browser)
+            db_conn.close()
+            return
+        my_playlist = PlayList(chrome_browser, logger)
+        my_playlist.play_history = PlayHistory(db_conn, logger)
+        if args.weighted:
+            my_playlist.selection_mode = PlayList.WEIGHTED_MODE
+            my_playlist.selection_policy = SelectionPolicy(
+                configs.get("exclude_last_plays", 20),
+                configs.get("recency_half_life_days", 30) * 24 * 3600,
+                configs.get("never_played_boost", 2.0)
+            )
+        my_playlist.read_songlist_handler = cache_read_songlist_handler(
+            select_read_songlist_handler(args), args, configs
+        )
+        if args.stream:
+            my_playlist.selection_mode = PlayList.STREAMING_MODE
+            my_playlist.play_random()
+            db_conn.close()
+            return
+        if args.indexed:
+            my_playlist.selection_mode = PlayList.INDEXED_MODE
+            if args.play_count > 1:
+                my_playlist.play_batch(args.play_count)
+            else:
+                my_playlist.play_random()
+            db_conn.close()
+            return
+        my_playlist.compact_songs = args.compact
+        my_playlist.drop_invalid_songs = not args.keep_invalid
+        my_playlist.read_songs()
+        if len(my_playlist.songs):
+            if args.check_links:
+                my_playlist.dead_links = check_song_links(my_playlist, db_conn, configs)
+            if args.radio:
+                my_playlist.play_radio(args.radio, args.match, bool(args.playlist_page), args.playlist_page)
+            elif args.play_count > 1 or args.playlist_page:
+                my_playlist.play_batch(args.play_count, bool(args.playlist_page), args.playlist_page, args.match)
+            else:
+                my_playlist.play_random(args.match)
+            my_playlist.write_songlist_handler = select_write_songlist_handler(args, configs)
+            if my_playlist.write_songlist_handler:
+                my_playlist.write_songlist_handler.write_songlist(my_playlist.songs)
+        db_conn.close()
 
 
 if __name__ == '__main__':
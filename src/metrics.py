@@ -0,0 +1,166 @@
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+
+# in-process timing metrics for the hot paths, filled in by setup_logging.call_log.
+# recording is off until metrics.enabled is set (main does so for --profile), and while off
+# an instrumented call costs one attribute check.
+
+MAX_LATENCY_SAMPLES = 10_000
+PERCENTILES = (50, 90, 99)
+
+
+class FunctionMetrics:
+    """Counts, latencies and data volume recorded for one instrumented function.
+
+    Attributes:
+        calls (int): Number of completed or failed calls.
+        errors (int): Number of calls that raised.
+        total_seconds (float): Cumulative wall time of every call.
+        max_seconds (float): Slowest call.
+        rows (int): Rows or songs processed, for functions that report them.
+        bytes (int): Bytes read or written, for functions that report them.
+        latencies (list): Reservoir sample of call latencies in seconds, for percentiles.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.latencies = []
+
+    def record(self, seconds: float, rows: int = 0, byte_count: int = 0, failed: bool = False):
+        self.calls += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.rows += rows
+        self.bytes += byte_count
+        if len(self.latencies) < MAX_LATENCY_SAMPLES:
+            self.latencies.append(seconds)
+        else:
+            slot = random.randrange(self.calls)
+            if slot < MAX_LATENCY_SAMPLES:
+                self.latencies[slot] = seconds
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def as_dict(self) -> dict:
+        report = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.calls if self.calls else 0.0,
+            "max_seconds": self.max_seconds,
+            "rows": self.rows,
+            "bytes": self.bytes,
+        }
+        for percent in PERCENTILES:
+            report[f"p{percent}_seconds"] = self.percentile(percent)
+        if self.rows and self.total_seconds:
+            report["rows_per_second"] = self.rows / self.total_seconds
+        return report
+
+
+class MetricsRegistry:
+    """Collects FunctionMetrics keyed on function name.
+
+    Attributes:
+        enabled (bool): Whether instrumented calls are recorded.
+        functions (dict): FunctionMetrics keyed on qualified function name.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.functions = {}
+
+    def record(self, name: str, seconds: float, rows: int = 0, byte_count: int = 0, failed: bool = False):
+        function_metrics = self.functions.get(name)
+        if function_metrics is None:
+            function_metrics = self.functions[name] = FunctionMetrics()
+        function_metrics.record(seconds, rows, byte_count, failed)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Times a block of code under the given name, when enabled.
+
+        The yielded dict's "rows" and "bytes" entries can be set inside the block to record
+        how much data it processed.
+
+        Args:
+            name (str): Name to record the block under.
+
+        Returns:
+            Iterator[dict]: The block's counters.
+        """
+        counters = {"rows": 0, "bytes": 0}
+        if not self.enabled:
+            yield counters
+            return
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield counters
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - started, counters["rows"], counters["bytes"], failed)
+
+    def reset(self):
+        self.functions = {}
+
+    def report(self) -> dict:
+        """Summarises every recorded function, slowest cumulative time first.
+
+        Args:
+            No parameters
+
+        Returns:
+            dict: Metrics dicts keyed on function name.
+        """
+        ordered = sorted(self.functions.items(), key=lambda item: item[1].total_seconds, reverse=True)
+        return {name: function_metrics.as_dict() for name, function_metrics in ordered}
+
+    def dump(self, file_name: str):
+        with open(file_name, "w") as report_handle:
+            json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "functions": self.report()},
+                      report_handle, indent=2)
+
+
+def file_size(file_name) -> int:
+    """Size of a file for byte counts, zero when the name is not a readable file."""
+    try:
+        return os.path.getsize(file_name)
+    except (OSError, TypeError):
+        return 0
+
+
+def count_rows(songs) -> int:
+    """Number of songs in a song list, record list or song store, zero for anything without a length."""
+    try:
+        return len(songs)
+    except TypeError:
+        return 0
+
+
+def rows_returned(result, *args, **kwargs) -> int:
+    """call_log rows counter for functions returning their songs."""
+    return count_rows(result)
+
+
+def source_bytes(result, handler, source, *args, **kwargs) -> int:
+    """call_log byte counter for read handler methods taking their source file name."""
+    return file_size(source)
+
+
+metrics = MetricsRegistry()
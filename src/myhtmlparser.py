@@ -1,3 +1,4 @@
+import re
 from html.parser import HTMLParser
 
 
@@ -29,3 +30,127 @@ class MyHTMLParser(HTMLParser):
             self.in_anchor = False
             self.current_link = None
             self.link_text = ""
+
+
+class BookmarksStreamParser(HTMLParser):
+    """Single-pass parser for a whole Netscape-format bookmarks export.
+
+    One instance is fed the export line by line.  Links are collected into columnar lists along
+    with their ADD_DATE and the path of the <H3> folders enclosing them.
+
+    Attributes:
+        names (list): Link text of every accepted link.
+        urls (list): HREF of every accepted link.
+        add_dates (list): ADD_DATE of every accepted link, 0 when the export doesn't carry one.
+        folders (list): Folder path of every accepted link, folder titles joined with FOLDER_SEPARATOR.
+    """
+    FOLDER_SEPARATOR = "/"
+    ICON_ATTRIBUTE = re.compile(rb'\s+ICON(?:_URI)?="[^"]*"', re.IGNORECASE)
+
+    def __init__(self, url_filter: bytes = b"youtube"):
+        super().__init__()
+        self.url_filter = url_filter
+        self._url_filter_text = url_filter.decode()
+        self.names = []
+        self.urls = []
+        self.add_dates = []
+        self.folders = []
+        self._folder_stack = []
+        self._pending_folder = None
+        self._in_folder_title = False
+        self._folder_title = ""
+        self._in_anchor = False
+        self._link_text = ""
+        self._current_link = None
+        self._current_add_date = 0
+
+    def feed_line(self, line: bytes):
+        """Feeds one raw line of the export to the parser.
+
+        Anchor lines that don't contain the url filter are dropped before decoding, and ICON payloads
+        are cut out at the bytes level so the base64 blobs are never decoded into strings.
+
+        Args:
+            line (bytes): Line of the export as read from a file opened in binary mode.
+
+        Returns:
+            None
+        """
+        if b"<A " in line and self.url_filter not in line:
+            return
+        if b"ICON" in line:
+            line = self.ICON_ATTRIBUTE.sub(b"", line)
+        self.feed(line.decode("utf-8", errors="replace"))
+
+    def feed_file(self, file_handle):
+        """Feeds every line of a bookmarks export opened in binary mode to the parser.
+
+        Args:
+            file_handle: Binary file handle of the export.
+
+        Returns:
+            None
+        """
+        for line in file_handle:
+            self.feed_line(line)
+        self.close()
+
+    def pop_links(self) -> list[tuple[str, str, int, str]]:
+        """Hands over the links collected so far and empties the columns.
+
+        Args:
+            No parameters
+
+        Returns:
+            list: Name, url, add date and folder tuples of the links.
+        """
+        links = list(zip(self.names, self.urls, self.add_dates, self.folders))
+        self.names, self.urls, self.add_dates, self.folders = [], [], [], []
+        return links
+
+    @property
+    def folder_path(self) -> str:
+        return self.FOLDER_SEPARATOR.join(folder for folder in self._folder_stack if folder is not None)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._in_anchor = True
+            self._link_text = ""
+            self._current_link = None
+            self._current_add_date = 0
+            for name, value in attrs:
+                if name == "href":
+                    self._current_link = value
+                elif name == "add_date" and value and value.isdigit():
+                    self._current_add_date = int(value)
+        elif tag == "h3":
+            self._in_folder_title = True
+            self._folder_title = ""
+        elif tag == "dl":
+            # the top level <DL> follows <H1> rather than <H3>, so it doesn't add to the path
+            if self._pending_folder is not None:
+                self._folder_stack.append(self._pending_folder)
+                self._pending_folder = None
+            else:
+                self._folder_stack.append(None)
+
+    def handle_data(self, data):
+        if self._in_anchor:
+            self._link_text += data
+        elif self._in_folder_title:
+            self._folder_title += data
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._in_anchor:
+            self._in_anchor = False
+            link_text = self._link_text.strip()
+            if link_text and self._current_link and self._url_filter_text in self._current_link:
+                self.names.append(link_text)
+                self.urls.append(self._current_link)
+                self.add_dates.append(self._current_add_date)
+                self.folders.append(self.folder_path)
+        elif tag == "h3" and self._in_folder_title:
+            self._in_folder_title = False
+            self._pending_folder = self._folder_title.strip()
+        elif tag == "dl" and self._folder_stack:
+            self._folder_stack.pop()
@@ -0,0 +1,75 @@
+import argparse
+import random
+from src.Browser import Browser
+from src.exceptions import EmptyPlaylistError
+from src.playlist_shared_utils import read_config_file
+from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
+from src.read_handlers.readcsvhandler import ReadCSVHandler
+from src.read_handlers.readhandler import ReadHandler
+from src.setup_logging import logger, raise_and_log, start_logging
+from src.songnormalizer import normalize_records
+
+# fast start entry point: opens one random song without importing pandas or numpy.
+# everything here has to stay plain Python; tests/test_startup_time.py fails if pandas sneaks back in.
+
+
+def get_pick_one_args(configs: dict) -> argparse.Namespace:
+    """Set up the pick one arg parser and return parsed values.
+
+    Args:
+        configs (dict): Configurations loaded from the config file
+
+    Returns:
+        parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Random music: open one random song")
+    parser.add_argument(
+        "-rb", "--read_from_bookmarks", type=str, nargs='?',
+        help='bookmarks file name to read from', default=configs.get("bookmarks", "default_bookmarks.html")
+    )
+    parser.add_argument(
+        "-rc", "--read_from_csv", type=str, nargs='?',
+        help='csv file name to read from, used instead of the bookmarks when given'
+    )
+    return parser.parse_args()
+
+
+def select_pick_one_handler(args: argparse.Namespace) -> ReadHandler:
+    """Choose a read handler that can produce plain Python song records
+
+    Args:
+        args: dict: arguments passed to program
+    Returns:
+        ReadHandler
+    """
+    if args.read_from_csv:
+        return ReadCSVHandler(logger, args.read_from_csv)
+    if args.read_from_bookmarks:
+        return ReadBookmarksHandler(logger, args.read_from_bookmarks)
+    raise ValueError("No read handler identified by cli arguments")
+
+
+def pick_one() -> bool:
+    """Reads the configured source as plain Python records and plays one random song.
+
+    Args:
+        No parameters
+
+    Returns:
+        bool: True for success.
+    """
+    configs = read_config_file()
+    args = get_pick_one_args(configs)
+    start_logging()
+    read_handler = select_pick_one_handler(args)
+    songs = list(normalize_records(read_handler.get_song_records(read_handler.read_file_name)))
+    if not songs:
+        raise_and_log(EmptyPlaylistError, f"{read_handler.read_file_name} holds no songs with a YouTube video id")
+    song_name, song_url = random.choice(songs)
+    logger.info("opening %s using %s", song_name, song_url)
+    Browser(configs["chrome_path"] + " %s", logger).open_browser_with_url(song_url)
+    return True
+
+
+if __name__ == '__main__':
+    pick_one()
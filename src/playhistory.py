@@ -0,0 +1,178 @@
+import sqlite3
+import time
+import numpy as np
+from src.playlist_shared_utils import canonical_video_url, extract_video_id
+from src.setup_logging import logger
+
+
+def history_key(url: str) -> str:
+    """The key a song is recorded under: its YouTube video id, or its url when it has none."""
+    return extract_video_id(url) or canonical_video_url(url)
+
+
+class PlayHistory:
+    """Persistent record of played songs, kept in the play_history table of the library database.
+
+    Attributes:
+        db_conn (sqlite3.Connection): Connection to the library database.
+        logger (Logger): Logger instance for logging events.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS play_history (
+            id INTEGER PRIMARY KEY,
+            video_id TEXT NOT NULL,
+            song_url TEXT NOT NULL,
+            played_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_play_history_video_id ON play_history (video_id, played_at);
+        CREATE INDEX IF NOT EXISTS idx_play_history_played_at ON play_history (played_at);
+    """
+
+    def __init__(self, db_conn: sqlite3.Connection, history_logger: logger = logger):
+        self.db_conn = db_conn
+        self.logger = history_logger
+        self.db_conn.executescript(self.SCHEMA)
+
+    def record_play(self, url: str, played_at: float = None):
+        """Records that a song was played.
+
+        Args:
+            url (str): Url of the song.
+            played_at (float): Unix time of the play, now when not given.
+
+        Returns:
+            None
+        """
+        with self.db_conn:
+            self.db_conn.execute(
+                "INSERT INTO play_history (video_id, song_url, played_at) VALUES (?, ?, ?)",
+                (history_key(url), url, time.time() if played_at is None else played_at)
+            )
+
+    def last_played(self) -> dict[str, float]:
+        """Returns the last play time of every song ever played, keyed on video id."""
+        return dict(self.db_conn.execute("SELECT video_id, MAX(played_at) FROM play_history GROUP BY video_id"))
+
+    def recent_video_ids(self, n: int) -> list[str]:
+        """Returns the video ids of the last n plays, most recent first."""
+        return [
+            row[0] for row in self.db_conn.execute(
+                "SELECT video_id FROM play_history ORDER BY played_at DESC LIMIT ?", (n,)
+            )
+        ]
+
+
+class WeightedSampler:
+    """Fenwick tree over song weights: O(log n) weighted picks and O(log n) weight updates.
+
+    Attributes:
+        weights (ndarray): Current weight of every song.
+    """
+
+    def __init__(self, weights: np.ndarray):
+        self.weights = np.asarray(weights, dtype=np.float64).copy()
+        song_count = len(self.weights)
+        cumulative = np.concatenate(([0.0], np.cumsum(self.weights)))
+        positions = np.arange(1, song_count + 1)
+        # tree[i] holds the sum of the lowbit(i) weights ending at song i, built in one vectorised pass
+        self._tree = np.zeros(song_count + 1)
+        self._tree[1:] = cumulative[positions] - cumulative[positions - (positions & -positions)]
+        self._top_step = 1 << (song_count.bit_length() - 1) if song_count else 0
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    @property
+    def total(self) -> float:
+        total = 0.0
+        position = len(self.weights)
+        while position > 0:
+            total += self._tree[position]
+            position -= position & -position
+        return total
+
+    def update(self, index: int, weight: float):
+        """Sets the weight of one song.
+
+        Args:
+            index (int): Position of the song.
+            weight (float): Its new weight.
+
+        Returns:
+            None
+        """
+        delta = weight - self.weights[index]
+        self.weights[index] = weight
+        position = index + 1
+        while position <= len(self.weights):
+            self._tree[position] += delta
+            position += position & -position
+
+    def sample(self, rng: np.random.Generator) -> int:
+        """Picks a song position with probability proportional to its weight.
+
+        Args:
+            rng (Generator): Random generator to draw from.
+
+        Returns:
+            int: The picked position, or -1 when every weight is zero.
+        """
+        remaining = rng.random() * self.total
+        if remaining <= 0.0:
+            return -1
+        position = 0
+        step = self._top_step
+        while step:
+            if position + step <= len(self.weights) and self._tree[position + step] <= remaining:
+                position += step
+                remaining -= self._tree[position]
+            step >>= 1
+        return min(position, len(self.weights) - 1)
+
+
+class SelectionPolicy:
+    """History aware weighting of songs.
+
+    Attributes:
+        exclude_last (int): Number of most recent plays that can't be picked again.
+        recency_half_life_seconds (float): Time since its last play for a song to regain half of its weight.
+        never_played_boost (float): Weight of a song that was never played; a song played long ago weighs 1.
+    """
+
+    def __init__(
+            self,
+            exclude_last: int = 20,
+            recency_half_life_seconds: float = 30 * 24 * 3600,
+            never_played_boost: float = 2.0
+    ):
+        self.exclude_last = exclude_last
+        self.recency_half_life_seconds = recency_half_life_seconds
+        self.never_played_boost = never_played_boost
+
+    def recency_weight(self, seconds_since_played):
+        return 1.0 - np.exp2(-np.asarray(seconds_since_played) / self.recency_half_life_seconds)
+
+    def weights(self, video_ids: list[str], history: PlayHistory, now: float = None) -> np.ndarray:
+        """Weights every song from the play history in one vectorised pass.
+
+        Args:
+            video_ids (list): History keys of the songs, in song list order.
+            history (PlayHistory): The play history.
+            now (float): Unix time to measure recency from, now when not given.
+
+        Returns:
+            ndarray: The weight of every song.
+        """
+        now = time.time() if now is None else now
+        last_played = history.last_played()
+        played_at = np.array([last_played.get(video_id, np.nan) for video_id in video_ids], dtype=np.float64)
+        never_played = np.isnan(played_at)
+        weights = np.where(
+            never_played,
+            self.never_played_boost,
+            self.recency_weight(np.maximum(now - np.nan_to_num(played_at, nan=now), 0.0))
+        )
+        if self.exclude_last:
+            excluded = set(history.recent_video_ids(self.exclude_last))
+            weights[[video_id in excluded for video_id in video_ids]] = 0.0
+        return weights
@@ -1,51 +1,593 @@
-import random
+import math
+import time
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING
 from src import setup_logging
+from src.exceptions import EmptyPlaylistError
+from src.metrics import rows_returned
+from src.playhistory import PlayHistory, SelectionPolicy, WeightedSampler, history_key
+from src.playlist_shared_utils import MAX_QUEUE_VIDEOS, canonical_video_url, extract_video_id, queue_url
+from src.songnormalizer import normalize_records, normalize_songs
+from src.songstore import SongStore
 from Browser import Browser
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from src.read_handlers.offsetindex import OffsetIndex
+    from src.songindex import SongIndex
+    from src.songradio import SongRadio
+
 
 class PlayList:
     """Handles playlist operations for random music selection.
 
     Attributes:
-        songs (dataframe): List of songs in a playlist.
+        songs (dataframe): List of songs in a playlist, or a SongStore when compact_songs is set.
         browser (Browser): Browser instance for opening songs.
         logger (Logger): Logger instance for logging events.
         SONG_NAME_COLUMN (str): Name of the song column.
         SONG_URL_COLUMN (str): Name of the URL column.
+        rng (Generator): Seeded NumPy random generator used for every pick.
+        selection_mode (str): RANDOM_MODE for independent picks, SHUFFLE_BAG_MODE for no repeats
+            until every song has been picked once, STREAMING_MODE to pick straight from the read
+            handler's iter_songs in one pass without loading the song list, WEIGHTED_MODE to weight
+            picks by play history with selection_policy, INDEXED_MODE to read each pick straight from
+            the read source through its sidecar offset index.
+        compact_songs (bool): Whether read_songs loads the songs into a compact SongStore.
+        drop_invalid_songs (bool): Whether read_songs drops songs without a name or YouTube video id,
+            rather than only reporting them.
+        dead_links (set): Canonical urls of songs known to be dead, which play_random skips.
+        play_history (PlayHistory): Where play_random records plays, if set.
+        selection_policy (SelectionPolicy): History aware weighting used in WEIGHTED_MODE.
+        offset_index (OffsetIndex): Offsets of the songs in the read source, used in INDEXED_MODE.
     """
+    RANDOM_MODE = 'random'
+    SHUFFLE_BAG_MODE = 'shuffle_bag'
+    STREAMING_MODE = 'streaming'
+    WEIGHTED_MODE = 'weighted'
+    INDEXED_MODE = 'indexed'
+    MAX_DEAD_LINK_SKIPS = 100
 
-    def __init__(self, browser: Browser, playlist_logger: setup_logging.logger):
+    def __init__(
+            self,
+            browser: Browser,
+            playlist_logger: setup_logging.logger,
+            seed: int = None,
+            selection_mode: str = RANDOM_MODE
+    ):
         self.songs = pd.DataFrame()
         self.browser = browser
         self.logger = playlist_logger
         self.SONG_NAME_COLUMN = 'Song_Name'
         self.SONG_URL_COLUMN = 'Song_URL'
+        self.SONG_FOLDER_COLUMN = 'Song_Folder'
         self.read_songlist_handler = None
         self.write_songlist_handler = None
+        self.rng = np.random.default_rng(seed)
+        self.selection_mode = selection_mode
+        self.compact_songs = False
+        self.drop_invalid_songs = True
+        self.dead_links = set()
+        self.play_history: PlayHistory = None
+        self.selection_policy = SelectionPolicy()
+        self.offset_index: "OffsetIndex" = None
+        self._reset_selection_state()
+
+    def _reset_selection_state(self):
+        self._shuffle_bag = np.empty(0, dtype=np.int64)
+        self._shuffle_bag_position = 0
+        self._weighted_sampler = None
+        self._positions_by_video = {}
+        self._recent_plays = deque()
+        self._song_index = None
+        self._indexed_songs = None
+        self._song_radio = None
+        self._radio_songs = None
+        self._radio_song_count = 0
 
+    @setup_logging.call_log(rows=rows_returned)
     def read_songs(self):
         if self.read_songlist_handler:
-            self.songs = self.read_songlist_handler.get_songlist(self.read_songlist_handler.read_file_name)
+            self.replace_songs(self.load_songs())
         return self.songs
 
-    def play_random(self) -> bool:
-        """Plays a random song from the playlist's song list.
+    def load_songs(self):
+        """Reads the song list through the read handler without installing it, so it can be read off the thread
+        serving picks and swapped in with replace_songs.
 
         Args:
             No parameters
 
+        Returns:
+            dataframe: The normalised song list, or a SongStore when compact_songs is set.
+        """
+        songs = normalize_songs(
+            self.read_songlist_handler.get_songlist(self.read_songlist_handler.read_file_name),
+            self.drop_invalid_songs
+        )
+        if self.compact_songs:
+            # a store holds only strings, so invalid songs kept without a name or url hold empty ones
+            return SongStore.from_dataframe(songs.fillna({self.SONG_NAME_COLUMN: "", self.SONG_URL_COLUMN: ""}))
+        return songs
+
+    def replace_songs(self, songs: pd.DataFrame):
+        """Replaces the song list with songs read outside read_songs, starting selection afresh.
+
+        Args:
+            songs (dataframe): The new song list, held as a SongStore when compact_songs is set.
+
+        Returns:
+            None
+        """
+        if self.compact_songs and not isinstance(songs, SongStore):
+            songs = SongStore.from_dataframe(songs)
+        self.songs = songs
+        self._reset_selection_state()
+
+    def append_songs(self, songs: pd.DataFrame):
+        """Adds songs to the end of the song list, keeping the shuffle bag, play history weights and search index.
+
+        Args:
+            songs (dataframe): Songs to add, with the same columns as the song list.
+
+        Returns:
+            None
+        """
+        if len(songs) == 0:
+            return
+        if isinstance(self.songs, SongStore):
+            self.songs.extend(zip(songs[self.SONG_NAME_COLUMN].tolist(), songs[self.SONG_URL_COLUMN].tolist()))
+            return
+        if len(self.songs) == 0:
+            self.replace_songs(songs)
+            return
+        # the existing songs keep their positions, so an index built over them only needs the new songs added
+        keep_index = self._indexed_songs is self.songs
+        self.songs = pd.concat([self.songs, songs], ignore_index=True)
+        if keep_index:
+            self._indexed_songs = self.songs
+
+    def _song_at(self, position: int) -> tuple[str, str]:
+        if isinstance(self.songs, SongStore):
+            return self.songs[position]
+        return self.songs[self.SONG_NAME_COLUMN].iat[position], self.songs[self.SONG_URL_COLUMN].iat[position]
+
+    def song_urls(self) -> list[str]:
+        if isinstance(self.songs, SongStore):
+            return [url for _, url in self.songs]
+        return self.songs[self.SONG_URL_COLUMN].tolist()
+
+    def _is_dead(self, url: str) -> bool:
+        return bool(self.dead_links) and canonical_video_url(url) in self.dead_links
+
+    def _pick_playable_song(self) -> tuple[str, str]:
+        for _ in range(self.MAX_DEAD_LINK_SKIPS):
+            song = self._song_at(int(self.pick_positions()[0]))
+            if not self._is_dead(song[1]):
+                return song
+            self.logger.info("skipping %s, its link is dead", song[0])
+        self.logger.info(f"gave up skipping dead links after {self.MAX_DEAD_LINK_SKIPS} picks")
+        return song
+
+    def pick_songs(self, n: int) -> list[tuple[str, str]]:
+        """Picks up to n different songs by the selection mode, leaving out songs with dead links.
+
+        Args:
+            n (int): Number of songs to pick; fewer are returned when the song list is smaller.
+
+        Returns:
+            list: Name and url tuples of the picked songs.
+        """
+        count = min(n, len(self.songs))
+        picked_positions = set()
+        songs = []
+        for _ in range(self.MAX_DEAD_LINK_SKIPS):
+            for position in self.pick_positions(count - len(songs), replace=False).tolist():
+                if position in picked_positions:
+                    continue
+                picked_positions.add(position)
+                song = self._song_at(position)
+                if self._is_dead(song[1]):
+                    self.logger.info("skipping %s, its link is dead", song[0])
+                    continue
+                songs.append(song)
+            if len(songs) >= count or len(picked_positions) >= len(self.songs):
+                break
+        return songs
+
+    def song_index(self) -> "SongIndex":
+        """Returns the search index of the song list, indexing only the songs added since the last call.
+
+        Args:
+            No parameters
+
+        Returns:
+            SongIndex: The index, covering every song in the song list.
+        """
+        from src.songindex import SongIndex
+
+        if self._song_index is None or self._indexed_songs is not self.songs:
+            # a song list assigned outside read_songs is indexed from scratch
+            self._song_index = SongIndex()
+            self._indexed_songs = self.songs
+        indexed = len(self._song_index)
+        if indexed < len(self.songs):
+            if isinstance(self.songs, SongStore):
+                self._song_index.add(self.songs.name_at(position) for position in range(indexed, len(self.songs)))
+            else:
+                new_songs = self.songs.iloc[indexed:]
+                folders = new_songs[self.SONG_FOLDER_COLUMN].tolist() if self.SONG_FOLDER_COLUMN in new_songs else None
+                self._song_index.add(new_songs[self.SONG_NAME_COLUMN].tolist(), folders)
+        return self._song_index
+
+    def song_radio(self) -> "SongRadio":
+        """Returns the radio index of the song list, vectorising only the songs it hasn't seen.
+
+        The index is saved next to the read source as <source>.radio.npz, so later runs only
+        vectorise the songs added to the source since.
+
+        Args:
+            No parameters
+
+        Returns:
+            SongRadio: The radio index, covering every song in the song list.
+        """
+        from src.songradio import SongRadio
+
+        if self._song_radio is None:
+            source_file_name = getattr(self.read_songlist_handler, "read_file_name", None)
+            self._song_radio = SongRadio(
+                source_file_name + ".radio.npz" if isinstance(source_file_name, str) else None
+            )
+        if self._radio_songs is not self.songs or self._radio_song_count != len(self.songs):
+            if isinstance(self.songs, SongStore):
+                self._song_radio.update([self.songs.name_at(position) for position in range(len(self.songs))])
+            else:
+                folders = None
+                if self.SONG_FOLDER_COLUMN in self.songs:
+                    folders = self.songs[self.SONG_FOLDER_COLUMN].tolist()
+                self._song_radio.update(self.songs[self.SONG_NAME_COLUMN].tolist(), folders)
+            self._radio_songs = self.songs
+            self._radio_song_count = len(self.songs)
+        return self._song_radio
+
+    def pick_matching(self, query: str, n: int = 1) -> list[tuple[str, str]]:
+        """Picks up to n different songs uniformly at random from those whose name or folder matches a query.
+
+        Songs with dead links are left out.  Selection modes and play history weighting don't apply.
+
+        Args:
+            query (str): Words that must all appear in the song's name or folder path, ignoring case.
+            n (int): Number of songs to pick.
+
+        Returns:
+            list: Name and url tuples of the picked songs.
+        """
+        hits = self.song_index().search(query)
+        picked_positions = set()
+        songs = []
+        for _ in range(self.MAX_DEAD_LINK_SKIPS):
+            wanted = min(n - len(songs), len(hits) - len(picked_positions))
+            if wanted <= 0:
+                break
+            for position in hits[self.rng.choice(len(hits), size=wanted, replace=False)].tolist():
+                if position in picked_positions:
+                    continue
+                picked_positions.add(position)
+                song = self._song_at(position)
+                if self._is_dead(song[1]):
+                    self.logger.info("skipping %s, its link is dead", song[0])
+                    continue
+                songs.append(song)
+        if not songs:
+            setup_logging.raise_and_log(EmptyPlaylistError, f"There are no songs matching {query!r} to pick from")
+        return songs
+
+    def refresh_weights(self):
+        """Rebuilds the weighted sampler from the play history, so recency reflects the current time.
+
+        Args:
+            No parameters
+
+        Returns:
+            None
+        """
+        if self.play_history is None:
+            setup_logging.raise_and_log(ValueError, "Weighted selection needs a play history")
+        video_ids = [history_key(url) for url in self.song_urls()]
+        self._positions_by_video = {}
+        for position, video_id in enumerate(video_ids):
+            self._positions_by_video.setdefault(video_id, []).append(position)
+        self._weighted_sampler = WeightedSampler(self.selection_policy.weights(video_ids, self.play_history))
+        last_played = self.play_history.last_played()
+        self._recent_plays = deque(
+            (video_id, last_played[video_id])
+            for video_id in reversed(self.play_history.recent_video_ids(self.selection_policy.exclude_last))
+        )
+
+    def _pick_weighted_position(self) -> int:
+        if self._weighted_sampler is None or len(self._weighted_sampler) != len(self.songs):
+            self.refresh_weights()
+        position = self._weighted_sampler.sample(self.rng)
+        if position < 0:
+            self.logger.info("every song is excluded by the play history, picking uniformly")
+            position = int(self.rng.integers(len(self.songs)))
+        return position
+
+    def _note_play(self, url: str):
+        if self.play_history is None:
+            return
+        played_at = time.time()
+        self.play_history.record_play(url, played_at)
+        if self._weighted_sampler is None:
+            return
+        # keep the sampler in step with the history: the played song drops to zero weight and the
+        # play that leaves the exclusion window gets its recency weight back
+        video_id = history_key(url)
+        for position in self._positions_by_video.get(video_id, []):
+            self._weighted_sampler.update(position, 0.0)
+        self._recent_plays.append((video_id, played_at))
+        while len(self._recent_plays) > self.selection_policy.exclude_last:
+            released_video_id, released_at = self._recent_plays.popleft()
+            if any(video_id == released_video_id for video_id, _ in self._recent_plays):
+                continue
+            weight = float(self.selection_policy.recency_weight(played_at - released_at))
+            for position in self._positions_by_video.get(released_video_id, []):
+                self._weighted_sampler.update(position, weight)
+
+    def _draw_from_shuffle_bag(self, n: int) -> np.ndarray:
+        song_count = len(self.songs)
+        positions = []
+        while n > 0:
+            if len(self._shuffle_bag) != song_count or self._shuffle_bag_position >= song_count:
+                self._shuffle_bag = self.rng.permutation(song_count)
+                self._shuffle_bag_position = 0
+            drawn = self._shuffle_bag[self._shuffle_bag_position:self._shuffle_bag_position + n]
+            self._shuffle_bag_position += len(drawn)
+            positions.append(drawn)
+            n -= len(drawn)
+        return np.concatenate(positions) if positions else np.empty(0, dtype=np.int64)
+
+    def pick_positions(self, n: int = 1, replace: bool = True) -> np.ndarray:
+        """Picks positions of songs in the song list without copying the song list.
+
+        Args:
+            n (int): Number of positions to pick.
+            replace (bool): Whether a position may be picked more than once.  Ignored in shuffle bag mode,
+                which never repeats a position until every song has been picked, and in weighted mode.
+
+        Returns:
+            ndarray: Positional indexes into the song list.
+        """
+        if len(self.songs) == 0:
+            setup_logging.raise_and_log(EmptyPlaylistError, "There are no songs in the playlist to pick from")
+        if self.selection_mode == self.SHUFFLE_BAG_MODE:
+            return self._draw_from_shuffle_bag(n)
+        if self.selection_mode == self.WEIGHTED_MODE:
+            return np.array([self._pick_weighted_position() for _ in range(n)], dtype=np.int64)
+        if n == 1:
+            return np.array([self.rng.integers(len(self.songs))])
+        return self.rng.choice(len(self.songs), size=n, replace=replace)
+
+    def pick_many(self, n: int, replace: bool = True) -> list[tuple[str, str]]:
+        """Picks a batch of songs from the song list.
+
+        Args:
+            n (int): Number of songs to pick.
+            replace (bool): Whether a song may be picked more than once.
+
+        Returns:
+            list: Name and url tuples of the picked songs.
+        """
+        positions = self.pick_positions(n, replace)
+        if isinstance(self.songs, SongStore):
+            return [self.songs[position] for position in positions.tolist()]
+        # take rather than to_numpy, which would copy a whole pyarrow backed column into Python strings
+        names = self.songs[self.SONG_NAME_COLUMN].take(positions)
+        urls = self.songs[self.SONG_URL_COLUMN].take(positions)
+        return list(zip(names.tolist(), urls.tolist()))
+
+    def _open_unit_random(self) -> float:
+        value = 0.0
+        while value == 0.0:
+            value = self.rng.random()
+        return value
+
+    def reservoir_sample(self, songs, k: int = 1) -> list:
+        """Picks k items uniformly at random from an iterable in one pass, holding only k items.
+
+        Uses Algorithm L, which skips ahead between replacements, so only O(k log(n/k)) random
+        numbers are drawn.
+
+        Args:
+            songs (iterable): The items to pick from.
+            k (int): Number of items to pick.
+
+        Returns:
+            list: The picked items, fewer than k if the iterable runs out first.
+        """
+        songs = iter(songs)
+        reservoir = list(islice(songs, k))
+        if len(reservoir) < k:
+            return reservoir
+        weight = math.exp(math.log(self._open_unit_random()) / k)
+        while weight < 1.0:
+            skip = math.floor(math.log(self._open_unit_random()) / math.log(1.0 - weight))
+            next_song = next(islice(songs, skip, None), None)
+            if next_song is None:
+                break
+            reservoir[int(self.rng.integers(k))] = next_song
+            weight *= math.exp(math.log(self._open_unit_random()) / k)
+        return reservoir
+
+    def pick_streaming(self, k: int = 1) -> list[tuple[str, str]]:
+        """Picks songs straight from the read handler's source in one pass with O(k) memory.
+
+        Args:
+            k (int): Number of songs to pick.
+
+        Returns:
+            list: Name and url tuples of the picked songs.
+        """
+        songs = normalize_records(
+            self.read_songlist_handler.iter_songs(self.read_songlist_handler.read_file_name),
+            self.drop_invalid_songs
+        )
+        picks = self.reservoir_sample((song for song in songs if not self._is_dead(song[1])), k)
+        if not picks:
+            setup_logging.raise_and_log(EmptyPlaylistError, "There are no songs in the playlist source to pick from")
+        return picks
+
+    def pick_indexed(self, k: int = 1) -> list[tuple[str, str]]:
+        """Picks k different songs by seeking to them in the read source, without loading the song list.
+
+        The source's offset index is built on first use and rebuilt whenever the source changes.
+
+        Args:
+            k (int): Number of songs to pick.
+
+        Returns:
+            list: Name and url tuples of the picked songs.
+        """
+        from src.read_handlers.offsetindex import OffsetIndex
+
+        source = self.read_songlist_handler.read_file_name
+        if self.offset_index is None or self.offset_index.source_file_name != source:
+            self.offset_index = OffsetIndex(source)
+        song_count = len(self.offset_index)
+        picked_positions = set()
+        songs = []
+        for _ in range(self.MAX_DEAD_LINK_SKIPS):
+            wanted = min(k - len(songs), song_count - len(picked_positions))
+            if wanted <= 0:
+                break
+            positions = [
+                position for position in self.rng.choice(song_count, size=wanted, replace=False).tolist()
+                if position not in picked_positions
+            ]
+            picked_positions.update(positions)
+            for song in normalize_records(self.offset_index.songs_at(positions), self.drop_invalid_songs):
+                if self._is_dead(song[1]):
+                    self.logger.info("skipping %s, its link is dead", song[0])
+                    continue
+                songs.append(song)
+        if not songs:
+            setup_logging.raise_and_log(EmptyPlaylistError, "There are no songs in the playlist source to pick from")
+        return songs
+
+    @setup_logging.call_log
+    def play_batch(
+            self,
+            n: int,
+            as_page: bool = False,
+            page_file_name: str = None,
+            query: str = None
+    ) -> list[tuple[str, str]]:
+        """Picks n different songs and plays them all with one browser launch.
+
+        The songs open as one YouTube watch_videos queue, or as a local playlist page when as_page is set,
+        when there are more than a queue holds, or when a song has no YouTube video id.
+
+        Args:
+            n (int): Number of songs to play.
+            as_page (bool): Whether to open a local playlist page instead of a YouTube queue.
+            page_file_name (str): File to write the playlist page to, a temporary file when not given.
+            query (str): Words the songs' names or folders must contain, to pick among the matches only.
+
+        Returns:
+            list: Name and url tuples of the played songs, in play order.
+        """
+        if query:
+            songs = self.pick_matching(query, n)
+        elif self.selection_mode == self.STREAMING_MODE:
+            songs = self.pick_streaming(n)
+        elif self.selection_mode == self.INDEXED_MODE:
+            songs = self.pick_indexed(n)
+        else:
+            songs = self.pick_songs(n)
+        if not songs:
+            setup_logging.raise_and_log(EmptyPlaylistError, "Every picked song link is dead")
+        self._open_songs(songs, as_page, page_file_name)
+        return songs
+
+    def _open_songs(self, songs: list[tuple[str, str]], as_page: bool, page_file_name: str):
+        video_ids = [extract_video_id(url) for _, url in songs]
+        self.logger.info("opening %d songs in one batch", len(songs))
+        if as_page or len(songs) > MAX_QUEUE_VIDEOS or None in video_ids:
+            self.browser.open_playlist_page(songs, page_file_name)
+        else:
+            self.browser.open_browser_with_url(queue_url(video_ids))
+        for _, url in songs:
+            self._note_play(url)
+
+    @setup_logging.call_log
+    def play_radio(
+            self,
+            length: int = 50,
+            query: str = None,
+            as_page: bool = False,
+            page_file_name: str = None
+    ) -> list[tuple[str, str]]:
+        """Plays a radio sequence: a seed song followed by songs related to it by name and folder.
+
+        The seed is picked at random, among the songs matching query when given.  The sequence opens
+        the way play_batch opens its songs.  Songs with dead links are left out.
+
+        Args:
+            length (int): Number of songs in the sequence, the seed included.
+            query (str): Words the seed song's name or folder must contain.
+            as_page (bool): Whether to open a local playlist page instead of a YouTube queue.
+            page_file_name (str): File to write the playlist page to, a temporary file when not given.
+
+        Returns:
+            list: Name and url tuples of the played songs, in play order.
+        """
+        if len(self.songs) == 0:
+            setup_logging.raise_and_log(EmptyPlaylistError, "There are no songs in the playlist to play a radio from")
+        radio = self.song_radio()
+        seeds = self.song_index().search(query) if query else np.arange(len(self.songs))
+        dead_positions = set()
+        if self.dead_links:
+            dead_positions = {position for position, url in enumerate(self.song_urls()) if self._is_dead(url)}
+        live_seeds = seeds[~np.isin(seeds, list(dead_positions))] if dead_positions else seeds
+        if len(live_seeds) == 0:
+            setup_logging.raise_and_log(EmptyPlaylistError, f"There are no songs matching {query!r} to seed a radio")
+        seed_position = int(live_seeds[self.rng.integers(len(live_seeds))])
+        positions = radio.sequence(seed_position, length, self.rng, skip=dead_positions)
+        songs = [self._song_at(position) for position in positions]
+        self.logger.info("radio from %s", songs[0][0])
+        self._open_songs(songs, as_page, page_file_name)
+        return songs
+
+    @setup_logging.call_log
+    def play_random(self, query: str = None) -> bool:
+        """Plays a random song from the playlist's song list.
+
+        Args:
+            query (str): Words the song's name or folder must contain, to pick uniformly among the matches only.
+
         Returns:
             bool: True for success.
         """
         try:
-            (songlist_item_name,
-             songlist_item_url) = random.choice(
-                self.songs.values.tolist()
-            )
-            self.logger.info(f"opening {songlist_item_name} using {songlist_item_url}")
-        except TypeError as e:
+            if query:
+                (songlist_item_name,
+                 songlist_item_url) = self.pick_matching(query)[0]
+            elif self.selection_mode == self.STREAMING_MODE:
+                (songlist_item_name,
+                 songlist_item_url) = self.pick_streaming()[0]
+            elif self.selection_mode == self.INDEXED_MODE:
+                (songlist_item_name,
+                 songlist_item_url) = self.pick_indexed()[0]
+            else:
+                (songlist_item_name,
+                 songlist_item_url) = self._pick_playable_song()
+            self.logger.info("opening %s using %s", songlist_item_name, songlist_item_url)
+        except (TypeError, KeyError) as e:
             self.logger.error(f"error opening songs to make a random choice: {e}")
             exit(1)
         self.browser.open_browser_with_url(songlist_item_url)
+        self._note_play(songlist_item_url)
         return True
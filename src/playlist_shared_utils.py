@@ -1,5 +1,8 @@
+import importlib
+import json
 import os
-from src.setup_logging import raise_and_log
+import re
+from src.setup_logging import logger, raise_and_log
 
 
 def check_file_type(file_name: str, file_exts: list[str]) -> bool:
@@ -10,3 +13,91 @@ def check_file_type(file_name: str, file_exts: list[str]) -> bool:
         else:
             raise_and_log(ValueError, f"Invalid file type: {ext}. Allowed types are {file_exts}")
     return True
+
+
+def import_optional(module_name: str, feature: str):
+    """Imports an optional dependency, explaining how to install it when it's missing.
+
+    Args:
+        module_name (str): Dotted name of the module.
+        feature (str): What the module is needed for, for the error message.
+
+    Returns:
+        module: The imported module.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise_and_log(ImportError, f"{feature} needs the optional {module_name.split('.')[0]} package: {e}")
+
+
+ARROW_EXTENSIONS = ['.arrow', '.feather']
+
+
+def read_config_file(config_file_name: str = "./config.json") -> json:
+    """Loads configuration from a JSON file.
+
+    Args:
+        config_file_name (str): The name of the json configuration file.
+
+    Returns:
+        dict: Dictionary with configuration settings.
+    """
+    check_file_type(config_file_name, ['.json'])
+    try:
+        with open(config_file_name) as config_handle:
+            loaded_configs: json = json.load(config_handle)
+        logger.info(f"loaded program configurations from {config_file_name}")
+    except FileNotFoundError as e:
+        logger.info(f'configuration file not found at {config_file_name} producing error {e}')
+    return loaded_configs
+
+
+YOUTUBE_VIDEO_ID = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])")
+YOUTUBE_WATCH_URL = "https://www.youtube.com/watch?v="
+YOUTUBE_QUEUE_URL = "https://www.youtube.com/watch_videos?video_ids="
+YOUTUBE_EMBED_URL = "https://www.youtube.com/embed/"
+# youtube ignores the video ids after the first 50 in a watch_videos queue
+MAX_QUEUE_VIDEOS = 50
+
+
+def extract_video_id(url: str) -> str | None:
+    """Finds the 11 character YouTube video id in a url.
+
+    Args:
+        url (str): A YouTube watch, short, embed or youtu.be url.
+
+    Returns:
+        str: The video id, or None if the url doesn't carry one.
+    """
+    match = YOUTUBE_VIDEO_ID.search(url) if url else None
+    return match.group(1) if match else None
+
+
+def canonical_video_url(url: str) -> str:
+    """Reduces the many forms of a YouTube url to one canonical watch url.
+
+    Args:
+        url (str): Url of a song.
+
+    Returns:
+        str: The canonical watch url, or the stripped url when no video id is found.
+    """
+    video_id = extract_video_id(url)
+    if video_id is None:
+        return url.strip()
+    return YOUTUBE_WATCH_URL + video_id
+
+
+def queue_url(video_ids: list[str]) -> str:
+    """Builds a YouTube url that plays the videos as one anonymous queue.
+
+    Args:
+        video_ids (list): Up to MAX_QUEUE_VIDEOS YouTube video ids, in play order.
+
+    Returns:
+        str: The watch_videos url.
+    """
+    if not 0 < len(video_ids) <= MAX_QUEUE_VIDEOS:
+        raise_and_log(ValueError, f"A YouTube queue holds 1 to {MAX_QUEUE_VIDEOS} videos, not {len(video_ids)}")
+    return YOUTUBE_QUEUE_URL + ",".join(video_ids)
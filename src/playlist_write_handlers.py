@@ -1,35 +1,210 @@
+import hashlib
+import json
+import os
+import shutil
 from abc import ABC, abstractmethod
-from src.setup_logging import logger, raise_and_log
-from playlist_shared_utils import check_file_type
+from concurrent.futures import ThreadPoolExecutor
+from src.metrics import count_rows, file_size
+from src.setup_logging import call_log, logger, raise_and_log
+from playlist_shared_utils import ARROW_EXTENSIONS, check_file_type, import_optional
+from src.songstore import SongStore
+
+
+def _songs_written(result, handler, songs) -> int:
+    return count_rows(songs)
+
+
+def _bytes_written(result, handler, songs) -> int:
+    return file_size(handler._write_file_name)
 
 
 class WriteHandler(ABC):
+    """Writes a song list to a file.
+
+    A fingerprint of the written rows is kept in a sidecar file next to the output, so an unchanged song
+    list is not written again.  Writes go to a temporary file that is renamed over the output, so an
+    interrupted write never leaves a corrupt playlist behind.
+
+    Attributes:
+        skip_unchanged (bool): Whether to skip writing a song list matching the output's fingerprint.
+    """
     SONG_NAME_COLUMN = 'Song_Name'
     SONG_URL_COLUMN = 'Song_URL'
+    FINGERPRINT_EXTENSION = '.fingerprint'
 
-    def __init__(self, file_name: str):
+    def __init__(self, file_name: str, skip_unchanged: bool = True):
         self._write_file_name = file_name
+        self.skip_unchanged = skip_unchanged
 
     @abstractmethod
     def write_songlist(self, songs):
         pass
 
+    @staticmethod
+    def as_dataframe(songs):
+        """Expands a compact song store into a dataframe for writing, passing dataframes through.
 
-class ExcelWriteHandler(WriteHandler):
+        Args:
+            songs (dataframe): songs to write, as a dataframe or SongStore
 
-    def write_songlist(self, songs):
+        Returns:
+            dataframe: the songs as a dataframe
+        """
+        if isinstance(songs, SongStore):
+            return songs.to_dataframe()
+        return songs
+
+    def written_columns(self, songs) -> list[str]:
+        return list(songs.columns)
+
+    @property
+    def fingerprint_file_name(self) -> str:
+        return self._write_file_name + self.FINGERPRINT_EXTENSION
+
+    def row_hashes(self, songs):
+        """Hashes every row of the columns this handler writes, in one vectorised pass.
+
+        Args:
+            songs (dataframe): songs to write
+
+        Returns:
+            ndarray: one uint64 hash per row
+        """
+        import pandas as pd
+
+        return pd.util.hash_pandas_object(songs[self.written_columns(songs)], index=False).to_numpy()
+
+    def fingerprint(self, row_hashes) -> str:
+        return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+    def read_fingerprint(self) -> dict:
+        """Reads the fingerprint sidecar of the output, if the output and sidecar both exist.
+
+        Args:
+            No parameters
+
+        Returns:
+            dict: the written row count and fingerprint, or an empty dict
+        """
+        if not os.path.exists(self._write_file_name):
+            return {}
         try:
-            songs.to_excel(self._write_file_name, index_label="Index")
+            with open(self.fingerprint_file_name) as fingerprint_handle:
+                written = json.load(fingerprint_handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        # the output is replaced before its sidecar, so a write interrupted between the two leaves a sidecar
+        # describing an output of another size, which must not be trusted to append to
+        if written.get("bytes") != os.path.getsize(self._write_file_name):
+            return {}
+        return written
+
+    def write_fingerprint(self, row_hashes):
+        temp_file_name = self._temp_file_name(self.fingerprint_file_name)
+        with open(temp_file_name, "w") as fingerprint_handle:
+            json.dump({
+                "rows": len(row_hashes),
+                "fingerprint": self.fingerprint(row_hashes),
+                "bytes": os.path.getsize(self._write_file_name),
+            }, fingerprint_handle)
+        os.replace(temp_file_name, self.fingerprint_file_name)
+
+    def is_unchanged(self, row_hashes) -> bool:
+        return self.skip_unchanged and self.read_fingerprint().get("fingerprint") == self.fingerprint(row_hashes)
+
+    @staticmethod
+    def _temp_file_name(file_name: str) -> str:
+        # the temp file keeps the extension so writers that infer the format from it still work
+        directory, base_name = os.path.split(file_name)
+        return os.path.join(directory, f".{os.getpid()}.tmp.{base_name}")
+
+    def atomic_write(self, write_function, copy_existing: bool = False):
+        """Writes the output through a temporary file that replaces it once complete.
+
+        Args:
+            write_function (callable): Called with the temporary file name to do the writing.
+            copy_existing (bool): Whether to start the temporary file as a copy of the output, for appending.
+
+        Returns:
+            None
+        """
+        temp_file_name = self._temp_file_name(self._write_file_name)
+        try:
+            if copy_existing:
+                shutil.copyfile(self._write_file_name, temp_file_name)
+            write_function(temp_file_name)
+            os.replace(temp_file_name, self._write_file_name)
         except IOError:
             raise_and_log(IOError, f"Error writing {self._write_file_name}")
+        finally:
+            # whatever failed, the temporary file is only left if it never replaced the output
+            if os.path.exists(temp_file_name):
+                os.remove(temp_file_name)
+
+
+class ExcelWriteHandler(WriteHandler):
+    """Writes a song list to an xlsx file.
+
+    Rows are streamed through openpyxl's write-only mode a chunk at a time, so memory stays flat
+    however large the song list is, instead of building the whole workbook as DataFrame.to_excel does.
+    """
+    CHUNK_SIZE = 10_000
+
+    def _write_rows(self, songs, file_name: str):
+        import openpyxl
+
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet()
+        worksheet.append(["Index", *songs.columns])
+        for start in range(0, len(songs), self.CHUNK_SIZE):
+            chunk = songs.iloc[start:start + self.CHUNK_SIZE]
+            # missing values become empty cells, as to_excel writes them
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for row in chunk.itertuples(name=None):
+                worksheet.append(row)
+        workbook.save(file_name)
+
+    @call_log(rows=_songs_written, byte_count=_bytes_written)
+    def write_songlist(self, songs):
+        songs = self.as_dataframe(songs)
+        row_hashes = self.row_hashes(songs)
+        if self.is_unchanged(row_hashes):
+            logger.info(f"skipped writing {self._write_file_name}, its {len(songs)} songs are unchanged")
+            return True
+        self.atomic_write(lambda file_name: self._write_rows(songs, file_name))
+        self.write_fingerprint(row_hashes)
         logger.info(
             f"completed writing {len(songs)} songs "
             f"from song list into {self._write_file_name}"
         )
+        return True
 
 
 class CSVWriteHandler(WriteHandler):
+    """Writes a song list to a csv file.
+
+    Attributes:
+        append (bool): Whether to append only the songs added since the last write, when the
+            songs written last time are still the start of the song list.
+    """
 
+    def __init__(self, file_name: str, skip_unchanged: bool = True, append: bool = False):
+        super().__init__(file_name, skip_unchanged)
+        self.append = append
+
+    def written_columns(self, songs) -> list[str]:
+        return [CSVWriteHandler.SONG_NAME_COLUMN, CSVWriteHandler.SONG_URL_COLUMN]
+
+    def _appendable_rows(self, row_hashes) -> int:
+        written = self.read_fingerprint()
+        written_rows = written.get("rows")
+        if not self.append or written_rows is None or written_rows > len(row_hashes):
+            return 0
+        if written.get("fingerprint") != self.fingerprint(row_hashes[:written_rows]):
+            return 0
+        return written_rows
+
+    @call_log(rows=_songs_written, byte_count=_bytes_written)
     def write_songlist(self, songs):
         """Write a playlist to a csv file.
 
@@ -40,16 +215,104 @@ class CSVWriteHandler(WriteHandler):
                     boolean: Success flag for the write operation.
                 """
         check_file_type(self._write_file_name, ['.csv'])
-        try:
-            songs.to_csv(
-                self._write_file_name,
-                columns=[CSVWriteHandler.SONG_NAME_COLUMN, CSVWriteHandler.SONG_URL_COLUMN],
-                index_label="Index"
+        songs = self.as_dataframe(songs)
+        row_hashes = self.row_hashes(songs)
+        if self.is_unchanged(row_hashes):
+            logger.info(f"skipped writing {self._write_file_name}, its {len(songs)} songs are unchanged")
+            return True
+        written_rows = self._appendable_rows(row_hashes)
+        if written_rows:
+            new_songs = songs.iloc[written_rows:]
+            self.atomic_write(
+                lambda file_name: new_songs.to_csv(
+                    file_name,
+                    mode="a",
+                    header=False,
+                    columns=self.written_columns(songs),
+                ),
+                copy_existing=True
             )
-        except IOError:
-            raise_and_log(IOError, f"Error writing {self._write_file_name}")
+            logger.info(f"appended {len(new_songs)} new songs to {self._write_file_name}")
+        else:
+            self.atomic_write(
+                lambda file_name: songs.to_csv(
+                    file_name,
+                    columns=self.written_columns(songs),
+                    index_label="Index"
+                )
+            )
+            logger.info(
+                f"completed writing {len(songs)} songs "
+                f"from song list into {self._write_file_name}"
+            )
+        self.write_fingerprint(row_hashes)
+        return True
+
+
+class ArrowWriteHandler(WriteHandler):
+    """Writes a song list to an uncompressed Arrow IPC (Feather v2) file, which ReadArrowHandler memory maps.
+
+    Every column of the song list is kept, so the file also serves as an interchange format for analytics jobs.
+    Needs the optional pyarrow package.
+    """
+
+    def _write_table(self, songs, file_name: str):
+        pa = import_optional("pyarrow", "Writing Arrow files")
+        feather = import_optional("pyarrow.feather", "Writing Arrow files")
+        # uncompressed, so readers can map the columns straight from the file
+        feather.write_feather(pa.Table.from_pandas(songs, preserve_index=False), file_name, compression="uncompressed")
+
+    @call_log(rows=_songs_written, byte_count=_bytes_written)
+    def write_songlist(self, songs):
+        """Write a playlist to an Arrow file.
+
+        Args:
+            songs (dataframe): songs to write, as a dataframe or SongStore
+
+        Returns:
+            boolean: Success flag for the write operation.
+        """
+        check_file_type(self._write_file_name, ARROW_EXTENSIONS)
+        songs = self.as_dataframe(songs)
+        row_hashes = self.row_hashes(songs)
+        if self.is_unchanged(row_hashes):
+            logger.info(f"skipped writing {self._write_file_name}, its {len(songs)} songs are unchanged")
+            return True
+        self.atomic_write(lambda file_name: self._write_table(songs, file_name))
+        self.write_fingerprint(row_hashes)
         logger.info(
             f"completed writing {len(songs)} songs "
             f"from song list into {self._write_file_name}"
         )
         return True
+
+
+class MultiWriteHandler(WriteHandler):
+    """Writes one song list to several outputs at the same time.
+
+    The song list is expanded into a dataframe once and shared by every handler, each writing in its own thread.
+
+    Attributes:
+        write_handlers (list): The handlers writing each output.
+    """
+
+    def __init__(self, write_handlers: list[WriteHandler]):
+        super().__init__(", ".join(handler._write_file_name for handler in write_handlers))
+        self.write_handlers = write_handlers
+
+    def write_songlist(self, songs):
+        """Writes a playlist with every handler in parallel.
+
+        Args:
+            songs (dataframe): songs to write, as a dataframe or SongStore
+
+        Returns:
+            boolean: Success flag for the write operations, True only if every write succeeded.
+        """
+        songs = self.as_dataframe(songs)
+        with ThreadPoolExecutor(max_workers=len(self.write_handlers)) as executor:
+            futures = [executor.submit(handler.write_songlist, songs) for handler in self.write_handlers]
+            # result() re-raises the first failed write once every write has finished
+            results = [future.result() for future in futures]
+        logger.info(f"completed writing {len(songs)} songs into {self._write_file_name}")
+        return all(results)
@@ -0,0 +1,227 @@
+import csv
+import hashlib
+import io
+import mmap
+import os
+import struct
+import numpy as np
+from src.exceptions import PlaylistError
+from src.metrics import file_size
+from src.myhtmlparser import BookmarksStreamParser, MyHTMLParser
+from src.read_handlers.bookmarkscanner import ANCHOR_END, iter_anchors
+from src.setup_logging import call_log, logger, raise_and_log
+
+# sidecar index of where every song starts in a bookmarks export or csv file, so a pick reads one line
+# instead of parsing the whole source.  the sidecar is a fixed header followed by the packed offsets:
+#   magic (8 bytes) | source fingerprint (16 bytes) | song count (uint64) | offsets (uint64 each)
+# all little endian.  the offsets are memory mapped on load, and the sidecar is rebuilt whenever the
+# fingerprint of the source no longer matches.
+
+SIDECAR_MAGIC = b"RMOFFS01"
+SIDECAR_HEADER = struct.Struct("<8s16sQ")
+OFFSET_DTYPE = np.dtype("<u8")
+# the fingerprint hashes the source's size, modification time and the bytes at each end of it,
+# so checking it costs two small reads however large the source is
+FINGERPRINT_SAMPLE_BYTES = 64 * 1024
+BOOKMARKS_EXTENSIONS = ['.html', '.htm']
+CSV_EXTENSIONS = ['.csv']
+
+
+def _songs_indexed(result, *args, **kwargs) -> int:
+    return len(result)
+
+
+def _source_bytes(result, index, *args, **kwargs) -> int:
+    return file_size(index.source_file_name)
+
+
+class OffsetIndex:
+    """Byte offsets of the songs in a bookmarks export or csv file, kept in a sidecar file next to it.
+
+    Attributes:
+        source_file_name (str): Path of the bookmarks export or csv file.
+        sidecar_file_name (str): Path of the sidecar holding the offsets.
+        url_filter (bytes): Only bookmarks whose HREF contains this are indexed.
+    """
+    SIDECAR_EXTENSION = '.offsets'
+
+    def __init__(self, source_file_name: str, sidecar_file_name: str = None, url_filter: bytes = b"youtube"):
+        extension = os.path.splitext(source_file_name)[1].lower()
+        if extension not in BOOKMARKS_EXTENSIONS + CSV_EXTENSIONS:
+            raise_and_log(
+                ValueError,
+                f"Only bookmarks exports and csv files can be indexed, not {source_file_name}"
+            )
+        self.source_file_name = source_file_name
+        self.sidecar_file_name = sidecar_file_name or source_file_name + self.SIDECAR_EXTENSION
+        self.url_filter = url_filter
+        self._is_csv = extension in CSV_EXTENSIONS
+        self._offsets = None
+        self._fingerprint = None
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def source_fingerprint(self) -> bytes:
+        """Fingerprints the source from its size, modification time and the bytes at each end.
+
+        Args:
+            No parameters
+
+        Returns:
+            bytes: 16 byte digest.
+        """
+        try:
+            file_handle = open(self.source_file_name, "rb")
+        except FileNotFoundError as e:
+            raise_and_log(FileNotFoundError, f"Playlist file {self.source_file_name} does not exist to index: {e}")
+        with file_handle:
+            stat = os.fstat(file_handle.fileno())
+            digest = hashlib.blake2b(f"{stat.st_size}:{stat.st_mtime_ns}".encode(), digest_size=16)
+            digest.update(file_handle.read(FINGERPRINT_SAMPLE_BYTES))
+            file_handle.seek(max(0, stat.st_size - FINGERPRINT_SAMPLE_BYTES))
+            digest.update(file_handle.read(FINGERPRINT_SAMPLE_BYTES))
+        return digest.digest()
+
+    def _bookmark_offsets(self) -> np.ndarray:
+        if os.path.getsize(self.source_file_name) == 0:
+            return np.empty(0, dtype=OFFSET_DTYPE)
+        with open(self.source_file_name, "rb") as file_handle, \
+                mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # the same anchors the fast scanner reads: a matching HREF and some link text
+            return np.fromiter(
+                (position for position, _, _, tag_end, text_end in iter_anchors(mm, 0, len(mm), self.url_filter)
+                 if mm[tag_end + 1:text_end].strip()),
+                dtype=OFFSET_DTYPE
+            )
+
+    def _csv_offsets(self) -> np.ndarray:
+        offsets = []
+        position = 0
+        in_quotes = False
+        with open(self.source_file_name, "rb") as file_handle:
+            header = file_handle.readline()
+            position = len(header)
+            for line in file_handle:
+                # a quoted field can hold a line break, so a row only starts outside quotes
+                if not in_quotes and line.strip():
+                    offsets.append(position)
+                if line.count(b'"') % 2:
+                    in_quotes = not in_quotes
+                position += len(line)
+        return np.array(offsets, dtype=OFFSET_DTYPE)
+
+    @call_log(rows=_songs_indexed, byte_count=_source_bytes)
+    def build(self) -> np.ndarray:
+        """Scans the source once for the offset of every song and writes the sidecar.
+
+        The offsets are kept in memory if the sidecar can't be written.
+
+        Args:
+            No parameters
+
+        Returns:
+            ndarray: The offsets, in source order.
+        """
+        fingerprint = self.source_fingerprint()
+        offsets = self._csv_offsets() if self._is_csv else self._bookmark_offsets()
+        directory, base_name = os.path.split(self.sidecar_file_name)
+        temp_file_name = os.path.join(directory, f".{os.getpid()}.tmp.{base_name}")
+        try:
+            with open(temp_file_name, "wb") as sidecar_handle:
+                sidecar_handle.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, fingerprint, len(offsets)))
+                sidecar_handle.write(offsets.tobytes())
+            os.replace(temp_file_name, self.sidecar_file_name)
+        except OSError as e:
+            logger.info("could not write the offset index %s, keeping it in memory: %s", self.sidecar_file_name, e)
+            if os.path.exists(temp_file_name):
+                os.remove(temp_file_name)
+        logger.info("indexed %d songs of %s", len(offsets), self.source_file_name)
+        self._offsets = offsets
+        self._fingerprint = fingerprint
+        return offsets
+
+    def _read_sidecar(self, fingerprint: bytes):
+        try:
+            with open(self.sidecar_file_name, "rb") as sidecar_handle:
+                header = sidecar_handle.read(SIDECAR_HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < SIDECAR_HEADER.size:
+            return None
+        magic, sidecar_fingerprint, count = SIDECAR_HEADER.unpack(header)
+        if magic != SIDECAR_MAGIC or sidecar_fingerprint != fingerprint:
+            return None
+        if file_size(self.sidecar_file_name) != SIDECAR_HEADER.size + count * OFFSET_DTYPE.itemsize:
+            return None
+        if count == 0:
+            return np.empty(0, dtype=OFFSET_DTYPE)
+        return np.memmap(self.sidecar_file_name, dtype=OFFSET_DTYPE, mode="r", offset=SIDECAR_HEADER.size,
+                         shape=(count,))
+
+    def load(self) -> np.ndarray:
+        """Returns the offsets for the source as it is now, from the sidecar or by rebuilding it.
+
+        Args:
+            No parameters
+
+        Returns:
+            ndarray: The offsets, in source order.
+        """
+        fingerprint = self.source_fingerprint()
+        if self._offsets is not None and self._fingerprint == fingerprint:
+            return self._offsets
+        offsets = self._read_sidecar(fingerprint)
+        if offsets is None:
+            return self.build()
+        self._offsets = offsets
+        self._fingerprint = fingerprint
+        return offsets
+
+    @staticmethod
+    def _parse_bookmark_line(line: bytes) -> tuple[str, str]:
+        # a line from the anchor's start, cut after its closing tag so a following anchor can't be read instead
+        line = line[:line.find(ANCHOR_END) + len(ANCHOR_END)]
+        if b"ICON" in line:
+            line = BookmarksStreamParser.ICON_ATTRIBUTE.sub(b"", line)
+        parser = MyHTMLParser()
+        parser.feed(line.decode("utf-8", errors="replace"))
+        return parser.last_link_text, parser.last_url
+
+    @staticmethod
+    def _read_csv_row(file_handle) -> bytes:
+        row = file_handle.readline()
+        while row.count(b'"') % 2:
+            line = file_handle.readline()
+            if not line:
+                break
+            row += line
+        return row
+
+    def songs_at(self, positions) -> list[tuple[str, str]]:
+        """Reads songs from the source by their positions in the index, one seek and one line each.
+
+        Args:
+            positions (iterable): Positions of the songs in source order.
+
+        Returns:
+            list: Name and url tuples of the songs.
+        """
+        offsets = self.load()
+        songs = []
+        with open(self.source_file_name, "rb") as file_handle:
+            for position in positions:
+                file_handle.seek(int(offsets[position]))
+                if self._is_csv:
+                    row = next(csv.reader(io.StringIO(self._read_csv_row(file_handle).decode("utf-8"))), [])
+                    song = (row[-2], row[-1]) if len(row) >= 2 else ("", "")
+                else:
+                    song = self._parse_bookmark_line(file_handle.readline())
+                if not song[0] or not song[1]:
+                    raise_and_log(
+                        PlaylistError,
+                        f"Offset {int(offsets[position])} of {self.source_file_name} doesn't hold a song, "
+                        f"remove {self.sidecar_file_name} to rebuild the index"
+                    )
+                songs.append(song)
+        return songs
@@ -0,0 +1,83 @@
+from typing import TYPE_CHECKING
+from src.exceptions import EmptyPlaylistError
+from src.read_handlers.readhandler import ReadHandler
+from src.playlist_shared_utils import ARROW_EXTENSIONS, check_file_type, import_optional
+from src.metrics import rows_returned, source_bytes
+from src.setup_logging import call_log, raise_and_log
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ReadArrowHandler(ReadHandler):
+    """Reads a song list from an Arrow IPC (Feather v2) file, as written by ArrowWriteHandler.
+
+    The file is memory mapped, so an uncompressed file loads without copying or parsing its columns.
+    Needs the optional pyarrow package.
+    """
+
+    def _read_table(self, source: str, song_columns_only: bool = False):
+        feather = import_optional("pyarrow.feather", "Reading Arrow files")
+        check_file_type(source, ARROW_EXTENSIONS)
+        try:
+            table = feather.read_table(source, memory_map=True)
+        except FileNotFoundError:
+            raise_and_log(FileNotFoundError, f"Playlist file {source} does not exist to load songs from.")
+        song_columns = [self.SONG_NAME_COLUMN, self.SONG_URL_COLUMN]
+        if not set(song_columns) <= set(table.column_names):
+            raise_and_log(
+                ValueError,
+                f"Check the columns of playlist file {source}. "
+                f"It needs {self.SONG_NAME_COLUMN} and {self.SONG_URL_COLUMN} columns.")
+        if table.num_rows == 0:
+            raise_and_log(EmptyPlaylistError, f"Playlist file {source} contained no songs.")
+        return table.select(song_columns) if song_columns_only else table
+
+    def iter_songs(self, source: str):
+        """Yields song data from an Arrow file a record batch at a time.
+
+        Args:
+            source (str): The name of the song data file.
+
+        Yields:
+            tuple: The name and url of a song.
+        """
+        table = self._read_table(source, song_columns_only=True)
+        for batch in table.to_batches():
+            yield from zip(batch.column(0).to_pylist(), batch.column(1).to_pylist())
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_song_records(self, source: str) -> list[tuple[str, str]]:
+        """Reads song data from an Arrow file as plain Python tuples without loading pandas.
+
+        Args:
+            source (str): The name of the song data file.
+
+        Returns:
+            list: Name and url tuples of the songs.
+        """
+        table = self._read_table(source, song_columns_only=True)
+        songs = list(zip(table.column(0).to_pylist(), table.column(1).to_pylist()))
+        self.logger.info(f"loaded {len(songs)} songs into the song list")
+        return songs
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_songlist(self, source: str) -> "pd.DataFrame":
+        """Reads a song data into a playlist from an Arrow file.
+
+        String columns stay in Arrow memory as pyarrow backed strings instead of being copied into
+        Python objects, which is what keeps a large load fast.
+
+        Args:
+            source (str): The name of the song data file.
+
+        Returns:
+            dataframe: A dataframe containing all of the song data from the file.
+        """
+        import pandas as pd
+
+        pa = import_optional("pyarrow", "Reading Arrow files")
+        table = self._read_table(source)
+        songs = table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+        self.logger.info(f"loaded {len(songs)} songs into the song list")
+        return songs
@@ -1,11 +1,28 @@
-import pandas as pd
+from typing import TYPE_CHECKING
 from src.exceptions import EmptyPlaylistError, PlaylistError
+from src.read_handlers.bookmarkscanner import scan_bookmarks
 from src.read_handlers.readhandler import ReadHandler
-from src.setup_logging import logger, raise_and_log
-from src.myhtmlparser import MyHTMLParser
+from src.metrics import rows_returned, source_bytes
+from src.setup_logging import call_log, logger, raise_and_log
+from src.myhtmlparser import BookmarksStreamParser, MyHTMLParser
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ReadBookmarksHandler(ReadHandler):
+    """Reads YouTube links from a Chrome bookmarks export.
+
+    Attributes:
+        fast_scan (bool): Whether to read with the memory mapped bytes scanner instead of the html parser.
+        max_workers (int): Number of processes the fast scanner may use on large exports.
+    """
+
+    def __init__(self, read_handler_logger: logger, source_file_name: str, fast_scan: bool = False,
+                 max_workers: int = None):
+        super().__init__(read_handler_logger, source_file_name)
+        self.fast_scan = fast_scan
+        self.max_workers = max_workers
 
     def _split_a_href(self, html_line: str) -> [str, str]:
         """Removes the link name and link url from a line of html containing an "a href"
@@ -32,48 +49,109 @@ class ReadBookmarksHandler(ReadHandler):
     def _read_youtube_links(self, bookmark_file_name: str) -> dict:
         """Reads a flat file containing a bookmarks export from Chrome and extracts the youtube links
 
+        The whole export is fed through a single streaming parser in one pass, or scanned with the memory
+        mapped scanner when fast_scan is set.
+
         Args:
             bookmark_file_name (str): Path to the bookmarks file.
 
         Returns:
-            dict: A Dict containing all youtube link name and urls
+            dict: A Dict of columns holding the name, url, add date and folder of every youtube link
         """
-        bookmarks_names_urls: dict = {}
-        songlist_index = 0
+        parser = BookmarksStreamParser()
         try:
-            with open(bookmark_file_name, newline='') as file_handle:
-                for linecount, line in enumerate(file_handle):
-                    if linecount != 0:
-                        if self._interesting_html_line(line):
-                            bookmarks_names_urls.update({songlist_index: self._split_a_href(line)})
-                            songlist_index += 1
+            if self.fast_scan:
+                scanned = scan_bookmarks(bookmark_file_name, parser.url_filter, self.max_workers)
+                return {
+                    self.SONG_NAME_COLUMN: scanned["names"],
+                    self.SONG_URL_COLUMN: scanned["urls"],
+                    self.SONG_ADD_DATE_COLUMN: scanned["add_dates"],
+                    self.SONG_FOLDER_COLUMN: scanned["folders"],
+                }
+            with open(bookmark_file_name, "rb") as file_handle:
+                parser.feed_file(file_handle)
         except FileNotFoundError as e:
             raise_and_log(
                 FileNotFoundError,
                 f"Playlist file {bookmark_file_name} does not exist to load songs from: {e}"
             )
-        return bookmarks_names_urls
+        return {
+            self.SONG_NAME_COLUMN: parser.names,
+            self.SONG_URL_COLUMN: parser.urls,
+            self.SONG_ADD_DATE_COLUMN: parser.add_dates,
+            self.SONG_FOLDER_COLUMN: parser.folders,
+        }
+
+    def iter_songs(self, source: str):
+        """Yields YouTube song links from a Chrome bookmarks file as the parser reaches them
+
+        Args:
+            source (str): Path to the bookmarks file, bookmark_file_name
 
-    def get_songlist(self, source: str) -> pd.DataFrame:
+        Yields:
+            tuple: The name and url of a song.
+        """
+        for name, url, _, _ in self.iter_song_details(source):
+            yield name, url
+
+    def iter_song_details(self, source: str):
+        """Yields YouTube song links with their add date and folder as the parser reaches them
+
+        Args:
+            source (str): Path to the bookmarks file, bookmark_file_name
+
+        Yields:
+            tuple: The name, url, add date and folder of a song.
+        """
+        parser = BookmarksStreamParser()
+        try:
+            file_handle = open(source, "rb")
+        except FileNotFoundError as e:
+            raise_and_log(FileNotFoundError, f"Playlist file {source} does not exist to load songs from: {e}")
+        with file_handle:
+            for line in file_handle:
+                parser.feed_line(line)
+                if parser.names:
+                    yield from parser.pop_links()
+        parser.close()
+        yield from parser.pop_links()
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_song_records(self, source: str) -> list[tuple[str, str]]:
+        """Reads YouTube song links from a Chrome bookmarks file without loading pandas
+
+        Args:
+            source (str): Path to the bookmarks file, bookmark_file_name
+
+        Returns:
+            list: Name and url tuples of the songs.
+        """
+        bookmarks_columns = self._read_youtube_links(source)
+        songs = list(zip(bookmarks_columns[self.SONG_NAME_COLUMN], bookmarks_columns[self.SONG_URL_COLUMN]))
+        if not songs:
+            raise_and_log(EmptyPlaylistError, "There were no songs found in the playlist source")
+        self.logger.info(f"loaded {len(songs)} songs into a song list")
+        return songs
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_songlist(self, source: str) -> "pd.DataFrame":
         """Reads YouTube song links from a Chrome bookmarks file in dataframe
 
         Args:
             source (str): Path to the bookmarks file, bookmark_file_name
 
         Returns:
-            pd.DataFrame: DataFrame containing song names and URLs.
+            pd.DataFrame: DataFrame containing song names, URLs, add dates and folders.
         """
 
-        # build a formatted dictionary of song urls and names
+        import pandas as pd
+
+        # build formatted columns of song urls and names
         logger.info('in bookmark read songlist')
-        bookmarks_names_urls = self._read_youtube_links(source)
+        bookmarks_columns = self._read_youtube_links(source)
 
-        # convert dict to dataframe
-        songs = pd.DataFrame.from_dict(
-            bookmarks_names_urls,
-            orient="index",
-            columns=[self.SONG_NAME_COLUMN, self.SONG_URL_COLUMN]
-        )
+        # convert columns to dataframe
+        songs = pd.DataFrame(bookmarks_columns)
         if songs.empty:
             raise_and_log(EmptyPlaylistError, "There were no songs found in the playlist source")
         self.logger.info(
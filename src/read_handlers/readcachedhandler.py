@@ -0,0 +1,157 @@
+import hashlib
+import os
+import pickle
+from src.read_handlers.readhandler import ReadHandler
+from src.metrics import rows_returned, source_bytes
+from src.setup_logging import call_log, logger
+
+
+class CachedReadHandler(ReadHandler):
+    """Puts a song list cache in front of another read handler.
+
+    Parsed song lists are pickled under cache_dir, keyed on the wrapped handler and its fast_scan setting,
+    the source path, size and modification time and, optionally, a hash of the source contents.  A cache
+    hit never runs the wrapped handler.  The cache directory is kept under max_bytes by evicting the least
+    recently used entries.
+
+    Attributes:
+        read_handler (ReadHandler): The handler that parses the source on a cache miss.
+        cache_dir (str): Directory holding the cache entries.
+        max_bytes (int): Size bound of the cache directory.
+        hash_contents (bool): Whether the cache key includes a hash of the source contents.
+        refresh (bool): Whether to ignore cached entries and re-parse the source.
+    """
+    CACHE_EXTENSION = '.pkl'
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(
+            self,
+            read_handler_logger: logger,
+            read_handler: ReadHandler,
+            cache_dir: str,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            hash_contents: bool = False,
+            refresh: bool = False
+    ):
+        super().__init__(read_handler_logger, read_handler.read_file_name)
+        self.read_handler = read_handler
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+        self.refresh = refresh
+
+    @staticmethod
+    def _hash_file(source: str) -> str:
+        digest = hashlib.blake2b()
+        with open(source, "rb") as file_handle:
+            for block in iter(lambda: file_handle.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _source_prefix(self, source: str) -> str:
+        return hashlib.blake2b(os.path.abspath(source).encode(), digest_size=8).hexdigest()
+
+    def cache_path(self, source: str) -> str:
+        """Builds the cache entry path for the current state of a source.
+
+        Args:
+            source (str): Path of the song source file.
+
+        Returns:
+            str: Path of the cache entry.
+        """
+        stat = os.stat(source)
+        # the fast scanner and the html parser can disagree on edge cases, so their song lists are cached apart
+        fast_scan = getattr(self.read_handler, "fast_scan", False)
+        key = f"{type(self.read_handler).__name__}|{fast_scan}|{stat.st_size}|{stat.st_mtime_ns}"
+        if self.hash_contents:
+            key += f"|{self._hash_file(source)}"
+        key_digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{self._source_prefix(source)}-{key_digest}{self.CACHE_EXTENSION}")
+
+    def _cache_entries(self) -> list[os.DirEntry]:
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(self.CACHE_EXTENSION)]
+
+    def invalidate(self, source: str = None) -> int:
+        """Removes the cache entries of one source, or of every source.
+
+        Args:
+            source (str): Path of the song source file, or None to clear the whole cache.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        prefix = self._source_prefix(source) if source else ""
+        removed = 0
+        for entry in self._cache_entries():
+            if entry.name.startswith(prefix):
+                os.remove(entry.path)
+                removed += 1
+        return removed
+
+    def _evict(self):
+        entries = sorted(self._cache_entries(), key=lambda entry: entry.stat().st_mtime_ns)
+        total_bytes = sum(entry.stat().st_size for entry in entries)
+        while entries and total_bytes > self.max_bytes:
+            oldest = entries.pop(0)
+            total_bytes -= oldest.stat().st_size
+            os.remove(oldest.path)
+            self.logger.info(f"evicted {oldest.name} from the song list cache")
+
+    def _store(self, path: str, songs):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file_handle:
+            pickle.dump(songs, file_handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _load(self, path: str):
+        # a truncated entry, or one pickled by an incompatible pandas, is dropped and the source re-parsed
+        try:
+            with open(path, "rb") as file_handle:
+                return pickle.load(file_handle)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError) as e:
+            self.logger.warning(f"dropping unreadable song list cache entry {path}: {e!r}")
+            os.remove(path)
+            return None
+
+    def iter_songs(self, source: str):
+        """Streams the songs of a source straight from the wrapped handler, bypassing the cache.
+
+        Args:
+            source (str): Path of the song source file.
+
+        Yields:
+            tuple: The name and url of a song.
+        """
+        yield from self.read_handler.iter_songs(source)
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_songlist(self, source: str):
+        """Returns the song list of a source from the cache, parsing and caching it on a miss.
+
+        Args:
+            source (str): Path of the song source file.
+
+        Returns:
+            dataframe: The song list of the wrapped handler.
+        """
+        try:
+            path = self.cache_path(source)
+        except FileNotFoundError:
+            return self.read_handler.get_songlist(source)
+        if not self.refresh and os.path.exists(path):
+            songs = self._load(path)
+            if songs is not None:
+                # touching the entry makes its mtime the last use time for LRU eviction
+                os.utime(path)
+                self.logger.info(f"loaded {len(songs)} songs for {source} from the song list cache")
+                return songs
+        songs = self.read_handler.get_songlist(source)
+        # entries for earlier states of the source can never be hit again
+        self.invalidate(source)
+        self._store(path, songs)
+        return songs
@@ -0,0 +1,138 @@
+import json
+from typing import TYPE_CHECKING
+from src.exceptions import EmptyPlaylistError
+from src.read_handlers.readhandler import ReadHandler
+from src.metrics import rows_returned, source_bytes
+from src.setup_logging import call_log, raise_and_log
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# chrome stores date_added as microseconds since 1601-01-01, the bookmarks export's ADD_DATE is unix seconds
+WEBKIT_EPOCH_OFFSET_SECONDS = 11_644_473_600
+
+
+def webkit_to_unix_seconds(date_added) -> int:
+    """Converts a Chrome date_added value to unix seconds, 0 when it's missing or malformed."""
+    try:
+        return max(int(date_added) // 1_000_000 - WEBKIT_EPOCH_OFFSET_SECONDS, 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ReadChromeJsonHandler(ReadHandler):
+    """Reads YouTube links straight from Chrome's native Bookmarks json file, with no html export step.
+
+    Attributes:
+        url_filter (str): Only bookmarks whose url contains this are read.
+    """
+    FOLDER_SEPARATOR = "/"
+
+    def __init__(self, read_handler_logger, source_file_name: str, url_filter: str = "youtube"):
+        super().__init__(read_handler_logger, source_file_name)
+        self.url_filter = url_filter
+
+    def _load_roots(self, source: str) -> dict:
+        try:
+            with open(source, encoding="utf-8") as file_handle:
+                bookmarks = json.load(file_handle)
+        except FileNotFoundError as e:
+            raise_and_log(FileNotFoundError, f"Playlist file {source} does not exist to load songs from: {e}")
+        except json.JSONDecodeError as e:
+            raise_and_log(ValueError, f"Playlist file {source} is not a Chrome Bookmarks json file: {e}")
+        roots = bookmarks.get("roots") if isinstance(bookmarks, dict) else None
+        if not isinstance(roots, dict):
+            raise_and_log(ValueError, f"Playlist file {source} has no bookmark roots")
+        return roots
+
+    def _walk_bookmarks(self, source: str):
+        """Walks the bookmark tree iteratively in bookmark order, yielding the links that pass the url filter.
+
+        Args:
+            source (str): Path to the Chrome Bookmarks file.
+
+        Yields:
+            tuple: The name, url, add date in unix seconds and folder path of a link.
+        """
+        roots = self._load_roots(source)
+        # an explicit stack of (node, folder path) keeps deep folder trees off the call stack
+        stack = [(root, "") for root in reversed(list(roots.values())) if isinstance(root, dict)]
+        while stack:
+            node, folder = stack.pop()
+            if node.get("type") == "url":
+                url = node.get("url", "")
+                name = node.get("name", "").strip()
+                if name and self.url_filter in url:
+                    yield name, url, webkit_to_unix_seconds(node.get("date_added")), folder
+                continue
+            name = node.get("name", "")
+            path = f"{folder}{self.FOLDER_SEPARATOR}{name}" if folder else name
+            stack.extend((child, path) for child in reversed(node.get("children", [])))
+
+    def iter_songs(self, source: str):
+        """Yields the name and url of every YouTube bookmark in a Chrome Bookmarks file.
+
+        Args:
+            source (str): Path to the Chrome Bookmarks file.
+
+        Yields:
+            tuple: The name and url of a song.
+        """
+        for name, url, _, _ in self._walk_bookmarks(source):
+            yield name, url
+
+    def iter_song_details(self, source: str):
+        """Yields every YouTube bookmark of a Chrome Bookmarks file with its add date and folder.
+
+        Args:
+            source (str): Path to the Chrome Bookmarks file.
+
+        Yields:
+            tuple: The name, url, add date and folder of a song.
+        """
+        yield from self._walk_bookmarks(source)
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_song_records(self, source: str) -> list[tuple[str, str]]:
+        """Reads the YouTube bookmarks of a Chrome Bookmarks file without loading pandas.
+
+        Args:
+            source (str): Path to the Chrome Bookmarks file.
+
+        Returns:
+            list: Name and url tuples of the songs.
+        """
+        songs = list(self.iter_songs(source))
+        if not songs:
+            raise_and_log(EmptyPlaylistError, "There were no songs found in the playlist source")
+        self.logger.info(f"loaded {len(songs)} songs into a song list")
+        return songs
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_songlist(self, source: str) -> "pd.DataFrame":
+        """Reads the YouTube bookmarks of a Chrome Bookmarks file into a dataframe.
+
+        Args:
+            source (str): Path to the Chrome Bookmarks file.
+
+        Returns:
+            pd.DataFrame: DataFrame containing song names, URLs, add dates and folders.
+        """
+        import pandas as pd
+
+        names, urls, add_dates, folders = [], [], [], []
+        for name, url, add_date, folder in self._walk_bookmarks(source):
+            names.append(name)
+            urls.append(url)
+            add_dates.append(add_date)
+            folders.append(folder)
+        songs = pd.DataFrame({
+            self.SONG_NAME_COLUMN: names,
+            self.SONG_URL_COLUMN: urls,
+            self.SONG_ADD_DATE_COLUMN: add_dates,
+            self.SONG_FOLDER_COLUMN: folders,
+        })
+        if songs.empty:
+            raise_and_log(EmptyPlaylistError, "There were no songs found in the playlist source")
+        self.logger.info(f"loaded {len(songs)} songs into a song list")
+        return songs
@@ -1,13 +1,91 @@
-import pandas as pd
+import csv
+from typing import TYPE_CHECKING
 from src.exceptions import EmptyPlaylistError
 from src.read_handlers.readhandler import ReadHandler
 from src.playlist_shared_utils import check_file_type
-from src.setup_logging import raise_and_log
+from src.metrics import rows_returned, source_bytes
+from src.setup_logging import call_log, raise_and_log
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ReadCSVHandler(ReadHandler):
+    CHUNK_SIZE = 50_000
+
+    def iter_songs(self, source: str):
+        """Yields song data from a csv file, parsing it a chunk of rows at a time.
+
+        Args:
+            source (str): The name of the song data file. song_file_name
+
+        Yields:
+            tuple: The name and url of a song.
+        """
+        import pandas as pd
 
-    def get_songlist(self, source: str) -> pd.DataFrame:
+        check_file_type(source, ['.csv'])
+        # the chunks are parsed as they are iterated, so a bad row surfaces inside the loop, not in read_csv
+        try:
+            with pd.read_csv(
+                source,
+                header=0,
+                names=[self.SONG_NAME_COLUMN, self.SONG_URL_COLUMN],
+                chunksize=self.CHUNK_SIZE
+            ) as chunks:
+                for chunk in chunks:
+                    yield from zip(chunk[self.SONG_NAME_COLUMN].tolist(), chunk[self.SONG_URL_COLUMN].tolist())
+        except FileNotFoundError:
+            raise_and_log(FileNotFoundError, f"Playlist file {source} does not exist to load songs from.")
+        except pd.errors.ParserError:
+            raise_and_log(
+                pd.errors.ParserError,
+                f"Check the format of playlist file {source}.  It is not parsing as a csv.")
+        except UnicodeDecodeError:
+            # UnicodeDecodeError can't be built from a message alone
+            raise_and_log(
+                ValueError,
+                f"Check the encoding of playlist file {source}.  It is not parsing as a UTF-8.")
+        except ValueError:
+            raise_and_log(
+                ValueError,
+                f"Check the headers and fields of playlist file {source}. "
+                f"One or more fields contains invalid values."
+            )
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_song_records(self, source: str) -> list[tuple[str, str]]:
+        """Reads song data from a csv file as plain Python tuples without loading pandas.
+
+        Like get_songlist, the last two fields of each row are the song name and url, so files
+        written with an index column read the same as files without one.
+
+        Args:
+            source (str): The name of the song data file. song_file_name
+
+        Returns:
+            list: Name and url tuples of the songs.
+        """
+        check_file_type(source, ['.csv'])
+        try:
+            with open(source, newline='', encoding='utf-8') as file_handle:
+                rows = csv.reader(file_handle)
+                next(rows, None)
+                songs = [(row[-2], row[-1]) for row in rows if len(row) >= 2]
+        except FileNotFoundError:
+            raise_and_log(FileNotFoundError, f"Playlist file {source} does not exist to load songs from.")
+        except UnicodeDecodeError:
+            # UnicodeDecodeError can't be built from a message alone
+            raise_and_log(
+                ValueError,
+                f"Check the encoding of playlist file {source}.  It is not parsing as a UTF-8.")
+        if not songs:
+            raise_and_log(EmptyPlaylistError, f"Playlist file {source} contained no songs.")
+        self.logger.info(f"loaded {len(songs)} songs into the song list")
+        return songs
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_songlist(self, source: str) -> "pd.DataFrame":
         """Reads a song data into a playlist from a csv file.
 
         Args:
@@ -16,6 +94,8 @@ class ReadCSVHandler(ReadHandler):
         Returns:
             dataframe: A dataframe containing all of the song data from the file.
         """
+        import pandas as pd
+
         check_file_type(source, ['.csv'])
         try:
             songs = pd.read_csv(
@@ -30,8 +110,9 @@ class ReadCSVHandler(ReadHandler):
                 pd.errors.ParserError,
                 f"Check the format of playlist file {source}.  It is not parsing as a csv.")
         except UnicodeDecodeError:
+            # UnicodeDecodeError can't be built from a message alone
             raise_and_log(
-                UnicodeDecodeError,
+                ValueError,
                 f"Check the encoding of playlist file {source}.  It is not parsing as a UTF-8.")
         except ValueError:
             raise_and_log(
@@ -1,13 +1,51 @@
+from typing import TYPE_CHECKING
 from src.read_handlers.readhandler import ReadHandler
-import pandas as pd
 from src.exceptions import EmptyPlaylistError
 from src.playlist_shared_utils import check_file_type
-from src.setup_logging import raise_and_log
+from src.metrics import rows_returned, source_bytes
+from src.setup_logging import call_log, raise_and_log
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ReadExcelHandler(ReadHandler):
 
-    def get_songlist(self, source: str) -> pd.DataFrame:
+    def iter_songs(self, source: str):
+        """Yields song data from an excel file row by row using openpyxl's read-only mode.
+
+        Args:
+            source (str): The name of the song data file. song_file_name
+
+        Yields:
+            tuple: The name and url of a song.
+        """
+        import openpyxl
+
+        check_file_type(source, ['.xlsx'])
+        try:
+            workbook = openpyxl.load_workbook(source, read_only=True)
+        except FileNotFoundError:
+            raise_and_log(FileNotFoundError, f"Playlist file {source} does not exist to load songs from.")
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, ())
+            try:
+                name_column = header.index(self.SONG_NAME_COLUMN)
+                url_column = header.index(self.SONG_URL_COLUMN)
+            except ValueError:
+                raise_and_log(
+                    ValueError,
+                    f"Check the headers and fields of playlist file {source}. "
+                    f"It needs {self.SONG_NAME_COLUMN} and {self.SONG_URL_COLUMN} columns.")
+            for row in rows:
+                if row[name_column] is not None and row[url_column] is not None:
+                    yield row[name_column], row[url_column]
+        finally:
+            workbook.close()
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_songlist(self, source: str) -> "pd.DataFrame":
         """Reads a song data into a playlist.
 
         Args:
@@ -16,6 +54,8 @@ class ReadExcelHandler(ReadHandler):
         Returns:
             dataframe: A dataframe containing all of the song data from the file.
         """
+        import pandas as pd
+
         check_file_type(source, ['.xlsx'])
         try:
             songs = pd.read_excel(
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from src.setup_logging import logger
+from src.metrics import rows_returned, source_bytes
+from src.setup_logging import call_log, logger
+from src.songstore import SongStore
 
 
 class ReadHandler(ABC):
     SONG_NAME_COLUMN = 'Song_Name'
     SONG_URL_COLUMN = 'Song_URL'
+    SONG_ADD_DATE_COLUMN = 'Song_Add_Date'
+    SONG_FOLDER_COLUMN = 'Song_Folder'
 
     def __init__(self, read_handler_logger: logger, source_file_name: str):
         self.logger = read_handler_logger
@@ -13,3 +17,59 @@ class ReadHandler(ABC):
     @abstractmethod
     def get_songlist(self, source: str):
         pass
+
+    @abstractmethod
+    def iter_songs(self, source: str):
+        """Yields the name and url of every song in a source without holding the whole source in memory.
+
+        Args:
+            source (str): The name of the song data file.
+
+        Yields:
+            tuple: The name and url of a song.
+        """
+        pass
+
+    def iter_song_details(self, source: str):
+        """Yields every song of a source along with its add date and folder.
+
+        Handlers whose sources record when and where a song was bookmarked override this, the rest
+        yield None for both.
+
+        Args:
+            source (str): The name of the song data file.
+
+        Yields:
+            tuple: The name, url, add date and folder of a song.
+        """
+        for name, url in self.iter_songs(source):
+            yield name, url, None, None
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_songstore(self, source: str) -> SongStore:
+        """Reads a source straight into a compact song store, without building a dataframe.
+
+        Args:
+            source (str): The name of the song data file.
+
+        Returns:
+            SongStore: The songs of the source.
+        """
+        songs = SongStore.from_records(self.iter_songs(source))
+        self.logger.info(f"loaded {len(songs)} songs into a compact song store")
+        return songs
+
+    @call_log(rows=rows_returned, byte_count=source_bytes)
+    def get_song_records(self, source: str) -> list[tuple[str, str]]:
+        """Reads the names and urls of the songs in a source as plain Python tuples.
+
+        Handlers that can read their source without pandas override this.
+
+        Args:
+            source (str): The name of the song data file.
+
+        Returns:
+            list: Name and url tuples of the songs.
+        """
+        songs = self.get_songlist(source)
+        return list(zip(songs[self.SONG_NAME_COLUMN].tolist(), songs[self.SONG_URL_COLUMN].tolist()))
@@ -0,0 +1,171 @@
+import glob
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+from src.exceptions import EmptyPlaylistError
+from src.playlist_shared_utils import canonical_video_url
+from src.read_handlers.readarrowhandler import ReadArrowHandler
+from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
+from src.read_handlers.readchromejsonhandler import ReadChromeJsonHandler
+from src.read_handlers.readcsvhandler import ReadCSVHandler
+from src.read_handlers.readexcelhandler import ReadExcelHandler
+from src.read_handlers.readhandler import ReadHandler
+from src.metrics import rows_returned
+from src.setup_logging import call_log, logger, raise_and_log
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+READ_HANDLERS_BY_EXTENSION = {
+    '.html': ReadBookmarksHandler,
+    '.htm': ReadBookmarksHandler,
+    '.csv': ReadCSVHandler,
+    '.xlsx': ReadExcelHandler,
+    '.json': ReadChromeJsonHandler,
+    '.arrow': ReadArrowHandler,
+    '.feather': ReadArrowHandler,
+}
+# chrome keeps its bookmarks in a json file named Bookmarks, with no extension
+CHROME_BOOKMARKS_FILE_NAME = 'Bookmarks'
+
+
+def read_handler_for_file(read_handler_logger: logger, file_name: str) -> ReadHandler:
+    """Choose a read handler for a source from its file extension
+
+    Args:
+        read_handler_logger: Logger: logger for the handler
+        file_name: str: path of the song source
+    Returns:
+        ReadHandler
+    """
+    _, ext = os.path.splitext(file_name)
+    if not ext and os.path.basename(file_name) == CHROME_BOOKMARKS_FILE_NAME:
+        ext = '.json'
+    try:
+        handler_class = READ_HANDLERS_BY_EXTENSION[ext.lower()]
+    except KeyError:
+        raise_and_log(
+            ValueError,
+            f"Invalid file type: {ext}. Allowed types are {list(READ_HANDLERS_BY_EXTENSION)}"
+        )
+    return handler_class(read_handler_logger, file_name)
+
+
+def _read_source(file_name: str) -> list[tuple[str, str, str, int, str]]:
+    # runs in a worker process, so the de-duplication key is computed in parallel as well
+    handler = read_handler_for_file(logger, file_name)
+    return [
+        (canonical_video_url(url), name, url, add_date, folder)
+        for name, url, add_date, folder in handler.iter_song_details(file_name)
+    ]
+
+
+class ReadMultiSourceHandler(ReadHandler):
+    """Reads many song sources in parallel and merges them into one song list.
+
+    Every source is parsed by the handler for its file extension in a pool of worker processes.
+    Results are merged in source order as they arrive, keeping the first song seen for each
+    canonical YouTube video, and at most max_workers * 2 parsed sources are held at once.
+
+    Attributes:
+        read_file_name (list): Paths or glob patterns of the song sources.
+        max_workers (int): Size of the process pool, None for one worker per cpu.
+    """
+
+    def __init__(self, read_handler_logger: logger, sources: list[str], max_workers: int = None):
+        super().__init__(read_handler_logger, sources)
+        self.max_workers = max_workers
+
+    @staticmethod
+    def expand_sources(sources: list[str]) -> list[str]:
+        """Expands glob patterns into source paths, dropping repeats.
+
+        Args:
+            sources (list): Paths or glob patterns of the song sources.
+
+        Returns:
+            list: Paths of the song sources in the order given.
+        """
+        file_names = []
+        for source in sources:
+            matches = sorted(glob.glob(source)) if glob.has_magic(source) else [source]
+            file_names.extend(match for match in matches if match not in file_names)
+        return file_names
+
+    def iter_songs(self, source: list[str]):
+        """Yields the songs of every source, skipping songs whose video was already yielded.
+
+        Args:
+            source (list): Paths or glob patterns of the song sources.
+
+        Yields:
+            tuple: The name and url of a song.
+        """
+        for name, url, _, _ in self.iter_song_details(source):
+            yield name, url
+
+    def iter_song_details(self, source: list[str]):
+        """Yields the songs of every source with their add date and folder, skipping repeated videos.
+
+        Args:
+            source (list): Paths or glob patterns of the song sources.
+
+        Yields:
+            tuple: The name, url, add date and folder of a song, None where the source does not record them.
+        """
+        yield from self._merge_sources(self.expand_sources(source))
+
+    def _merge_sources(self, file_names: list[str]):
+        seen_videos = set()
+        window = (self.max_workers or os.cpu_count() or 1) * 2
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            remaining = iter(file_names)
+            for file_name in remaining:
+                pending.append((file_name, executor.submit(_read_source, file_name)))
+                if len(pending) >= window:
+                    break
+            while pending:
+                file_name, future = pending.popleft()
+                next_file_name = next(remaining, None)
+                if next_file_name is not None:
+                    pending.append((next_file_name, executor.submit(_read_source, next_file_name)))
+                duplicates = 0
+                for video_url, name, url, add_date, folder in future.result():
+                    if video_url in seen_videos:
+                        duplicates += 1
+                        continue
+                    seen_videos.add(video_url)
+                    yield name, url, add_date, folder
+                self.logger.info(f"merged songs from {file_name}, skipping {duplicates} duplicates")
+
+    @call_log(rows=rows_returned)
+    def get_songlist(self, source: list[str]) -> "pd.DataFrame":
+        """Reads and merges every source into one de-duplicated song list.
+
+        Args:
+            source (list): Paths or glob patterns of the song sources.
+
+        Returns:
+            dataframe: A dataframe containing the merged song data.
+        """
+        import pandas as pd
+
+        file_names = self.expand_sources(source)
+        names, urls, add_dates, folders = [], [], [], []
+        for name, url, add_date, folder in self._merge_sources(file_names):
+            names.append(name)
+            urls.append(url)
+            add_dates.append(add_date)
+            folders.append(folder)
+        if not names:
+            raise_and_log(EmptyPlaylistError, f"Playlist sources {source} contained no songs.")
+        self.logger.info(f"loaded {len(names)} songs from {len(file_names)} sources into the song list")
+        songs = pd.DataFrame({self.SONG_NAME_COLUMN: names, self.SONG_URL_COLUMN: urls})
+        # sources without add dates or folders, like csv files, are filled the way the song library fills them
+        if any(add_date is not None for add_date in add_dates):
+            songs[self.SONG_ADD_DATE_COLUMN] = [0 if add_date is None else add_date for add_date in add_dates]
+        if any(folder is not None for folder in folders):
+            songs[self.SONG_FOLDER_COLUMN] = ["" if folder is None else folder for folder in folders]
+        return songs
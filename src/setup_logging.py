@@ -1,25 +1,144 @@
+import atexit
+import functools
+import json
 import logging
+import logging.handlers
+import queue
+import sys
+import time
+from src.metrics import metrics
+
+# one stream handler for the program's logger.  records are written by the thread logging them until an entry point
+# calls start_logging, which puts a queue in front of the handler so a background listener thread formats and
+# writes them, and log i/o never stalls parsing or picking.
+# the logger doesn't propagate, so nothing reaches the root logger's handlers a second time.
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-formatter = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-handler = logging.StreamHandler()
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+logger.propagate = False
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(sys.stderr)
+stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+logger.addHandler(stream_handler)
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one line of json, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def start_logging():
+    """Moves writing the program's records onto a background listener thread, stopped again at exit.
+
+    Entry points call it once their logging is configured.  Calling it while the listener runs does nothing.
+
+    Args:
+        No parameters
+
+    Returns:
+        None
+    """
+    global _listener
+    if _listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    logger.removeHandler(stream_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flushes the queued records, stops the background writer and writes later records directly.
+
+    Args:
+        No parameters
+
+    Returns:
+        None
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    atexit.unregister(stop_logging)
+    for queue_handler in list(logger.handlers):
+        logger.removeHandler(queue_handler)
+    logger.addHandler(stream_handler)
+
+
+def configure_logging(level: int = logging.INFO, json_output: bool = False, stream=None):
+    """Sets the level and format of the program's logger and points its stream handler at a stream.
+
+    The logger keeps its single handler chain, so records are never written twice.
+
+    Args:
+        level (int): Lowest level that is logged.
+        json_output (bool): Whether to write one json object per record instead of text lines.
+        stream (file): Stream to write to, stderr when not given.
+
+    Returns:
+        None
+    """
+    stream_handler.setStream(stream if stream else sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if json_output else logging.Formatter(LOG_FORMAT))
+    logger.setLevel(level)
+
+
+def call_log(func=None, *, rows=None, byte_count=None):
+    """Instruments a function: times each call into src.metrics.metrics while metrics are enabled.
+
+    While metrics are disabled the wrapper calls straight through.  Entry and exit are logged at debug level.
+
+    Args:
+        func (callable): The function to instrument, when used as a bare decorator.
+        rows (callable): Called with the result and the call's arguments, returns the rows processed.
+        byte_count (callable): Called with the result and the call's arguments, returns the bytes processed.
 
+    Returns:
+        callable: The instrumented function, or a decorator when called with keyword arguments only.
+    """
+    if func is None:
+        return functools.partial(call_log, rows=rows, byte_count=byte_count)
+    name = func.__qualname__
 
-def call_log(func):
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        if not metrics.enabled:
+            return func(*args, **kwargs)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Starting function %s", name)
+        started = time.perf_counter()
         try:
-            logger.info(f"Starting function {func.__name__}")
             result = func(*args, **kwargs)
-            logger.info(f"Ending function {func.__name__}")
-            return result
         except Exception as e:
-            logger.info(f"Exception {e} was caught in function {func.__name__}")
+            metrics.record(name, time.perf_counter() - started, failed=True)
+            logger.info(f"Exception {e} was caught in function {name}")
             raise
+        seconds = time.perf_counter() - started
+        metrics.record(
+            name,
+            seconds,
+            rows(result, *args, **kwargs) if rows else 0,
+            byte_count(result, *args, **kwargs) if byte_count else 0
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Ending function %s after %.6fs", name, seconds)
+        return result
     return wrapper
 
 
@@ -0,0 +1,116 @@
+from array import array
+from itertools import repeat
+import numpy as np
+
+# search index over song names and folders, in two levels:
+#  - an inverted index from every distinct lower cased word to the ascending positions of the songs holding it
+#  - a trigram index over the vocabulary of distinct words, to find the words containing a query word
+# a song library repeats the same few thousand words, so the trigram work is done once per new word rather
+# than once per song, and a query only intersects the postings of the words that contain its words.
+
+TRIGRAM_LENGTH = 3
+MAX_CACHED_QUERIES = 256
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def trigrams(word: str) -> set[str]:
+    return {word[i:i + TRIGRAM_LENGTH] for i in range(len(word) - TRIGRAM_LENGTH + 1)}
+
+
+class SongIndex:
+    """Index answering which songs have a name or folder containing every word of a query.
+
+    Songs can only be appended, so the index grows with a song list without being rebuilt.
+
+    Attributes:
+        words (list): Every distinct word indexed, in order of first appearance.
+    """
+
+    def __init__(self):
+        self.words = []
+        self._song_count = 0
+        self._word_numbers = {}
+        self._word_postings = []
+        self._word_trigrams = {}
+        self._hits_by_query = {}
+
+    def __len__(self) -> int:
+        return self._song_count
+
+    def _word_number(self, word: str) -> int:
+        number = self._word_numbers.get(word)
+        if number is None:
+            number = self._word_numbers[word] = len(self.words)
+            self.words.append(word)
+            self._word_postings.append(array("I"))
+            for gram in trigrams(word):
+                self._word_trigrams.setdefault(gram, []).append(number)
+        return number
+
+    def add(self, names, folders=None):
+        """Appends songs to the index, at the positions following the songs already indexed.
+
+        Args:
+            names (iterable): Names of the songs.
+            folders (iterable): Folder paths of the songs, if the source has them.
+
+        Returns:
+            None
+        """
+        word_numbers = self._word_numbers
+        word_postings = self._word_postings
+        for name, folder in zip(names, folders if folders is not None else repeat("")):
+            position = self._song_count
+            self._song_count += 1
+            text = f"{name} {folder}" if folder else str(name)
+            for word in set(text.casefold().split()):
+                number = word_numbers.get(word)
+                if number is None:
+                    number = self._word_number(word)
+                word_postings[number].append(position)
+        self._hits_by_query.clear()
+
+    def _words_containing(self, query_word: str) -> list[int]:
+        grams = trigrams(query_word)
+        if grams:
+            candidates = set.intersection(*(set(self._word_trigrams.get(gram, ())) for gram in grams))
+        else:
+            # a word shorter than a trigram is matched against the whole vocabulary, which is small
+            candidates = range(len(self.words))
+        return [number for number in candidates if query_word in self.words[number]]
+
+    def search(self, query: str) -> np.ndarray:
+        """Finds the songs whose name or folder contains every word of the query, ignoring case.
+
+        Args:
+            query (str): Words to match; each can be part of a longer word.
+
+        Returns:
+            ndarray: Ascending positions of the matching songs.
+        """
+        words = sorted(set(normalize(query).split()))
+        key = " ".join(words)
+        hits = self._hits_by_query.get(key)
+        if hits is not None:
+            return hits
+        hits = np.arange(self._song_count, dtype=np.int64) if not words else None
+        for word in words:
+            postings = [self._word_postings[number] for number in self._words_containing(word)]
+            if len(postings) == 1:
+                word_hits = np.array(postings[0], dtype=np.uint32)
+            elif postings:
+                # copies, since a posting exporting its buffer to numpy could no longer be appended to
+                word_hits = np.unique(np.concatenate([np.array(posting, dtype=np.uint32) for posting in postings]))
+            else:
+                word_hits = np.empty(0, dtype=np.uint32)
+            hits = word_hits if hits is None else np.intersect1d(hits, word_hits, assume_unique=True)
+            if not len(hits):
+                break
+        hits = hits.astype(np.int64)
+        if len(self._hits_by_query) >= MAX_CACHED_QUERIES:
+            self._hits_by_query.pop(next(iter(self._hits_by_query)))
+        self._hits_by_query[key] = hits
+        return hits
@@ -0,0 +1,161 @@
+import os
+import random
+import sqlite3
+import time
+from src.exceptions import EmptyPlaylistError
+from src.playlist_shared_utils import canonical_video_url
+from src.read_handlers.readhandler import ReadHandler
+from src.read_handlers.readmultisourcehandler import ReadMultiSourceHandler, read_handler_for_file
+from src.setup_logging import logger, raise_and_log
+
+
+class SongLibrary:
+    """Persistent song library kept in the sqlite database at db_path.
+
+    Songs are keyed on their canonical video url.  Each source is imported incrementally:
+    it is only re-parsed when its size or modification time changed since the last import,
+    and only songs with a newer add date or an unseen url are written.
+
+    Attributes:
+        db_conn (sqlite3.Connection): Connection to the library database.
+        logger (Logger): Logger instance for logging events.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS songs (
+            id INTEGER PRIMARY KEY,
+            video_url TEXT NOT NULL UNIQUE,
+            song_name TEXT NOT NULL,
+            song_url TEXT NOT NULL,
+            add_date INTEGER NOT NULL DEFAULT 0,
+            folder TEXT NOT NULL DEFAULT '',
+            source TEXT
+        );
+        CREATE TABLE IF NOT EXISTS imports (
+            source TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            last_add_date INTEGER NOT NULL DEFAULT 0,
+            imported_at REAL NOT NULL
+        );
+    """
+    UPSERT_SONG = """
+        INSERT INTO songs (video_url, song_name, song_url, add_date, folder, source)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(video_url) DO UPDATE SET
+            song_name = excluded.song_name,
+            add_date = excluded.add_date,
+            folder = excluded.folder,
+            source = excluded.source
+    """
+
+    def __init__(self, db_conn: sqlite3.Connection, library_logger: logger = logger):
+        self.db_conn = db_conn
+        self.logger = library_logger
+        self.db_conn.executescript(self.SCHEMA)
+
+    def __len__(self) -> int:
+        return self.db_conn.execute("SELECT COUNT(*) FROM songs").fetchone()[0]
+
+    def _source_state(self, source: str):
+        return self.db_conn.execute(
+            "SELECT size, mtime_ns, last_add_date FROM imports WHERE source = ?",
+            (os.path.abspath(source),)
+        ).fetchone()
+
+    def is_current(self, source: str) -> bool:
+        """Checks whether a source is unchanged since it was last imported.
+
+        Args:
+            source (str): Path of the song source file.
+
+        Returns:
+            bool: True when the library already holds the source as it is on disk.
+        """
+        state = self._source_state(source)
+        if state is None:
+            return False
+        stat = os.stat(source)
+        return state[0] == stat.st_size and state[1] == stat.st_mtime_ns
+
+    def import_songs(self, songs, source: str, last_add_date: int = 0) -> int:
+        """Imports the songs of a song list that are new since the last import of its source.
+
+        Args:
+            songs (dataframe): Song list as produced by a read handler.
+            source (str): Path of the song source file.
+            last_add_date (int): Add date watermark of the previous import of the source.
+
+        Returns:
+            int: Number of songs written to the library.
+        """
+        names = songs[ReadHandler.SONG_NAME_COLUMN].tolist()
+        urls = songs[ReadHandler.SONG_URL_COLUMN].tolist()
+        add_dates = (
+            songs[ReadHandler.SONG_ADD_DATE_COLUMN].tolist()
+            if ReadHandler.SONG_ADD_DATE_COLUMN in songs else [0] * len(songs)
+        )
+        folders = (
+            songs[ReadHandler.SONG_FOLDER_COLUMN].tolist()
+            if ReadHandler.SONG_FOLDER_COLUMN in songs else [""] * len(songs)
+        )
+        known_urls = {row[0] for row in self.db_conn.execute("SELECT video_url FROM songs")}
+        source_path = os.path.abspath(source)
+        imported_urls = set()
+        rows = []
+        for name, url, add_date, folder in zip(names, urls, add_dates, folders):
+            video_url = canonical_video_url(url)
+            if video_url in imported_urls:
+                continue
+            if add_date > last_add_date or video_url not in known_urls:
+                rows.append((video_url, name, url, int(add_date), folder, source_path))
+                imported_urls.add(video_url)
+        with self.db_conn:
+            self.db_conn.executemany(self.UPSERT_SONG, rows)
+            stat = os.stat(source)
+            self.db_conn.execute(
+                "INSERT OR REPLACE INTO imports (source, size, mtime_ns, last_add_date, imported_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source_path, stat.st_size, stat.st_mtime_ns, int(max([last_add_date, *add_dates])), time.time())
+            )
+        self.logger.info(f"imported {len(rows)} new songs from {source} into the song library")
+        return len(rows)
+
+    def sync(self, read_handler: ReadHandler) -> int:
+        """Brings the library up to date with the source of a read handler.
+
+        Args:
+            read_handler (ReadHandler): Handler for the song source.
+
+        Returns:
+            int: Number of songs written to the library, 0 when the source was unchanged.
+        """
+        source = read_handler.read_file_name
+        if isinstance(read_handler, ReadMultiSourceHandler):
+            return sum(
+                self.sync(read_handler_for_file(self.logger, file_name))
+                for file_name in read_handler.expand_sources(source)
+            )
+        if self.is_current(source):
+            self.logger.info(f"song library is current with {source}, skipping the read")
+            return 0
+        state = self._source_state(source)
+        songs = read_handler.get_songlist(source)
+        return self.import_songs(songs, source, state[2] if state else 0)
+
+    def pick_random(self) -> tuple[str, str]:
+        """Picks a random song with an indexed lookup rather than a scan.
+
+        Args:
+            No parameters
+
+        Returns:
+            tuple: The name and url of the song.
+        """
+        max_id = self.db_conn.execute("SELECT MAX(id) FROM songs").fetchone()[0]
+        if max_id is None:
+            raise_and_log(EmptyPlaylistError, "The song library contains no songs")
+        song = self.db_conn.execute(
+            "SELECT song_name, song_url FROM songs WHERE id >= ? ORDER BY id LIMIT 1",
+            (random.randint(1, max_id),)
+        ).fetchone()
+        return song[0], song[1]
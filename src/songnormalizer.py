@@ -0,0 +1,150 @@
+import html
+from typing import TYPE_CHECKING
+from src.playlist_shared_utils import YOUTUBE_WATCH_URL, extract_video_id
+from src.setup_logging import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# post-read clean up of a whole song table, run with pandas string methods over every column at once:
+#  - urls are reduced to the canonical watch url of their video id, dropping &list=, &t= and the youtu.be,
+#    m.youtube.com, shorts and embed forms
+#  - names have html entities such as &#39; unescaped and the " - YouTube" suffix of page titles removed
+#  - rows without a name or a video id are invalid, and dropped or only reported
+# with pyarrow installed the columns are held as arrow strings, so the string methods and the video id
+# regex run in arrow's compute kernels.  RE2 has no lookahead, so the video id pattern ends on a consumed
+# delimiter where playlist_shared_utils' pattern looks ahead.
+# html.unescape has no vectorised form, so it runs only over the few names holding an "&".
+# paths that read songs one at a time, streaming, indexed seeks and pick_one, get the same clean up per song
+# from normalize_song and normalize_records, without pandas.
+
+SONG_NAME_COLUMN = 'Song_Name'
+SONG_URL_COLUMN = 'Song_URL'
+YOUTUBE_TITLE_SUFFIX = " - YouTube"
+VIDEO_ID_PATTERN = r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/)(?P<video_id>[A-Za-z0-9_-]{11})(?:[^A-Za-z0-9_-]|$)"
+MAX_REPORTED_INVALID_SONGS = 5
+
+
+def _string_dtype():
+    import pandas as pd
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.StringDtype()
+    return pd.StringDtype("pyarrow")
+
+
+def _extract_video_ids(urls: "pd.Series") -> "pd.Series":
+    import pandas as pd
+
+    if urls.dtype.storage != "pyarrow":
+        return urls.str.extract(VIDEO_ID_PATTERN, expand=False)
+    # pandas' extract loops in Python even over arrow strings, so the regex is run by arrow directly
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    video_ids = pc.struct_field(pc.extract_regex(pa.array(urls.array), VIDEO_ID_PATTERN), [0])
+    return pd.Series(pd.array(video_ids, dtype=urls.dtype), index=urls.index)
+
+
+def _keep_dtype(values: "pd.Series", original: "pd.Series") -> "pd.Series":
+    import pandas as pd
+
+    return values.astype(original.dtype if isinstance(original.dtype, pd.StringDtype) else object)
+
+
+def normalize_songs(songs: "pd.DataFrame", drop_invalid: bool = True) -> "pd.DataFrame":
+    """Canonicalises the urls and cleans the names of a song table, and drops or reports invalid rows.
+
+    Args:
+        songs (dataframe): Song table with song name and url columns, left unchanged.
+        drop_invalid (bool): Whether to drop rows without a name or a YouTube video id, rather than
+            keeping them as they were and only reporting them.
+
+    Returns:
+        dataframe: The normalised song table, renumbered from 0 when rows were dropped.
+    """
+    if songs.empty or SONG_NAME_COLUMN not in songs or SONG_URL_COLUMN not in songs:
+        return songs
+    original_names = songs[SONG_NAME_COLUMN]
+    original_urls = songs[SONG_URL_COLUMN]
+
+    string_dtype = _string_dtype()
+    names = original_names.astype(string_dtype).str.strip()
+    escaped = names.str.contains("&", regex=False, na=False)
+    if escaped.any():
+        names[escaped] = names[escaped].map(html.unescape)
+    names = names.str.removesuffix(YOUTUBE_TITLE_SUFFIX).str.strip()
+
+    urls = original_urls.astype(string_dtype).str.strip()
+    video_ids = _extract_video_ids(urls)
+    canonical_urls = YOUTUBE_WATCH_URL + video_ids
+
+    valid = (video_ids.notna() & names.str.len().gt(0)).fillna(False).astype(bool)
+    urls_changed = int((canonical_urls != urls)[valid].sum())
+    names_changed = int((names != original_names.astype(string_dtype))[valid].sum())
+    invalid = songs[~valid]
+
+    normalized = songs.copy()
+    normalized[SONG_NAME_COLUMN] = _keep_dtype(names, original_names).where(valid, original_names)
+    normalized[SONG_URL_COLUMN] = _keep_dtype(canonical_urls, original_urls).where(valid, original_urls)
+    if drop_invalid and len(invalid):
+        normalized = normalized[valid].reset_index(drop=True)
+
+    logger.info(
+        "normalized %d songs: %d urls canonicalized, %d names cleaned, %d invalid songs %s",
+        len(songs), urls_changed, names_changed, len(invalid), "dropped" if drop_invalid else "kept"
+    )
+    for name, url in zip(invalid[SONG_NAME_COLUMN].head(MAX_REPORTED_INVALID_SONGS).tolist(),
+                         invalid[SONG_URL_COLUMN].head(MAX_REPORTED_INVALID_SONGS).tolist()):
+        logger.info("invalid song %r with url %r has no name or YouTube video id", name, url)
+    return normalized
+
+
+def normalize_song(name, url) -> tuple[str, str] | None:
+    """Canonicalises the url and cleans the name of one song, as normalize_songs does for a table.
+
+    Args:
+        name (str): Name of the song, as read.
+        url (str): Url of the song, as read.
+
+    Returns:
+        tuple: The cleaned name and canonical watch url, or None when the song has no name or YouTube video id.
+    """
+    if not isinstance(name, str) or not isinstance(url, str):
+        return None
+    name = name.strip()
+    if "&" in name:
+        name = html.unescape(name)
+    name = name.removesuffix(YOUTUBE_TITLE_SUFFIX).strip()
+    video_id = extract_video_id(url.strip())
+    if not name or video_id is None:
+        return None
+    return name, YOUTUBE_WATCH_URL + video_id
+
+
+def normalize_records(songs, drop_invalid: bool = True):
+    """Normalises songs read one at a time, dropping or reporting the invalid ones.
+
+    Args:
+        songs (iterable): Name and url tuples, as read.
+        drop_invalid (bool): Whether to drop songs without a name or a YouTube video id, rather than
+            passing them on as they were and only reporting them.
+
+    Yields:
+        tuple: The name and url of a song.
+    """
+    invalid_count = 0
+    for name, url in songs:
+        song = normalize_song(name, url)
+        if song is None:
+            invalid_count += 1
+            if invalid_count <= MAX_REPORTED_INVALID_SONGS:
+                logger.info("invalid song %r with url %r has no name or YouTube video id", name, url)
+            if drop_invalid:
+                continue
+            song = (name if isinstance(name, str) else "", url if isinstance(url, str) else "")
+        yield song
+    if invalid_count:
+        logger.info("%d invalid songs %s", invalid_count, "dropped" if drop_invalid else "kept")
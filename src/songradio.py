@@ -0,0 +1,307 @@
+import os
+import numpy as np
+from src.setup_logging import call_log, logger
+
+# radio: sequences of related songs from a seed song, by similarity of song names and folder paths.
+#  - each song's "name folder" text becomes a tf-idf weighted bag of character trigrams, hashed into
+#    FEATURE_BITS bits, and is randomly projected down to VECTOR_DIMENSIONS dense dimensions, so the
+#    library is a float16 matrix instead of a sparse one numpy can't hold.  the projection is sparse:
+#    each trigram adds to PROJECTION_NONZEROS random dimensions with random signs, so vectorising
+#    costs one bincount per song chunk rather than a dense product
+#  - random hyperplane lsh over the dense vectors: TABLE_COUNT tables, each keyed on the signs of
+#    BITS_PER_TABLE projections, with each table kept as a sorted copy of its keys so a bucket is a
+#    binary search away.  candidates from the buckets are ranked by cosine similarity; a library of up to
+#    EXACT_SEARCH_SONGS songs skips the tables and ranks every song
+#  - everything is saved to one npz next to the song source along with a hash of every song, so a
+#    changed song list only vectorises the songs whose hash is new.  document frequencies only grow,
+#    so a vector keeps the idf weights of the day it was computed
+# the projection and hyperplanes come from fixed seeds, so saved vectors stay comparable across runs.
+
+NGRAM_LENGTH = 3
+FEATURE_BITS = 16
+VECTOR_DIMENSIONS = 64
+PROJECTION_NONZEROS = 8
+TABLE_COUNT = 8
+BITS_PER_TABLE = 14
+PROJECTION_SEED = 1_234_567
+HYPERPLANE_SEED = 7_654_321
+VECTORIZE_CHUNK_SONGS = 4096
+MAX_BUCKET_CANDIDATES = 256
+MIN_CANDIDATES = 64
+# below this many songs every song is a candidate: the scan is cheap, and sparse buckets would miss neighbours
+EXACT_SEARCH_SONGS = 20_000
+TOP_CHOICES = 5
+# the seed's vector is mixed into every lookup, so a long sequence drifts less from where it started
+SEED_WEIGHT = 0.5
+INDEX_SETTINGS = np.array([
+    FEATURE_BITS, VECTOR_DIMENSIONS, PROJECTION_NONZEROS, TABLE_COUNT, BITS_PER_TABLE, PROJECTION_SEED, HYPERPLANE_SEED
+], dtype=np.int64)
+
+
+def song_texts(names, folders=None) -> list[str]:
+    if folders is None:
+        return [f" {' '.join(str(name).casefold().split())} " for name in names]
+    return [f" {' '.join(f'{name} {folder}'.casefold().split())} " for name, folder in zip(names, folders)]
+
+
+def song_hashes(names, folders=None) -> np.ndarray:
+    """Hashes each song's name and folder, to recognise songs already vectorised."""
+    import pandas as pd
+
+    hashes = pd.util.hash_array(np.array([str(name) for name in names], dtype=object), categorize=False)
+    if folders is not None:
+        folder_hashes = pd.util.hash_array(np.array([str(folder) for folder in folders], dtype=object),
+                                           categorize=False)
+        hashes = hashes * np.uint64(0x100000001B3) ^ folder_hashes
+    return hashes
+
+
+def _song_features(texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # every trigram of utf-8 bytes within a song, hashed into the feature space, counted per song
+    encoded = [text.encode("utf-8") for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint32)
+    song_of_byte = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    if len(data) < NGRAM_LENGTH:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64)
+    codes = (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+    within_song = song_of_byte[:-2] == song_of_byte[2:]
+    features = ((codes[within_song].astype(np.uint64) * np.uint64(0x9E3779B1)) & np.uint64(0xFFFFFFFF))
+    features = (features >> np.uint64(32 - FEATURE_BITS)).astype(np.int64)
+    keys, counts = np.unique(song_of_byte[:-2][within_song] << FEATURE_BITS | features, return_counts=True)
+    return keys >> FEATURE_BITS, keys & ((1 << FEATURE_BITS) - 1), counts
+
+
+class SongRadio:
+    """Finds songs related to a song by the character trigrams of their names and folders.
+
+    Attributes:
+        file_name (str): Npz file the vectors and index are saved to, or None to keep them in memory only.
+        vectors (ndarray): Unit length float16 vector of every song, in song list order.
+        keys (ndarray): The lsh bucket key of every song in each table.
+        document_frequencies (ndarray): Number of vectorised songs holding each hashed trigram.
+        document_count (int): Number of songs counted in document_frequencies.
+    """
+
+    def __init__(self, file_name: str = None):
+        self.file_name = file_name
+        self._clear()
+        self._loaded = file_name is None
+        hyperplanes = np.random.default_rng(HYPERPLANE_SEED).standard_normal(
+            (VECTOR_DIMENSIONS, TABLE_COUNT * BITS_PER_TABLE)
+        )
+        self._hyperplanes = hyperplanes.astype(np.float32)
+        self._key_bits = (1 << np.arange(BITS_PER_TABLE)).astype(np.uint16)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def _clear(self):
+        self.vectors = np.empty((0, VECTOR_DIMENSIONS), dtype=np.float16)
+        self.keys = np.empty((0, TABLE_COUNT), dtype=np.uint16)
+        self.document_frequencies = np.zeros(1 << FEATURE_BITS, dtype=np.int64)
+        self.document_count = 0
+        self._song_hashes = np.empty(0, dtype=np.uint64)
+        self._orders = np.empty((TABLE_COUNT, 0), dtype=np.int32)
+        self._sorted_keys = np.empty((TABLE_COUNT, 0), dtype=np.uint16)
+
+    def _load(self):
+        self._loaded = True
+        if not os.path.exists(self.file_name):
+            return
+        try:
+            with np.load(self.file_name) as saved:
+                if not np.array_equal(saved["settings"], INDEX_SETTINGS):
+                    logger.info("radio index %s was built with other settings, rebuilding it", self.file_name)
+                    return
+                self.vectors = saved["vectors"]
+                self.keys = saved["keys"]
+                self.document_frequencies = saved["document_frequencies"]
+                self.document_count = int(saved["document_count"])
+                self._song_hashes = saved["song_hashes"]
+                self._orders = saved["orders"]
+                self._sorted_keys = saved["sorted_keys"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.info("could not load radio index %s, rebuilding it: %s", self.file_name, e)
+            self._clear()
+
+    def save(self):
+        if self.file_name is None:
+            return
+        directory, base_name = os.path.split(self.file_name)
+        temp_file_name = os.path.join(directory, f".{os.getpid()}.tmp.{base_name}")
+        try:
+            with open(temp_file_name, "wb") as index_handle:
+                np.savez(
+                    index_handle,
+                    settings=INDEX_SETTINGS,
+                    vectors=self.vectors,
+                    keys=self.keys,
+                    document_frequencies=self.document_frequencies,
+                    document_count=np.int64(self.document_count),
+                    song_hashes=self._song_hashes,
+                    orders=self._orders,
+                    sorted_keys=self._sorted_keys,
+                )
+            os.replace(temp_file_name, self.file_name)
+        except OSError as e:
+            logger.info("could not save radio index %s, keeping it in memory: %s", self.file_name, e)
+            if os.path.exists(temp_file_name):
+                os.remove(temp_file_name)
+
+    def _bucket_keys(self, vectors: np.ndarray) -> np.ndarray:
+        signs = (vectors.astype(np.float32) @ self._hyperplanes) > 0
+        return (signs.reshape(len(vectors), TABLE_COUNT, BITS_PER_TABLE) * self._key_bits).sum(axis=2, dtype=np.uint16)
+
+    def _vectorize(self, texts: list[str]) -> np.ndarray:
+        # the trigrams are counted for the document frequencies first, and held in narrow integer types until
+        # the frequencies are complete and the vectors can be weighted
+        chunks = []
+        for chunk_start in range(0, len(texts), VECTORIZE_CHUNK_SONGS):
+            songs, features, counts = _song_features(texts[chunk_start:chunk_start + VECTORIZE_CHUNK_SONGS])
+            self.document_frequencies += np.bincount(features, minlength=len(self.document_frequencies))
+            chunks.append((chunk_start, songs.astype(np.uint16), features.astype(np.uint16),
+                           np.minimum(counts, np.iinfo(np.uint16).max).astype(np.uint16)))
+        self.document_count += len(texts)
+        inverse_frequencies = (
+            np.log((1 + self.document_count) / (1 + self.document_frequencies)) + 1
+        ).astype(np.float32)
+        projection_rng = np.random.default_rng(PROJECTION_SEED)
+        feature_dimensions = projection_rng.integers(
+            VECTOR_DIMENSIONS, size=(PROJECTION_NONZEROS, 1 << FEATURE_BITS), dtype=np.int64
+        )
+        feature_signs = projection_rng.choice(np.array([-1.0, 1.0], dtype=np.float32),
+                                              size=(PROJECTION_NONZEROS, 1 << FEATURE_BITS))
+        vectors = np.zeros((len(texts), VECTOR_DIMENSIONS), dtype=np.float32)
+        for chunk_start, songs, features, counts in chunks:
+            if not len(songs):
+                continue
+            songs = songs.astype(np.int64)
+            weights = (1 + np.log(counts, dtype=np.float32)) * inverse_frequencies[features]
+            song_count = int(songs[-1]) + 1
+            weights /= np.sqrt(np.bincount(songs, weights=weights * weights, minlength=song_count))[songs]
+            cells = np.concatenate([
+                songs * VECTOR_DIMENSIONS + dimensions[features] for dimensions in feature_dimensions
+            ])
+            cell_weights = np.concatenate([weights * signs[features] for signs in feature_signs])
+            vectors[chunk_start:chunk_start + song_count] = np.bincount(
+                cells, weights=cell_weights, minlength=song_count * VECTOR_DIMENSIONS
+            ).reshape(song_count, VECTOR_DIMENSIONS)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors.astype(np.float16)
+
+    @call_log
+    def update(self, names, folders=None):
+        """Brings the index up to date with a song list, vectorising only the songs it hasn't seen.
+
+        Args:
+            names (list): Names of the songs, in song list order.
+            folders (list): Folder paths of the songs, if the source has them.
+
+        Returns:
+            None
+        """
+        if not self._loaded:
+            self._load()
+        hashes = song_hashes(names, folders)
+        if np.array_equal(hashes, self._song_hashes):
+            return
+        known_order = np.argsort(self._song_hashes, kind="stable")
+        known_hashes = self._song_hashes[known_order]
+        found_at = np.minimum(np.searchsorted(known_hashes, hashes), max(len(known_hashes) - 1, 0))
+        known = (known_hashes[found_at] == hashes) if len(known_hashes) else np.zeros(len(hashes), dtype=bool)
+        new_positions = np.flatnonzero(~known)
+
+        vectors = np.empty((len(hashes), VECTOR_DIMENSIONS), dtype=np.float16)
+        keys = np.empty((len(hashes), TABLE_COUNT), dtype=np.uint16)
+        vectors[known] = self.vectors[known_order[found_at[known]]]
+        keys[known] = self.keys[known_order[found_at[known]]]
+        if len(new_positions):
+            folders = None if folders is None else list(folders)
+            names = list(names)
+            texts = song_texts([names[position] for position in new_positions.tolist()],
+                               None if folders is None else [folders[position] for position in new_positions.tolist()])
+            vectors[new_positions] = self._vectorize(texts)
+            keys[new_positions] = self._bucket_keys(vectors[new_positions])
+        self.vectors = vectors
+        self.keys = keys
+        self._song_hashes = hashes
+        self._orders = np.argsort(keys.T, axis=1, kind="stable").astype(np.int32)
+        self._sorted_keys = np.take_along_axis(keys.T, self._orders.astype(np.int64), axis=1)
+        logger.info("radio index vectorised %d new songs of %d", len(new_positions), len(hashes))
+        self.save()
+
+    def _bucket(self, table: int, key: int, rng: np.random.Generator) -> np.ndarray:
+        # needles of the keys' own dtype, or numpy casts the whole table to compare
+        start, end = np.searchsorted(self._sorted_keys[table], np.array([key, key + 1], dtype=np.uint16))
+        if end - start > MAX_BUCKET_CANDIDATES:
+            # a huge bucket is sampled as a random window, the bucket being in song list order
+            start = int(rng.integers(start, end - MAX_BUCKET_CANDIDATES + 1))
+            end = start + MAX_BUCKET_CANDIDATES
+        return self._orders[table, start:end]
+
+    def candidates(self, query: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Finds the songs sharing an lsh bucket with a query vector, probing the neighbouring buckets if few do.
+
+        A library of up to EXACT_SEARCH_SONGS songs is searched whole.
+
+        Args:
+            query (ndarray): Unit length query vector.
+            rng (Generator): Random generator for sampling large buckets.
+
+        Returns:
+            ndarray: Positions of the candidate songs.
+        """
+        if len(self) <= EXACT_SEARCH_SONGS:
+            return np.arange(len(self))
+        keys = self._bucket_keys(query[None, :])[0]
+        found = np.unique(np.concatenate([self._bucket(table, int(key), rng) for table, key in enumerate(keys)]))
+        if len(found) < MIN_CANDIDATES:
+            probes = [self._bucket(table, int(key) ^ int(bit), rng)
+                      for table, key in enumerate(keys) for bit in self._key_bits]
+            found = np.unique(np.concatenate([found, *probes]))
+        return found
+
+    def sequence(self, seed_position: int, length: int, rng: np.random.Generator, skip=()) -> list[int]:
+        """Generates a radio sequence: the seed song, then each next song related to the seed and the song before.
+
+        Each next song is picked at random from the TOP_CHOICES most similar candidates not yet in the sequence,
+        or from the whole song list when no candidate is left.
+
+        Args:
+            seed_position (int): Position of the seed song in the song list.
+            length (int): Number of songs in the sequence, the seed included.
+            rng (Generator): Random generator for the picks.
+            skip (iterable): Positions never to pick, such as songs with dead links.
+
+        Returns:
+            list: Positions of the songs in play order.
+        """
+        excluded = set(skip)
+        excluded.add(seed_position)
+        positions = [seed_position]
+        seed_vector = self.vectors[seed_position].astype(np.float32)
+        current_vector = seed_vector
+        # converting from float16 is the slow part of scoring, so a library searched whole is converted once
+        library = self.vectors.astype(np.float32) if len(self) <= EXACT_SEARCH_SONGS else None
+        while len(positions) < min(length, len(self)):
+            query = SEED_WEIGHT * seed_vector + current_vector
+            query /= max(float(np.linalg.norm(query)), 1e-12)
+            found = self.candidates(query, rng)
+            found = found[~np.isin(found, np.fromiter(excluded, dtype=np.int64, count=len(excluded)))]
+            if len(found):
+                scores = (library[found] if library is not None else self.vectors[found].astype(np.float32)) @ query
+                if len(found) > TOP_CHOICES:
+                    found = found[np.argpartition(-scores, TOP_CHOICES)[:TOP_CHOICES]]
+                position = int(found[rng.integers(len(found))])
+            elif len(excluded) < len(self):
+                position = int(rng.integers(len(self)))
+                while position in excluded:
+                    position = int(rng.integers(len(self)))
+            else:
+                break
+            positions.append(position)
+            excluded.add(position)
+            current_vector = self.vectors[position].astype(np.float32)
+        return positions
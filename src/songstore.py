@@ -0,0 +1,147 @@
+from array import array
+from src.playlist_shared_utils import YOUTUBE_VIDEO_ID
+
+
+class SongStore:
+    """Compact, array backed table of song names and urls.
+
+    A url ending in an 11 character YouTube video id is stored as an interned prefix number plus the id
+    in a fixed width byte buffer, so the shared "https://www.youtube.com/watch?v=" costs a few bytes per
+    song.  Any other url is interned whole with a blank id.  Names live in one utf-8 buffer addressed
+    by an offsets array.
+
+    Attributes:
+        SONG_NAME_COLUMN (str): Name of the song column.
+        SONG_URL_COLUMN (str): Name of the URL column.
+    """
+    SONG_NAME_COLUMN = 'Song_Name'
+    SONG_URL_COLUMN = 'Song_URL'
+    VIDEO_ID_WIDTH = 11
+    BLANK_VIDEO_ID = bytes(VIDEO_ID_WIDTH)
+
+    def __init__(self):
+        self._prefixes = []
+        self._prefix_numbers = {}
+        self._url_prefixes = array('I')
+        self._video_ids = bytearray()
+        self._name_offsets = array('Q', [0])
+        self._names = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._url_prefixes)
+
+    def _intern_prefix(self, prefix: str) -> int:
+        prefix_number = self._prefix_numbers.get(prefix)
+        if prefix_number is None:
+            prefix_number = len(self._prefixes)
+            self._prefixes.append(prefix)
+            self._prefix_numbers[prefix] = prefix_number
+        return prefix_number
+
+    def append(self, name: str, url: str):
+        """Adds one song to the end of the store.
+
+        Args:
+            name (str): Name of the song.
+            url (str): Url of the song.
+
+        Returns:
+            None
+        """
+        match = YOUTUBE_VIDEO_ID.search(url)
+        if match and match.end() == len(url):
+            prefix_number = self._intern_prefix(url[:match.start(1)])
+            self._video_ids += match.group(1).encode('ascii')
+        else:
+            prefix_number = self._intern_prefix(url)
+            self._video_ids += self.BLANK_VIDEO_ID
+        self._names += name.encode('utf-8')
+        self._name_offsets.append(len(self._names))
+        # the length comes from the prefixes, so growing them last lets other threads read while songs are added
+        self._url_prefixes.append(prefix_number)
+
+    def extend(self, songs):
+        """Adds songs to the end of the store.
+
+        Args:
+            songs (iterable): Name and url tuples of the songs.
+
+        Returns:
+            None
+        """
+        for name, url in songs:
+            self.append(name, url)
+
+    def name_at(self, position: int) -> str:
+        return self._names[self._name_offsets[position]:self._name_offsets[position + 1]].decode('utf-8')
+
+    def url_at(self, position: int) -> str:
+        start = position * self.VIDEO_ID_WIDTH
+        video_id = bytes(self._video_ids[start:start + self.VIDEO_ID_WIDTH])
+        prefix = self._prefixes[self._url_prefixes[position]]
+        if video_id == self.BLANK_VIDEO_ID:
+            return prefix
+        return prefix + video_id.decode('ascii')
+
+    def __getitem__(self, position: int) -> tuple[str, str]:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("song store index out of range")
+        return self.name_at(position), self.url_at(position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self.name_at(position), self.url_at(position)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the song data buffers, excluding the interned prefixes."""
+        return (
+            self._url_prefixes.itemsize * len(self._url_prefixes)
+            + len(self._video_ids)
+            + self._name_offsets.itemsize * len(self._name_offsets)
+            + len(self._names)
+        )
+
+    @classmethod
+    def from_records(cls, songs) -> "SongStore":
+        """Builds a store from name and url tuples.
+
+        Args:
+            songs (iterable): Name and url tuples of the songs.
+
+        Returns:
+            SongStore: The filled store.
+        """
+        store = cls()
+        store.extend(songs)
+        return store
+
+    @classmethod
+    def from_dataframe(cls, songs) -> "SongStore":
+        """Builds a store from a song list dataframe.
+
+        Args:
+            songs (dataframe): Song list with song name and url columns.
+
+        Returns:
+            SongStore: The filled store.
+        """
+        return cls.from_records(zip(songs[cls.SONG_NAME_COLUMN].tolist(), songs[cls.SONG_URL_COLUMN].tolist()))
+
+    def to_dataframe(self):
+        """Expands the store into a song list dataframe.
+
+        Args:
+            No parameters
+
+        Returns:
+            dataframe: Song list with song name and url columns.
+        """
+        import pandas as pd
+
+        return pd.DataFrame({
+            self.SONG_NAME_COLUMN: [self.name_at(position) for position in range(len(self))],
+            self.SONG_URL_COLUMN: [self.url_at(position) for position in range(len(self))],
+        })
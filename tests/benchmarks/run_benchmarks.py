@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from tests.benchmarks.synthetic_library import write_bookmarks_export, write_csv_playlist, write_xlsx_playlist
+from src.playlist import PlayList
+from src.playlist_write_handlers import CSVWriteHandler, ExcelWriteHandler
+from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
+from src.read_handlers.readcsvhandler import ReadCSVHandler
+from src.read_handlers.readexcelhandler import ReadExcelHandler
+
+# benchmark suite for the read handlers, write handlers and song selection.
+# run from the repository root:
+#   PYTHONPATH=src:. python -m tests.benchmarks.run_benchmarks --sizes 1000 100000 --save baseline.json
+#   PYTHONPATH=src:. python -m tests.benchmarks.run_benchmarks --sizes 1000 100000 --compare baseline.json
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+PICK_COUNT = 10_000
+LARGE_EXPORT_SAMPLE_SONGS = 2_000
+
+
+class QuietLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+class QuietBrowser:
+    def open_browser_with_url(self, url): pass
+
+
+def measure(benchmark, rows: int) -> dict:
+    """Runs a benchmark once, measuring wall time and peak traced memory.
+
+    Args:
+        benchmark (callable): Zero argument callable doing the work.
+        rows (int): Number of rows or picks the work processes.
+
+    Returns:
+        dict: Wall time in seconds, rows per second and peak memory in bytes.
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    benchmark()
+    wall_time = time.perf_counter() - started
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": rows,
+        "wall_seconds": wall_time,
+        "rows_per_second": rows / wall_time if wall_time else float("inf"),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def benchmark_size(song_count: int, work_dir: str, include_excel: bool = True) -> dict:
+    """Runs every benchmark against synthetic libraries of one size.
+
+    Args:
+        song_count (int): Number of songs in the synthetic libraries.
+        work_dir (str): Directory for the synthetic sources and written playlists.
+        include_excel (bool): Whether to benchmark the xlsx handlers, which are slow at large sizes.
+
+    Returns:
+        dict: Measurements keyed on benchmark name.
+    """
+    logger = QuietLogger()
+    bookmarks = write_bookmarks_export(os.path.join(work_dir, f"bookmarks_{song_count}.html"), song_count)
+    csv_source = write_csv_playlist(os.path.join(work_dir, f"songs_{song_count}.csv"), song_count)
+    bookmarks_handler = ReadBookmarksHandler(logger, bookmarks)
+    fast_scan_handler = ReadBookmarksHandler(logger, bookmarks, fast_scan=True)
+    csv_handler = ReadCSVHandler(logger, csv_source)
+    results = {
+        "read_bookmarks": measure(lambda: bookmarks_handler.get_songlist(bookmarks), song_count),
+        "read_bookmarks_records": measure(lambda: bookmarks_handler.get_song_records(bookmarks), song_count),
+        "read_bookmarks_fast_scan": measure(lambda: fast_scan_handler.get_song_records(bookmarks), song_count),
+        "read_csv": measure(lambda: csv_handler.get_songlist(csv_source), song_count),
+        "read_csv_records": measure(lambda: csv_handler.get_song_records(csv_source), song_count),
+        "read_bookmarks_songstore": measure(lambda: bookmarks_handler.get_songstore(bookmarks), song_count),
+    }
+    songs = csv_handler.get_songlist(csv_source)
+    results["write_csv"] = measure(
+        lambda: CSVWriteHandler(os.path.join(work_dir, "write.csv"), skip_unchanged=False).write_songlist(songs),
+        song_count
+    )
+    if include_excel:
+        xlsx_source = write_xlsx_playlist(os.path.join(work_dir, f"songs_{song_count}.xlsx"), song_count)
+        excel_handler = ReadExcelHandler(logger, xlsx_source)
+        results["read_excel"] = measure(lambda: excel_handler.get_songlist(xlsx_source), song_count)
+        results["write_excel"] = measure(
+            lambda: ExcelWriteHandler(
+                os.path.join(work_dir, "write.xlsx"), skip_unchanged=False
+            ).write_songlist(songs), song_count
+        )
+
+    playlist = PlayList(QuietBrowser(), logger, seed=0)
+    playlist.songs = songs
+    playlist.read_songlist_handler = csv_handler
+
+    def pick_one_at_a_time():
+        for _ in range(PICK_COUNT):
+            playlist.play_random()
+
+    results["select_play_random"] = measure(pick_one_at_a_time, PICK_COUNT)
+    results["select_pick_many"] = measure(lambda: playlist.pick_many(PICK_COUNT), PICK_COUNT)
+    results["select_streaming"] = measure(lambda: playlist.pick_streaming(), song_count)
+    return results
+
+
+def benchmark_large_export(export_megabytes: int, work_dir: str) -> dict:
+    """Compares the html parser and the fast scanner on one synthetic export of about the given size.
+
+    Peak memory isn't traced here, tracemalloc would dominate the run time at this size.
+
+    Args:
+        export_megabytes (int): Approximate size of the export, e.g. 1024 for the 1 GB benchmark.
+        work_dir (str): Directory for the synthetic export.
+
+    Returns:
+        dict: Measurements keyed on benchmark name.
+    """
+    logger = QuietLogger()
+    sample = write_bookmarks_export(os.path.join(work_dir, "bookmarks_sample.html"), LARGE_EXPORT_SAMPLE_SONGS)
+    song_count = int(export_megabytes * 2 ** 20 / (os.path.getsize(sample) / LARGE_EXPORT_SAMPLE_SONGS))
+    bookmarks = write_bookmarks_export(os.path.join(work_dir, f"bookmarks_{export_megabytes}mb.html"), song_count)
+    results = {}
+    for name, handler in (
+            ("read_bookmarks_records", ReadBookmarksHandler(logger, bookmarks)),
+            ("read_bookmarks_fast_scan", ReadBookmarksHandler(logger, bookmarks, fast_scan=True)),
+    ):
+        started = time.perf_counter()
+        handler.get_song_records(bookmarks)
+        wall_time = time.perf_counter() - started
+        results[name] = {
+            "rows": song_count,
+            "wall_seconds": wall_time,
+            "rows_per_second": song_count / wall_time,
+            "peak_bytes": 0,
+        }
+    return results
+
+
+def run_benchmarks(sizes: list[int], work_dir: str, include_excel: bool = True) -> dict:
+    """Runs the benchmark suite for every library size.
+
+    Args:
+        sizes (list): Library sizes to benchmark.
+        work_dir (str): Directory for the synthetic sources and written playlists.
+        include_excel (bool): Whether to benchmark the xlsx handlers.
+
+    Returns:
+        dict: Run metadata and measurements keyed on size, then benchmark name.
+    """
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {str(size): benchmark_size(size, work_dir, include_excel) for size in sizes},
+    }
+
+
+def compare_runs(baseline: dict, current: dict) -> list[dict]:
+    """Compares two runs benchmark by benchmark.
+
+    Args:
+        baseline (dict): Earlier run, as returned by run_benchmarks.
+        current (dict): Later run, as returned by run_benchmarks.
+
+    Returns:
+        list: One row per benchmark present in both runs, with time and memory ratios of current over baseline.
+    """
+    comparison = []
+    for size, benchmarks in current["results"].items():
+        for name, measurement in benchmarks.items():
+            earlier = baseline["results"].get(size, {}).get(name)
+            if earlier is None:
+                continue
+            comparison.append({
+                "size": size,
+                "benchmark": name,
+                "time_ratio": measurement["wall_seconds"] / earlier["wall_seconds"],
+                "memory_ratio": measurement["peak_bytes"] / max(earlier["peak_bytes"], 1),
+            })
+    return comparison
+
+
+def print_run(run: dict, comparison: list[dict] = None):
+    ratios = {(row["size"], row["benchmark"]): row for row in comparison or []}
+    for size, benchmarks in run["results"].items():
+        for name, measurement in benchmarks.items():
+            line = (
+                f"{size:>9} {name:<24} {measurement['wall_seconds']:>10.4f}s "
+                f"{measurement['rows_per_second']:>14.0f} rows/s {measurement['peak_bytes'] / 2 ** 20:>10.2f} MiB"
+            )
+            if (size, name) in ratios:
+                row = ratios[(size, name)]
+                line += f"  time x{row['time_ratio']:.2f} memory x{row['memory_ratio']:.2f}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Random music benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000], help="library sizes, e.g. 1000 100000 1000000")
+    parser.add_argument("--no_excel", action="store_true", help="skip the xlsx read and write benchmarks")
+    parser.add_argument("--save", type=str, help=f"baseline file to write, relative names go in {BASELINE_DIR}")
+    parser.add_argument("--compare", type=str, help="baseline file to compare this run against")
+    parser.add_argument("--large_export_mb", type=int,
+                        help="also compare the bookmark readers on one export of this many MB, e.g. 1024")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as work_dir:
+        run = run_benchmarks(args.sizes, work_dir, not args.no_excel)
+        if args.large_export_mb:
+            run["results"][f"{args.large_export_mb}MB"] = benchmark_large_export(args.large_export_mb, work_dir)
+    comparison = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, args.compare)) as baseline_handle:
+            comparison = compare_runs(json.load(baseline_handle), run)
+    print_run(run, comparison)
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, args.save), "w") as baseline_handle:
+            json.dump(run, baseline_handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+import base64
+import csv
+import random
+import string
+
+# synthetic song libraries for the benchmarks: chrome style bookmark exports, csv and xlsx playlists.
+
+VIDEO_ID_CHARACTERS = string.ascii_letters + string.digits + "-_"
+FOLDER_NAMES = ["Synthwave", "Ambient", "Soundtracks", "Jazz", "Drum and Bass", "Live Sets", "Covers", "Misc"]
+WORDS = [
+    "Blade", "Runner", "Night", "Drive", "Neon", "Echo", "Ocean", "Remix", "Live", "Theme", "Dream", "City",
+    "Lights", "Vangelis", "Cosmo", "Bloom", "Lemon", "Jelly", "Spinna", "Mix", "Official", "Video", "Extended"
+]
+BOOKMARKS_HEADER = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<!-- This is an automatically generated file.
+     It will be read and overwritten.
+     DO NOT EDIT! -->
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+"""
+
+
+def make_songs(song_count: int, seed: int = 0) -> list[tuple[str, str]]:
+    """Builds random song names and YouTube watch urls.
+
+    Args:
+        song_count (int): Number of songs.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        list: Name and url tuples of the songs.
+    """
+    rng = random.Random(seed)
+    songs = []
+    for _ in range(song_count):
+        name = " ".join(rng.choices(WORDS, k=rng.randint(2, 6))) + " - YouTube"
+        video_id = "".join(rng.choices(VIDEO_ID_CHARACTERS, k=11))
+        songs.append((name, f"https://www.youtube.com/watch?v={video_id}"))
+    return songs
+
+
+def make_icon(rng: random.Random) -> str:
+    return "data:image/png;base64," + base64.b64encode(rng.randbytes(rng.randint(600, 2400))).decode()
+
+
+def write_bookmarks_export(file_name: str, song_count: int, seed: int = 0, icons: int = 64) -> str:
+    """Writes a chrome style Netscape bookmarks export with ICON blobs, nested folders and non-music links.
+
+    Args:
+        file_name (str): Path of the export to write.
+        song_count (int): Number of YouTube links in the export.
+        seed (int): Seed of the random generator.
+        icons (int): Number of distinct ICON blobs to draw from.
+
+    Returns:
+        str: The path of the export.
+    """
+    rng = random.Random(seed)
+    icon_pool = [make_icon(rng) for _ in range(icons)]
+    add_date = 1600000000
+    with open(file_name, "w", encoding="utf-8", newline="\r\n") as file_handle:
+        file_handle.write(BOOKMARKS_HEADER)
+        file_handle.write('    <DT><H3 ADD_DATE="1600000000" PERSONAL_TOOLBAR_FOLDER="true">Bookmarks Bar</H3>\n')
+        file_handle.write("    <DL><p>\n")
+        depth = 2
+        for index, (name, url) in enumerate(make_songs(song_count, seed)):
+            if index % 500 == 0 and index:
+                # close the current folder and open a new one, one or two levels deep
+                file_handle.write("    " * depth + "</DL><p>\n")
+                depth -= 1
+                if depth > 1 and rng.random() < 0.5:
+                    file_handle.write("    " * depth + "</DL><p>\n")
+                    depth -= 1
+                for _ in range(rng.randint(1, 2)):
+                    file_handle.write(
+                        "    " * depth + f'<DT><H3 ADD_DATE="{add_date}">{rng.choice(FOLDER_NAMES)}</H3>\n'
+                    )
+                    file_handle.write("    " * depth + "<DL><p>\n")
+                    depth += 1
+            add_date += rng.randint(1, 5000)
+            if rng.random() < 0.1:
+                file_handle.write(
+                    "    " * depth + f'<DT><A HREF="https://example.com/article/{index}" ADD_DATE="{add_date}" '
+                    f'ICON="{rng.choice(icon_pool)}">Article {index}</A>\n'
+                )
+            file_handle.write(
+                "    " * depth + f'<DT><A HREF="{url}" ADD_DATE="{add_date}" ICON="{rng.choice(icon_pool)}">'
+                f'{name}</A>\n'
+            )
+        while depth > 1:
+            depth -= 1
+            file_handle.write("    " * depth + "</DL><p>\n")
+        file_handle.write("</DL><p>\n")
+    return file_name
+
+
+def write_csv_playlist(file_name: str, song_count: int, seed: int = 0) -> str:
+    """Writes a csv playlist in the layout CSVWriteHandler produces.
+
+    Args:
+        file_name (str): Path of the playlist to write.
+        song_count (int): Number of songs.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        str: The path of the playlist.
+    """
+    with open(file_name, "w", encoding="utf-8", newline="") as file_handle:
+        writer = csv.writer(file_handle)
+        writer.writerow(["Index", "Song_Name", "Song_URL"])
+        for index, (name, url) in enumerate(make_songs(song_count, seed)):
+            writer.writerow([index, name, url])
+    return file_name
+
+
+def write_xlsx_playlist(file_name: str, song_count: int, seed: int = 0) -> str:
+    """Writes an xlsx playlist in the layout ExcelWriteHandler produces.
+
+    Args:
+        file_name (str): Path of the playlist to write.
+        song_count (int): Number of songs.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        str: The path of the playlist.
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    worksheet.append(["Index", "Song_Name", "Song_URL"])
+    for index, (name, url) in enumerate(make_songs(song_count, seed)):
+        worksheet.append([index, name, url])
+    workbook.save(file_name)
+    return file_name
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+from src.exceptions import EmptyPlaylistError
+from src.playlist_write_handlers import ArrowWriteHandler
+from src.read_handlers.readarrowhandler import ReadArrowHandler
+from src.read_handlers.readmultisourcehandler import read_handler_for_file
+
+# a pyarrow built against another numpy fails with ImportError rather than ModuleNotFoundError
+pytest.importorskip("pyarrow", exc_type=ImportError)
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg): self.logs.append(msg)
+
+    def error(self, msg): self.logs.append(msg)
+
+
+@pytest.fixture
+def songs():
+    return pd.DataFrame({
+        "Song_Name": ["Song One", "Song Two", "Song Three"],
+        "Song_URL": [f"https://www.youtube.com/watch?v={i:011d}" for i in range(3)],
+        "Song_Folder": ["Synthwave", "Synthwave/Vangelis", ""],
+    })
+
+
+@pytest.fixture
+def arrow_file(tmp_path, songs):
+    file = str(tmp_path / "songs.arrow")
+    ArrowWriteHandler(file).write_songlist(songs)
+    return file
+
+
+def test_round_trip_keeps_every_column(arrow_file, songs):
+    read = ReadArrowHandler(DummyLogger(), arrow_file).get_songlist(arrow_file)
+    assert read.columns.tolist() == songs.columns.tolist()
+    assert read["Song_Name"].tolist() == songs["Song_Name"].tolist()
+    assert read["Song_Name"].iat[1] == "Song Two"
+
+
+def test_song_records_and_iter_songs(arrow_file, songs):
+    handler = ReadArrowHandler(DummyLogger(), arrow_file)
+    expected = list(zip(songs["Song_Name"], songs["Song_URL"]))
+    assert handler.get_song_records(arrow_file) == expected
+    assert list(handler.iter_songs(arrow_file)) == expected
+
+
+def test_invalid_sources(tmp_path, songs):
+    with pytest.raises(ValueError):
+        ReadArrowHandler(DummyLogger(), "x").get_songlist(str(tmp_path / "songs.csv"))
+    with pytest.raises(FileNotFoundError):
+        ReadArrowHandler(DummyLogger(), "x").get_songlist(str(tmp_path / "missing.arrow"))
+    empty = str(tmp_path / "empty.feather")
+    ArrowWriteHandler(empty).write_songlist(songs.iloc[:0])
+    with pytest.raises(EmptyPlaylistError):
+        ReadArrowHandler(DummyLogger(), "x").get_songlist(empty)
+    no_urls = str(tmp_path / "no_urls.arrow")
+    ArrowWriteHandler(no_urls).write_songlist(songs[["Song_Name"]].assign(Song_URL=songs["Song_URL"]).drop(
+        columns="Song_URL").assign(Other=1))
+    with pytest.raises(ValueError):
+        ReadArrowHandler(DummyLogger(), "x").get_songlist(no_urls)
+
+
+def test_arrow_files_are_registered(arrow_file):
+    assert isinstance(read_handler_for_file(DummyLogger(), arrow_file), ReadArrowHandler)
+    with pytest.raises(ValueError):
+        ArrowWriteHandler("songs.csv").write_songlist(pd.DataFrame({"Song_Name": [], "Song_URL": []}))
@@ -0,0 +1,24 @@
+from src.myhtmlparser import BookmarksStreamParser
+from tests.benchmarks.run_benchmarks import compare_runs, run_benchmarks
+from tests.benchmarks.synthetic_library import write_bookmarks_export
+
+
+def test_synthetic_bookmarks_export_parses(tmp_path):
+    export = write_bookmarks_export(str(tmp_path / "bookmarks.html"), 1200)
+    parser = BookmarksStreamParser()
+    with open(export, "rb") as file_handle:
+        parser.feed_file(file_handle)
+    assert len(parser.names) == 1200
+    assert any("/" in folder for folder in parser.folders)
+
+
+def test_benchmark_run_and_compare(tmp_path):
+    run = run_benchmarks([50], str(tmp_path))
+    measurements = run["results"]["50"]
+    assert {"read_bookmarks", "read_csv", "read_excel", "write_csv", "write_excel", "select_pick_many"} <= set(
+        measurements
+    )
+    assert all(measurement["peak_bytes"] > 0 for measurement in measurements.values())
+    comparison = compare_runs(run, run)
+    assert len(comparison) == len(measurements)
+    assert all(row["time_ratio"] == 1.0 for row in comparison)
@@ -0,0 +1,60 @@
+import pytest
+from src.myhtmlparser import BookmarksStreamParser
+from src.read_handlers import bookmarkscanner
+from src.read_handlers.bookmarkscanner import chunk_boundaries, scan_bookmarks
+from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
+from tests.benchmarks.synthetic_library import write_bookmarks_export
+from tests.test_readbookmarkshandler import BOOKMARKS_EXPORT
+
+
+class DummyLogger:
+    def info(self, msg): pass
+
+    def error(self, msg): pass
+
+
+def parse_with_stream_parser(file_name: str) -> dict:
+    parser = BookmarksStreamParser()
+    with open(file_name, "rb") as file_handle:
+        parser.feed_file(file_handle)
+    return {"names": parser.names, "urls": parser.urls, "add_dates": parser.add_dates, "folders": parser.folders}
+
+
+@pytest.fixture
+def synthetic_export(tmp_path):
+    return write_bookmarks_export(str(tmp_path / "bookmarks.html"), 2000)
+
+
+def test_scan_matches_stream_parser(tmp_path):
+    file = tmp_path / "bookmarks.html"
+    file.write_text(BOOKMARKS_EXPORT.replace("Song Two", "Song &amp; Two"), encoding="utf-8")
+    scanned = scan_bookmarks(str(file))
+    assert scanned["names"] == ["Song One - YouTube", "Song & Two", "Song Three"]
+    assert scanned["folders"] == ["Bookmarks Bar", "Bookmarks Bar/Synthwave", "Bookmarks Bar"]
+    assert scanned == parse_with_stream_parser(str(file))
+
+
+def test_parallel_scan_matches_stream_parser(synthetic_export, monkeypatch):
+    monkeypatch.setattr(bookmarkscanner, "PARALLEL_SCAN_MIN_BYTES", 0)
+    assert scan_bookmarks(synthetic_export, max_workers=2) == parse_with_stream_parser(synthetic_export)
+
+
+def test_chunk_boundaries_split_on_lines(synthetic_export):
+    with open(synthetic_export, "rb") as file_handle:
+        contents = file_handle.read()
+    ranges = chunk_boundaries(synthetic_export, 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(contents)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(contents[end - 1:end] == b"\n" for _, end in ranges)
+
+
+def test_handler_fast_scan(synthetic_export):
+    fast = ReadBookmarksHandler(DummyLogger(), synthetic_export, fast_scan=True)
+    assert fast.get_song_records(synthetic_export) == ReadBookmarksHandler(
+        DummyLogger(), synthetic_export
+    ).get_song_records(synthetic_export)
+
+
+def test_handler_fast_scan_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ReadBookmarksHandler(DummyLogger(), "x", fast_scan=True).get_song_records(str(tmp_path / "missing.html"))
@@ -0,0 +1,163 @@
+import os
+import time
+import pytest
+from src.bookmarkswatcher import BookmarksTail, BookmarksWatch, InotifyWatcher, PollingWatcher, _load_libc
+from src.playlist import PlayList
+from src.songstore import SongStore
+from tests.test_readbookmarkshandler import BOOKMARKS_EXPORT
+
+NEW_SONG_LINE = '<DT><A HREF="https://www.youtube.com/watch?v=dQw4w9WgXcQ" ADD_DATE="1700000000">Song Four</A>\n'
+
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+@pytest.fixture
+def export(tmp_path):
+    file = tmp_path / "bookmarks.html"
+    file.write_text(BOOKMARKS_EXPORT, encoding="utf-8")
+    return file
+
+
+def append(file, text: str):
+    with open(file, "a", encoding="utf-8") as file_handle:
+        file_handle.write(text)
+
+
+def test_tail_parses_only_added_lines(export):
+    tail = BookmarksTail(str(export))
+    links, full_parse = tail.read()
+    assert full_parse
+    assert [name for name, _, _, _ in links] == ["Song One - YouTube", "Song Two", "Song Three"]
+    assert tail.offset == os.path.getsize(export)
+
+    assert tail.read() == ([], False)
+
+    append(export, NEW_SONG_LINE + '<DT><A HREF="https://www.youtube.com/watch?v=AQ4UffoLa0o">Song F')
+    links, full_parse = tail.read()
+    assert not full_parse
+    assert links == [("Song Four", "https://www.youtube.com/watch?v=dQw4w9WgXcQ", 1700000000, "")]
+
+    # the unfinished line is parsed once its newline arrives
+    append(export, "ive</A>\n")
+    links, full_parse = tail.read()
+    assert not full_parse
+    assert [name for name, _, _, _ in links] == ["Song Five"]
+
+
+def test_tail_parses_again_when_earlier_content_changes(export):
+    tail = BookmarksTail(str(export))
+    tail.read()
+    export.write_text(BOOKMARKS_EXPORT.replace("Song Two", "Song Deux") + NEW_SONG_LINE, encoding="utf-8")
+    links, full_parse = tail.read()
+    assert full_parse
+    assert [name for name, _, _, _ in links] == ["Song One - YouTube", "Song Deux", "Song Three", "Song Four"]
+
+
+def test_tail_parses_again_when_truncated(export):
+    tail = BookmarksTail(str(export))
+    tail.read()
+    export.write_text(BOOKMARKS_EXPORT[:BOOKMARKS_EXPORT.index("Song Three") + len("Song Three</A>\n")],
+                      encoding="utf-8")
+    links, full_parse = tail.read()
+    assert full_parse
+    assert [name for name, _, _, _ in links] == ["Song One - YouTube", "Song Two", "Song Three"]
+
+
+def test_tail_raises_for_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        BookmarksTail(str(tmp_path / "missing.html")).read()
+
+
+def test_watch_appends_to_playlist_keeping_index(export):
+    playlist = PlayList(None, DummyLogger(), seed=1)
+    watch = BookmarksWatch(playlist, str(export))
+    watch.refresh()
+    assert playlist.songs["Song_Name"].tolist() == ["Song One", "Song Two", "Song Three"]
+    index = playlist.song_index()
+    assert index.search("four").tolist() == []
+
+    append(export, NEW_SONG_LINE)
+    assert len(watch.refresh()) == 1
+    assert playlist.songs["Song_Name"].tolist()[-1] == "Song Four"
+    assert playlist.songs["Song_Folder"].tolist()[-1] == ""
+    assert playlist.song_index() is index
+    assert index.search("four").tolist() == [3]
+
+    export.write_text(BOOKMARKS_EXPORT.replace("Song One - YouTube", "Song Uno"), encoding="utf-8")
+    watch.refresh()
+    assert playlist.songs["Song_Name"].tolist() == ["Song Uno", "Song Two", "Song Three"]
+    assert playlist.song_index() is not index
+
+
+def test_watch_appends_to_compact_songs(export):
+    playlist = PlayList(None, DummyLogger(), seed=1)
+    playlist.compact_songs = True
+    watch = BookmarksWatch(playlist, str(export))
+    watch.refresh()
+    songs = playlist.songs
+    assert isinstance(songs, SongStore) and len(songs) == 3
+    append(export, NEW_SONG_LINE)
+    watch.refresh()
+    assert playlist.songs is songs
+    assert songs[3] == ("Song Four", "https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+
+def test_watch_reload_parses_from_start(export):
+    playlist = PlayList(None, DummyLogger(), seed=1)
+    watch = BookmarksWatch(playlist, str(export))
+    watch.refresh()
+    assert len(watch.reload()) == 3
+
+
+def test_watch_changes_wait_for_dispatch(export):
+    playlist = PlayList(None, DummyLogger(), seed=1)
+    watch = BookmarksWatch(playlist, str(export))
+    pending = []
+    watch.dispatch = pending.append
+    watch.refresh()
+    append(export, NEW_SONG_LINE)
+    watch.refresh()
+    assert playlist.songs.empty
+    for change in pending:
+        change()
+    assert playlist.songs["Song_Name"].tolist() == ["Song One", "Song Two", "Song Three", "Song Four"]
+
+
+def test_polling_watcher_notices_change(export):
+    watcher = PollingWatcher(str(export), poll_interval=0.01)
+    assert not watcher.wait(timeout=0.05)
+    append(export, NEW_SONG_LINE)
+    assert watcher.wait(timeout=1)
+
+
+def test_inotify_watcher_notices_change(export, tmp_path):
+    libc = _load_libc()
+    if libc is None:
+        pytest.skip("inotify is only available on Linux")
+    watcher = InotifyWatcher(str(export), libc)
+    try:
+        (tmp_path / "other.html").write_text("unrelated")
+        assert not watcher.wait(timeout=0.05)
+        append(export, NEW_SONG_LINE)
+        assert watcher.wait(timeout=1)
+    finally:
+        watcher.close()
+
+
+def test_watch_thread_picks_up_appended_songs(export):
+    playlist = PlayList(None, DummyLogger(), seed=1)
+    watch = BookmarksWatch(playlist, str(export), poll_interval=0.01)
+    watch.refresh()
+    watch.start()
+    try:
+        append(export, NEW_SONG_LINE)
+        deadline = time.monotonic() + 5
+        while len(playlist.songs) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watch.stop()
+    assert playlist.songs["Song_Name"].tolist()[-1] == "Song Four"
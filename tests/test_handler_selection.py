@@ -0,0 +1,63 @@
+import sys
+import pandas as pd
+import pytest
+from src.handler_selection import (
+    cache_read_songlist_handler, select_read_songlist_handler, select_write_songlist_handler
+)
+from src.main import get_args
+from src.playlist_write_handlers import CSVWriteHandler, ExcelWriteHandler
+from src.read_handlers.readarrowhandler import ReadArrowHandler
+from src.read_handlers.readcachedhandler import CachedReadHandler
+
+
+def parse_cli(monkeypatch, *cli_args):
+    monkeypatch.setattr(sys, "argv", ["main.py", *cli_args])
+    return get_args({})
+
+
+@pytest.fixture
+def configs(tmp_path):
+    return {"cache_dir": str(tmp_path / ".cache")}
+
+
+def test_arrow_source_is_not_cached(monkeypatch, configs):
+    args = parse_cli(monkeypatch, "-ra", "songs.arrow")
+    handler = cache_read_songlist_handler(select_read_songlist_handler(args), args, configs)
+    assert type(handler) is ReadArrowHandler
+
+
+def test_bookmarks_source_is_cached(monkeypatch, configs):
+    args = parse_cli(monkeypatch, "-rb", "bookmarks.html")
+    handler = cache_read_songlist_handler(select_read_songlist_handler(args), args, configs)
+    assert isinstance(handler, CachedReadHandler)
+
+
+def make_songs(count):
+    return pd.DataFrame({
+        "Song_Name": [f"Song{i}" for i in range(count)],
+        "Song_URL": [f"https://www.youtube.com/watch?v={i:011d}" for i in range(count)],
+    })
+
+
+def test_xlsx_is_written_by_default(monkeypatch):
+    handler = select_write_songlist_handler(parse_cli(monkeypatch), {})
+    assert isinstance(handler, ExcelWriteHandler)
+
+
+def test_csv_flag_appends(monkeypatch, tmp_path):
+    file = tmp_path / "x.csv"
+    args = parse_cli(monkeypatch, "--wc", str(file), "--append_csv")
+    handler = select_write_songlist_handler(args, {})
+    assert isinstance(handler, CSVWriteHandler)
+    handler.write_songlist(make_songs(3))
+    appended_to = []
+    original_append = pd.DataFrame.to_csv
+
+    def record_append(self, path, *write_args, **write_kwargs):
+        appended_to.append(write_kwargs.get("mode", "w"))
+        return original_append(self, path, *write_args, **write_kwargs)
+
+    monkeypatch.setattr(pd.DataFrame, "to_csv", record_append)
+    select_write_songlist_handler(args, {}).write_songlist(make_songs(5))
+    assert pd.read_csv(file)["Song_Name"].tolist() == [f"Song{i}" for i in range(5)]
+    assert appended_to == ["a"]
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import pandas as pd
+import pytest
+from src.bookmarkswatcher import BookmarksWatch
+from src.jukebox_client import send_jukebox_command
+from src.jukebox_server import JukeboxServer
+from src.playlist import PlayList
+from tests.test_readbookmarkshandler import BOOKMARKS_EXPORT
+
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+class GrowingReadHandler:
+    read_file_name = "songs.csv"
+
+    def __init__(self, songs_per_read=1):
+        self.reads = 0
+        self.songs_per_read = songs_per_read
+
+    def get_songlist(self, source):
+        self.reads += 1
+        song_count = self.reads * self.songs_per_read
+        return pd.DataFrame({
+            "Song_Name": [f"Song{i}" for i in range(song_count)],
+            "Song_URL": [f"https://www.youtube.com/watch?v={i:011d}" for i in range(song_count)],
+        })
+
+
+def make_playlist(songs_per_read):
+    songs = PlayList(None, DummyLogger(), seed=5)
+    songs.read_songlist_handler = GrowingReadHandler(songs_per_read)
+    songs.read_songs()
+    return songs
+
+
+@pytest.fixture
+def playlist():
+    return make_playlist(1)
+
+
+@pytest.fixture
+def library():
+    return make_playlist(4)
+
+
+def test_handle_command(playlist):
+    server = JukeboxServer(playlist)
+    assert server.handle_command("pick")["songs"] == [
+        {"name": "Song0", "url": "https://www.youtube.com/watch?v=00000000000"}
+    ]
+    assert len(server.handle_command("pick 3")["songs"]) == 1
+    assert "error" in server.handle_command("pick many")
+    assert "error" in server.handle_command("pick 0")
+    assert "error" in server.handle_command("play")
+
+
+def test_pick_returns_distinct_live_songs(library):
+    server = JukeboxServer(library)
+    library.dead_links = {"https://www.youtube.com/watch?v=00000000001"}
+    for _ in range(10):
+        urls = [song["url"] for song in server.handle_command("pick 3")["songs"]]
+        assert len(urls) == len(set(urls)) == 3
+        assert "https://www.youtube.com/watch?v=00000000001" not in urls
+
+
+def test_reload_swaps_songs_in_on_the_event_loop(library, monkeypatch):
+    threads = {}
+    read_songlist = library.read_songlist_handler.get_songlist
+
+    def record_read(source):
+        threads["read"] = threading.current_thread()
+        return read_songlist(source)
+
+    def record_replace(songs):
+        threads["replace"] = threading.current_thread()
+        PlayList.replace_songs(library, songs)
+
+    monkeypatch.setattr(library.read_songlist_handler, "get_songlist", record_read)
+    monkeypatch.setattr(library, "replace_songs", record_replace)
+    assert asyncio.run(JukeboxServer(library).reload()) == {"reloaded": 8}
+    assert threads["read"] is not threading.main_thread()
+    assert threads["replace"] is threading.main_thread()
+    assert len(library.songs) == 8
+
+
+def test_watch_changes_run_on_the_event_loop(tmp_path, monkeypatch):
+    export = tmp_path / "bookmarks.html"
+    export.write_text(BOOKMARKS_EXPORT, encoding="utf-8")
+    playlist = PlayList(None, DummyLogger(), seed=1)
+    watch = BookmarksWatch(playlist, str(export), poll_interval=0.01)
+    watch.refresh()
+    replaced_on = []
+
+    def record_replace(songs):
+        replaced_on.append(threading.current_thread())
+        PlayList.replace_songs(playlist, songs)
+
+    monkeypatch.setattr(playlist, "replace_songs", record_replace)
+
+    async def scenario():
+        server = JukeboxServer(playlist, port=0, watch=watch)
+        serving = asyncio.create_task(server.serve_forever())
+        await asyncio.sleep(0.05)
+        response = await server.reload()
+        serving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await serving
+        return response
+
+    assert asyncio.run(scenario()) == {"reloaded": 3}
+    assert replaced_on and all(thread is threading.main_thread() for thread in replaced_on)
+    assert len(playlist.songs) == 3
+
+
+def test_serves_concurrent_clients_over_tcp(library):
+    async def scenario():
+        server = JukeboxServer(library, port=0)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        async with listening:
+            responses = await asyncio.gather(*[
+                asyncio.to_thread(send_jukebox_command, command, port=port)
+                for command in ["pick", "pick 2", "reload", "pick 4"]
+            ])
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert len(responses[0]["songs"]) == 1
+    assert len(responses[1]["songs"]) == 2
+    assert responses[2] == {"reloaded": 8}
+    assert len(responses[3]["songs"]) == 4
+
+
+def test_serves_over_unix_socket(library, tmp_path):
+    socket_path = str(tmp_path / "jukebox.sock")
+
+    async def scenario():
+        listening = await JukeboxServer(library, unix_socket=socket_path).start()
+        async with listening:
+            return await asyncio.to_thread(send_jukebox_command, "pick 2", unix_socket=socket_path)
+
+    assert len(asyncio.run(scenario())["songs"]) == 2
@@ -0,0 +1,116 @@
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pandas as pd
+import pytest
+from src.linkhealth import HostRateLimiter, LinkHealthChecker
+from src.playlist import PlayList
+
+ALIVE = "https://www.youtube.com/watch?v=AAAAAAAAAAA"
+DEAD = "https://www.youtube.com/watch?v=BBBBBBBBBBB"
+FLAKY = "https://www.youtube.com/watch?v=CCCCCCCCCCC"
+BROKEN = "https://www.youtube.com/watch?v=DDDDDDDDDDD"
+NOT_EMBEDDABLE = "https://www.youtube.com/watch?v=EEEEEEEEEEE"
+PRIVATE = "https://www.youtube.com/watch?v=FFFFFFFFFFF"
+NOT_YOUTUBE = "https://example.com/song.mp3"
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg, *args): self.logs.append(msg % args if args else msg)
+
+    def error(self, msg, *args): self.logs.append(msg % args if args else msg)
+
+
+class DummyBrowser:
+    def __init__(self):
+        self.opened = []
+
+    def open_browser_with_url(self, url):
+        self.opened.append(url)
+
+
+class StubOEmbedHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        url = parse_qs(urlsplit(self.path).query)["url"][0]
+        StubOEmbedHandler.requests_seen.append(url)
+        if url == DEAD:
+            status = 404
+        elif url == NOT_EMBEDDABLE:
+            status = 401
+        elif url == PRIVATE:
+            status = 403
+        elif url == NOT_YOUTUBE:
+            status = 404
+        elif url == BROKEN or (url == FLAKY and StubOEmbedHandler.requests_seen.count(FLAKY) == 1):
+            status = 503
+        else:
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubOEmbedHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOEmbedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/oembed?url={{url}}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def checker(stub_server):
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    link_checker = LinkHealthChecker(conn, DummyLogger(), stub_server, max_workers=4, retries=1)
+    yield link_checker
+    link_checker.close()
+    conn.close()
+
+
+def test_check_urls_finds_dead_links(checker):
+    assert checker.check_urls([ALIVE, DEAD, "https://youtu.be/BBBBBBBBBBB", FLAKY, BROKEN]) == 4
+    assert checker.dead_links() == {DEAD}
+    assert StubOEmbedHandler.requests_seen.count(FLAKY) == 2
+
+
+def test_only_private_and_deleted_videos_are_dead(checker):
+    assert checker.check_urls([NOT_EMBEDDABLE, PRIVATE, NOT_YOUTUBE]) == 2
+    assert checker.dead_links() == {PRIVATE}
+    assert NOT_YOUTUBE not in StubOEmbedHandler.requests_seen
+
+
+def test_fresh_results_are_not_rechecked(checker):
+    checker.check_urls([ALIVE, DEAD, BROKEN])
+    seen = len(StubOEmbedHandler.requests_seen)
+    assert checker.check_urls([ALIVE, DEAD, BROKEN]) == 1
+    assert len(StubOEmbedHandler.requests_seen) == seen + 2
+    checker.ttl_seconds = -1
+    assert checker.check_urls([ALIVE, DEAD]) == 2
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = HostRateLimiter(1000)
+    limiter.wait("host")
+    assert limiter._next_slot["host"] > 0
+
+
+def test_play_random_skips_dead_links():
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=0)
+    playlist.songs = pd.DataFrame({"Song_Name": ["Alive", "Dead"], "Song_URL": [ALIVE, "https://youtu.be/BBBBBBBBBBB"]})
+    playlist.dead_links = {DEAD}
+    for _ in range(20):
+        playlist.play_random()
+    assert set(playlist.browser.opened) == {ALIVE}
@@ -10,8 +10,8 @@ from src.main import (
 class DummyLogger:
     def __init__(self):
         self.logs = []
-    def info(self, msg): self.logs.append(msg)
-    def error(self, msg): self.logs.append(msg)
+    def info(self, msg, *args): self.logs.append(msg % args if args else msg)
+    def error(self, msg, *args): self.logs.append(msg % args if args else msg)
 
 @pytest.fixture
 def dummy_logger():
@@ -0,0 +1,96 @@
+import json
+import pytest
+from src.metrics import MetricsRegistry, metrics
+from src.playlist import PlayList
+from src.playlist_write_handlers import CSVWriteHandler
+from src.read_handlers.readcsvhandler import ReadCSVHandler
+from src.setup_logging import call_log
+
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+class DummyBrowser:
+    def open_browser_with_url(self, url): pass
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enabled = True
+    yield metrics
+    metrics.enabled = False
+    metrics.reset()
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "songs.csv"
+    path.write_text(
+        "Index,Song_Name,Song_URL\n"
+        "0,Song A,https://www.youtube.com/watch?v=aaaaaaaaaaa\n"
+        "1,Song B,https://www.youtube.com/watch?v=bbbbbbbbbbb\n"
+    )
+    return str(path)
+
+
+def test_disabled_metrics_record_nothing():
+    metrics.reset()
+
+    @call_log
+    def double(value):
+        return value * 2
+
+    assert double(2) == 4
+    assert metrics.report() == {}
+
+
+def test_call_log_records_calls_rows_and_errors(enabled_metrics):
+    @call_log(rows=lambda result, *args: len(result))
+    def load(count):
+        if count < 0:
+            raise ValueError("negative")
+        return [0] * count
+
+    load(3)
+    load(4)
+    with pytest.raises(ValueError):
+        load(-1)
+    report = enabled_metrics.report()[load.__qualname__]
+    assert report["calls"] == 3
+    assert report["errors"] == 1
+    assert report["rows"] == 7
+    assert report["p50_seconds"] <= report["p99_seconds"] <= report["max_seconds"]
+
+
+def test_timer_records_block_counters():
+    registry = MetricsRegistry()
+    registry.enabled = True
+    with registry.timer("block") as counters:
+        counters["bytes"] = 10
+    assert registry.report()["block"]["bytes"] == 10
+
+
+def test_hot_paths_are_instrumented(enabled_metrics, csv_file, tmp_path):
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=0)
+    playlist.read_songlist_handler = ReadCSVHandler(DummyLogger(), csv_file)
+    playlist.read_songs()
+    playlist.play_random()
+    CSVWriteHandler(str(tmp_path / "out.csv")).write_songlist(playlist.songs)
+    report = enabled_metrics.report()
+    assert report["ReadCSVHandler.get_songlist"]["rows"] == 2
+    assert report["ReadCSVHandler.get_songlist"]["bytes"] > 0
+    assert report["PlayList.read_songs"]["calls"] == 1
+    assert report["PlayList.play_random"]["calls"] == 1
+    assert report["CSVWriteHandler.write_songlist"]["rows"] == 2
+    assert report["CSVWriteHandler.write_songlist"]["bytes"] > 0
+
+
+def test_dump_writes_json_report(enabled_metrics, tmp_path):
+    enabled_metrics.record("work", 0.5, rows=10)
+    report_file = tmp_path / "report.json"
+    enabled_metrics.dump(str(report_file))
+    assert json.loads(report_file.read_text())["functions"]["work"]["rows_per_second"] == 20
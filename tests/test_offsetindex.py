@@ -0,0 +1,136 @@
+import os
+import numpy as np
+import pytest
+from src.exceptions import EmptyPlaylistError
+from src.playlist import PlayList
+from src.read_handlers.offsetindex import SIDECAR_HEADER, OffsetIndex
+from tests.test_readbookmarkshandler import BOOKMARKS_EXPORT
+
+CSV_SONGS = (
+    'Index,Song_Name,Song_URL\n'
+    '0,Song One,https://www.youtube.com/watch?v=AQ4UffoLa0o\n'
+    '\n'
+    '1,"Song, Two",https://www.youtube.com/watch?v=LiPjDQUJfSM\n'
+    '2,"Song\nThree",https://www.youtube.com/watch?v=XTgMJFuf7ls\n'
+    '3,Song Four,https://www.youtube.com/watch?v=dQw4w9WgXcQ\n'
+)
+
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+class DummyBrowser:
+    def __init__(self):
+        self.opened = []
+
+    def open_browser_with_url(self, url):
+        self.opened.append(url)
+
+
+class SourceOnlyReadHandler:
+    def __init__(self, read_file_name):
+        self.read_file_name = read_file_name
+
+
+@pytest.fixture
+def export(tmp_path):
+    file = tmp_path / "bookmarks.html"
+    file.write_text(BOOKMARKS_EXPORT.replace("Song Two", "Song &amp; Two"), encoding="utf-8")
+    return file
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    file = tmp_path / "songs.csv"
+    file.write_text(CSV_SONGS, encoding="utf-8")
+    return file
+
+
+def test_bookmarks_index_reads_single_songs(export):
+    index = OffsetIndex(str(export))
+    assert len(index) == 3
+    assert index.songs_at([2, 0, 1]) == [
+        ("Song Three", "https://www.youtube.com/watch?v=XTgMJFuf7ls"),
+        ("Song One - YouTube", "https://www.youtube.com/watch?v=AQ4UffoLa0o"),
+        ("Song & Two", "https://www.youtube.com/watch?v=LiPjDQUJfSM"),
+    ]
+    assert os.path.getsize(index.sidecar_file_name) == SIDECAR_HEADER.size + 3 * 8
+
+
+def test_csv_index_reads_quoted_rows(csv_file):
+    index = OffsetIndex(str(csv_file))
+    assert index.songs_at(range(len(index))) == [
+        ("Song One", "https://www.youtube.com/watch?v=AQ4UffoLa0o"),
+        ("Song, Two", "https://www.youtube.com/watch?v=LiPjDQUJfSM"),
+        ("Song\nThree", "https://www.youtube.com/watch?v=XTgMJFuf7ls"),
+        ("Song Four", "https://www.youtube.com/watch?v=dQw4w9WgXcQ"),
+    ]
+
+
+def test_sidecar_is_reused_until_source_changes(export, monkeypatch):
+    OffsetIndex(str(export)).build()
+
+    def fail_build(self):
+        raise AssertionError("the sidecar should have been reused")
+
+    reused = OffsetIndex(str(export))
+    monkeypatch.setattr(OffsetIndex, "build", fail_build)
+    assert isinstance(reused.load(), np.memmap)
+    monkeypatch.undo()
+
+    with open(export, "a", encoding="utf-8") as file_handle:
+        file_handle.write('<DT><A HREF="https://www.youtube.com/watch?v=dQw4w9WgXcQ">Song Four</A>\n')
+    assert len(reused) == 4
+    assert reused.songs_at([3]) == [("Song Four", "https://www.youtube.com/watch?v=dQw4w9WgXcQ")]
+    assert len(OffsetIndex(str(export))) == 4
+
+
+def test_corrupt_sidecar_is_rebuilt(export):
+    index = OffsetIndex(str(export))
+    with open(index.sidecar_file_name, "wb") as sidecar_handle:
+        sidecar_handle.write(b"not an index")
+    assert len(index) == 3
+
+
+def test_unsupported_source_raises(tmp_path):
+    with pytest.raises(ValueError):
+        OffsetIndex(str(tmp_path / "songs.xlsx"))
+
+
+def test_playlist_indexed_mode_picks_without_loading(csv_file):
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=3, selection_mode=PlayList.INDEXED_MODE)
+    playlist.read_songlist_handler = SourceOnlyReadHandler(str(csv_file))
+    picks = playlist.pick_indexed(4)
+    assert len(set(picks)) == 4
+    assert playlist.play_random()
+    assert playlist.browser.opened[0].startswith("https://www.youtube.com/watch?v=")
+    assert playlist.songs.empty
+
+
+def test_playlist_indexed_mode_skips_dead_links(csv_file):
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=3, selection_mode=PlayList.INDEXED_MODE)
+    playlist.read_songlist_handler = SourceOnlyReadHandler(str(csv_file))
+    playlist.dead_links = {
+        "https://www.youtube.com/watch?v=AQ4UffoLa0o",
+        "https://www.youtube.com/watch?v=LiPjDQUJfSM",
+        "https://www.youtube.com/watch?v=XTgMJFuf7ls",
+    }
+    assert playlist.pick_indexed(3) == [("Song Four", "https://www.youtube.com/watch?v=dQw4w9WgXcQ")]
+
+
+def test_playlist_indexed_mode_empty_source(tmp_path):
+    file = tmp_path / "songs.csv"
+    file.write_text("Index,Song_Name,Song_URL\n", encoding="utf-8")
+    playlist = PlayList(DummyBrowser(), DummyLogger(), selection_mode=PlayList.INDEXED_MODE)
+    playlist.read_songlist_handler = SourceOnlyReadHandler(str(file))
+    with pytest.raises(EmptyPlaylistError):
+        playlist.pick_indexed()
+
+
+def test_playlist_indexed_mode_normalizes_songs(export):
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=3, selection_mode=PlayList.INDEXED_MODE)
+    playlist.read_songlist_handler = SourceOnlyReadHandler(str(export))
+    assert sorted(name for name, _ in playlist.pick_indexed(3)) == ["Song & Two", "Song One", "Song Three"]
@@ -0,0 +1,76 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from src.playhistory import PlayHistory, SelectionPolicy, WeightedSampler
+from src.playlist import PlayList
+
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+class DummyBrowser:
+    def __init__(self):
+        self.opened = []
+
+    def open_browser_with_url(self, url):
+        self.opened.append(url)
+
+
+def url_for(index):
+    return f"https://www.youtube.com/watch?v={index:011d}"
+
+
+@pytest.fixture
+def history():
+    conn = sqlite3.connect(":memory:")
+    yield PlayHistory(conn, DummyLogger())
+    conn.close()
+
+
+def test_record_and_query_history(history):
+    history.record_play(url_for(1), played_at=10.0)
+    history.record_play("https://youtu.be/00000000001", played_at=30.0)
+    history.record_play(url_for(2), played_at=20.0)
+    assert history.last_played() == {"00000000001": 30.0, "00000000002": 20.0}
+    assert history.recent_video_ids(2) == ["00000000001", "00000000002"]
+
+
+def test_weighted_sampler_matches_weights():
+    sampler = WeightedSampler(np.array([1.0, 0.0, 3.0, 0.0, 4.0]))
+    assert sampler.total == pytest.approx(8.0)
+    rng = np.random.default_rng(0)
+    counts = np.bincount([sampler.sample(rng) for _ in range(8000)], minlength=5)
+    assert counts[1] == counts[3] == 0
+    assert counts[4] > counts[2] > counts[0]
+    sampler.update(4, 0.0)
+    assert 4 not in {sampler.sample(rng) for _ in range(500)}
+    for index in range(5):
+        sampler.update(index, 0.0)
+    assert sampler.sample(rng) == -1
+
+
+def test_policy_weights(history):
+    history.record_play(url_for(0), played_at=1000.0)
+    history.record_play(url_for(1), played_at=0.0)
+    policy = SelectionPolicy(exclude_last=1, recency_half_life_seconds=1000.0, never_played_boost=2.0)
+    weights = policy.weights(["00000000000", "00000000001", "00000000002"], history, now=1000.0)
+    assert weights.tolist() == pytest.approx([0.0, 0.5, 2.0])
+
+
+def test_weighted_play_random_never_repeats_within_window(history):
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=2, selection_mode=PlayList.WEIGHTED_MODE)
+    playlist.songs = pd.DataFrame({
+        "Song_Name": [f"Song{i}" for i in range(6)],
+        "Song_URL": [url_for(i) for i in range(6)],
+    })
+    playlist.play_history = history
+    playlist.selection_policy = SelectionPolicy(exclude_last=3)
+    for _ in range(30):
+        playlist.play_random()
+    opened = playlist.browser.opened
+    assert all(len(set(opened[index:index + 4])) == 4 for index in range(len(opened) - 3))
+    assert len(history.recent_video_ids(100)) == 30
@@ -0,0 +1,194 @@
+import pandas as pd
+import pytest
+from src.exceptions import EmptyPlaylistError
+from src.Browser import Browser
+from src.playlist import PlayList
+from src.playlist_shared_utils import extract_video_id, queue_url
+from src.songindex import SongIndex
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg, *args): self.logs.append(msg % args if args else msg)
+
+    def error(self, msg, *args): self.logs.append(msg % args if args else msg)
+
+
+class DummyBrowser:
+    def __init__(self):
+        self.opened = []
+
+    def open_browser_with_url(self, url):
+        self.opened.append(url)
+
+
+@pytest.fixture
+def playlist():
+    songs = PlayList(DummyBrowser(), DummyLogger(), seed=7)
+    songs.songs = pd.DataFrame({
+        songs.SONG_NAME_COLUMN: [f"Song{i}" for i in range(10)],
+        songs.SONG_URL_COLUMN: [f"https://www.youtube.com/watch?v={i:011d}" for i in range(10)],
+    })
+    return songs
+
+
+def test_play_random_opens_a_song(playlist):
+    assert playlist.play_random()
+    assert playlist.browser.opened[0] in playlist.songs[playlist.SONG_URL_COLUMN].tolist()
+
+
+def test_play_random_empty_playlist():
+    with pytest.raises(EmptyPlaylistError):
+        PlayList(DummyBrowser(), DummyLogger()).play_random()
+
+
+def test_pick_many_is_reproducible_with_seed(playlist):
+    other = PlayList(DummyBrowser(), DummyLogger(), seed=7)
+    other.songs = playlist.songs
+    assert playlist.pick_many(5) == other.pick_many(5)
+
+
+def test_pick_many_without_replacement(playlist):
+    picks = playlist.pick_many(10, replace=False)
+    assert len(set(picks)) == 10
+
+
+def test_shuffle_bag_has_no_repeats_until_exhausted(playlist):
+    playlist.selection_mode = PlayList.SHUFFLE_BAG_MODE
+    first_round = playlist.pick_many(4) + playlist.pick_many(6)
+    assert len(set(first_round)) == 10
+    assert len(playlist.pick_many(15)) == 15
+
+
+class ListReadHandler:
+    read_file_name = "songs.csv"
+
+    def __init__(self, songs):
+        self.songs = songs
+
+    def iter_songs(self, source):
+        yield from self.songs
+
+
+def test_reservoir_sample_is_uniform():
+    sampler = PlayList(DummyBrowser(), DummyLogger(), seed=3)
+    counts = [0] * 5
+    for _ in range(5000):
+        counts[sampler.reservoir_sample(range(5))[0]] += 1
+    assert all(800 < count < 1200 for count in counts)
+
+
+def test_reservoir_sample_k_items():
+    sampler = PlayList(DummyBrowser(), DummyLogger(), seed=3)
+    assert len(set(sampler.reservoir_sample(range(1000), 10))) == 10
+    assert sampler.reservoir_sample(range(3), 10) == [0, 1, 2]
+
+
+def test_play_random_streaming_mode():
+    streaming = PlayList(DummyBrowser(), DummyLogger(), seed=3, selection_mode=PlayList.STREAMING_MODE)
+    streaming.read_songlist_handler = ListReadHandler([("Song1 - YouTube", "https://youtu.be/AQ4UffoLa0o?t=3")])
+    assert streaming.play_random()
+    assert streaming.browser.opened == ["https://www.youtube.com/watch?v=AQ4UffoLa0o"]
+    streaming.read_songlist_handler = ListReadHandler([])
+    with pytest.raises(EmptyPlaylistError):
+        streaming.play_random()
+
+
+class StubController:
+    def __init__(self):
+        self.launches = []
+
+    def open(self, url, new):
+        self.launches.append(url)
+        return True
+
+
+@pytest.fixture
+def batch_playlist(playlist):
+    playlist.browser = Browser("stub %s", DummyLogger(), controller=StubController())
+    return playlist
+
+
+def test_play_batch_opens_one_youtube_queue(batch_playlist):
+    songs = batch_playlist.play_batch(4)
+    launches = batch_playlist.browser.controller.launches
+    assert len(launches) == 1
+    assert len(set(songs)) == 4
+    assert launches[0] == queue_url([extract_video_id(url) for _, url in songs])
+
+
+def test_play_batch_skips_dead_links(batch_playlist):
+    batch_playlist.dead_links = {f"https://www.youtube.com/watch?v={i:011d}" for i in range(8)}
+    songs = batch_playlist.play_batch(5)
+    assert sorted(name for name, _ in songs) == ["Song8", "Song9"]
+    assert len(batch_playlist.browser.controller.launches) == 1
+
+
+def test_play_batch_as_page(batch_playlist, tmp_path):
+    page = tmp_path / "playlist.html"
+    songs = batch_playlist.play_batch(3, as_page=True, page_file_name=str(page))
+    assert batch_playlist.browser.controller.launches == [page.as_uri()]
+    written = page.read_text()
+    assert "youtube.com/embed/" in written
+    assert all(url in written for _, url in songs)
+
+
+def test_play_batch_uses_page_for_songs_without_video_id(batch_playlist, tmp_path):
+    batch_playlist.songs.loc[:, batch_playlist.SONG_URL_COLUMN] = [f"https://example.com/{i}" for i in range(10)]
+    batch_playlist.play_batch(2, page_file_name=str(tmp_path / "playlist.html"))
+    assert batch_playlist.browser.controller.launches[0].startswith("file://")
+
+
+def test_browser_looks_up_its_controller_once(monkeypatch):
+    lookups = []
+
+    def get(path):
+        lookups.append(path)
+        return StubController()
+
+    monkeypatch.setattr("webbrowser.get", get)
+    browser = Browser("stub %s", DummyLogger())
+    browser.open_browser_with_url("https://www.youtube.com/watch?v=AQ4UffoLa0o")
+    browser.open_browser_with_url("https://www.youtube.com/watch?v=LiPjDQUJfSM")
+    assert lookups == ["stub %s"]
+    assert len(browser.controller.launches) == 2
+
+
+def test_song_index_matches_every_word_ignoring_case():
+    index = SongIndex()
+    index.add(["Blade Runner Theme", "Runner Up", "Night Drive"], ["Synthwave", "", "Synthwave/Vangelis"])
+    assert index.search("runner BLADE").tolist() == [0]
+    assert index.search("synthwave").tolist() == [0, 2]
+    assert index.search("up").tolist() == [1]
+    assert index.search("missing").tolist() == []
+
+
+def test_song_index_grows_incrementally():
+    index = SongIndex()
+    index.add(["Blade Runner Theme"])
+    assert index.search("blade").tolist() == [0]
+    index.add(["Blade Runner 2049"])
+    assert index.search("blade").tolist() == [0, 1]
+
+
+def test_play_random_with_query(playlist):
+    playlist.songs.loc[3, playlist.SONG_NAME_COLUMN] = "Blade Runner Blues"
+    for _ in range(5):
+        playlist.play_random(query="blade runner")
+    assert set(playlist.browser.opened) == {"https://www.youtube.com/watch?v=00000000003"}
+    with pytest.raises(EmptyPlaylistError):
+        playlist.play_random(query="no such song")
+
+
+def test_query_picks_skip_dead_links_and_cover_the_matches(playlist):
+    playlist.dead_links = {"https://www.youtube.com/watch?v=00000000001"}
+    picked = {name for name, _ in playlist.pick_matching("song", 10)}
+    assert picked == {f"Song{i}" for i in range(10)} - {"Song1"}
+
+
+def test_song_index_follows_a_new_song_list(playlist):
+    assert len(playlist.pick_matching("song5")) == 1
+    playlist.songs = playlist.songs.assign(**{playlist.SONG_NAME_COLUMN: [f"Tune{i}" for i in range(10)]})
+    assert playlist.pick_matching("tune5")[0][0] == "Tune5"
@@ -0,0 +1,87 @@
+import pytest
+from src.exceptions import EmptyPlaylistError
+from src.myhtmlparser import BookmarksStreamParser
+from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
+
+BOOKMARKS_EXPORT = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><H3 ADD_DATE="1670909768">Bookmarks Bar</H3>
+    <DL><p>
+        <DT><A HREF="https://www.youtube.com/watch?v=AQ4UffoLa0o" ADD_DATE="1671767238" ICON="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAABAAAAAQ">Song One - YouTube</A>
+        <DT><A HREF="https://example.com/not-music" ADD_DATE="1671767239">Not Music</A>
+        <DT><H3 ADD_DATE="1670909769">Synthwave</H3>
+        <DL><p>
+            <DT><A HREF="https://www.youtube.com/watch?v=LiPjDQUJfSM" ADD_DATE="1674261633" ICON="data:image/png;base64,AAAA">Song Two</A>
+        </DL><p>
+        <DT><A HREF="https://www.youtube.com/watch?v=XTgMJFuf7ls">Song Three</A>
+    </DL><p>
+</DL><p>
+"""
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg): self.logs.append(msg)
+
+    def error(self, msg): self.logs.append(msg)
+
+
+@pytest.fixture
+def bookmarks_file(tmp_path):
+    file = tmp_path / "bookmarks.html"
+    file.write_text(BOOKMARKS_EXPORT, encoding="utf-8")
+    return file
+
+
+def test_stream_parser_collects_columns(bookmarks_file):
+    parser = BookmarksStreamParser()
+    with open(bookmarks_file, "rb") as file_handle:
+        parser.feed_file(file_handle)
+    assert parser.names == ["Song One - YouTube", "Song Two", "Song Three"]
+    assert parser.urls[1] == "https://www.youtube.com/watch?v=LiPjDQUJfSM"
+    assert parser.add_dates == [1671767238, 1674261633, 0]
+    assert parser.folders == ["Bookmarks Bar", "Bookmarks Bar/Synthwave", "Bookmarks Bar"]
+
+
+def test_stream_parser_drops_icon_payload():
+    parser = BookmarksStreamParser()
+    line = b'<DT><A HREF="https://www.youtube.com/watch?v=abc" ICON="data:image/png;base64,QUJD">Song</A>'
+    assert b"QUJD" not in parser.ICON_ATTRIBUTE.sub(b"", line)
+    parser.feed_line(line)
+    parser.close()
+    assert parser.names == ["Song"]
+
+
+def test_get_songlist_builds_dataframe(bookmarks_file):
+    handler = ReadBookmarksHandler(DummyLogger(), str(bookmarks_file))
+    songs = handler.get_songlist(str(bookmarks_file))
+    assert list(songs.columns) == [
+        handler.SONG_NAME_COLUMN, handler.SONG_URL_COLUMN, handler.SONG_ADD_DATE_COLUMN, handler.SONG_FOLDER_COLUMN
+    ]
+    assert len(songs) == 3
+    assert songs[handler.SONG_FOLDER_COLUMN].iat[1] == "Bookmarks Bar/Synthwave"
+
+
+def test_get_songlist_empty_source(tmp_path):
+    file = tmp_path / "empty.html"
+    file.write_text("<DL><p>\n</DL><p>\n")
+    handler = ReadBookmarksHandler(DummyLogger(), str(file))
+    with pytest.raises(EmptyPlaylistError):
+        handler.get_songlist(str(file))
+
+
+def test_get_songlist_file_not_found(tmp_path):
+    handler = ReadBookmarksHandler(DummyLogger(), "missing.html")
+    with pytest.raises(FileNotFoundError):
+        handler.get_songlist(str(tmp_path / "missing.html"))
+
+
+def test_iter_songs_streams_links(bookmarks_file):
+    handler = ReadBookmarksHandler(DummyLogger(), str(bookmarks_file))
+    songs = list(handler.iter_songs(str(bookmarks_file)))
+    assert [name for name, _ in songs] == ["Song One - YouTube", "Song Two", "Song Three"]
@@ -0,0 +1,101 @@
+import os
+import pandas as pd
+import pytest
+from src.read_handlers.readcachedhandler import CachedReadHandler
+from src.read_handlers.readhandler import ReadHandler
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg): self.logs.append(msg)
+
+    def warning(self, msg): self.logs.append(msg)
+
+    def error(self, msg): self.logs.append(msg)
+
+
+class CountingReadHandler(ReadHandler):
+    def __init__(self, source_file_name):
+        super().__init__(DummyLogger(), source_file_name)
+        self.reads = 0
+
+    def get_songlist(self, source):
+        self.reads += 1
+        return pd.DataFrame({self.SONG_NAME_COLUMN: ["Song1"], self.SONG_URL_COLUMN: ["https://youtube.com/1"]})
+
+    def iter_songs(self, source):
+        yield "Song1", "https://youtube.com/1"
+
+
+@pytest.fixture
+def source(tmp_path):
+    file = tmp_path / "songs.csv"
+    file.write_text("Song_Name,Song_URL\nSong1,https://youtube.com/1\n")
+    return file
+
+
+def make_cached_handler(source, cache_dir, **kwargs):
+    return CachedReadHandler(DummyLogger(), CountingReadHandler(str(source)), str(cache_dir), **kwargs)
+
+
+def test_cache_hit_skips_wrapped_handler(source, tmp_path):
+    handler = make_cached_handler(source, tmp_path / "cache")
+    first = handler.get_songlist(str(source))
+    second = handler.get_songlist(str(source))
+    assert handler.read_handler.reads == 1
+    assert first.equals(second)
+
+
+def test_changed_source_misses_and_replaces_entry(source, tmp_path):
+    handler = make_cached_handler(source, tmp_path / "cache")
+    handler.get_songlist(str(source))
+    source.write_text("Song_Name,Song_URL\nSong2,https://youtube.com/2\n")
+    os.utime(source, ns=(1, 1))
+    handler.get_songlist(str(source))
+    assert handler.read_handler.reads == 2
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+
+def test_refresh_and_invalidate(source, tmp_path):
+    handler = make_cached_handler(source, tmp_path / "cache", refresh=True, hash_contents=True)
+    handler.get_songlist(str(source))
+    handler.get_songlist(str(source))
+    assert handler.read_handler.reads == 2
+    assert handler.invalidate(str(source)) == 1
+    assert handler.invalidate() == 0
+
+
+def test_eviction_keeps_cache_under_max_bytes(tmp_path):
+    cache_dir = tmp_path / "cache"
+    for index in range(3):
+        source = tmp_path / f"songs{index}.csv"
+        source.write_text("placeholder")
+        make_cached_handler(source, cache_dir, max_bytes=1000).get_songlist(str(source))
+    sizes = [entry.stat().st_size for entry in os.scandir(cache_dir)]
+    assert sum(sizes) <= 1000
+    assert len(sizes) < 3
+
+
+@pytest.mark.parametrize("garbage", [b"", b"not a pickle", b"\x80\x05\x95\x10\x00"])
+def test_unreadable_entry_is_dropped_and_source_reparsed(source, tmp_path, garbage):
+    handler = make_cached_handler(source, tmp_path / "cache")
+    handler.get_songlist(str(source))
+    path = handler.cache_path(str(source))
+    with open(path, "wb") as file_handle:
+        file_handle.write(garbage)
+    songs = handler.get_songlist(str(source))
+    assert handler.read_handler.reads == 2
+    assert songs[handler.SONG_NAME_COLUMN].tolist() == ["Song1"]
+    with open(path, "rb") as file_handle:
+        assert file_handle.read() != garbage
+    assert any(log.startswith("dropping unreadable song list cache entry") for log in handler.logger.logs)
+
+
+def test_fast_scan_is_part_of_the_key(source, tmp_path):
+    handler = make_cached_handler(source, tmp_path / "cache")
+    handler.get_songlist(str(source))
+    handler.read_handler.fast_scan = True
+    handler.get_songlist(str(source))
+    assert handler.read_handler.reads == 2
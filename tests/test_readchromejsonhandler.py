@@ -0,0 +1,87 @@
+import json
+import pytest
+from src.exceptions import EmptyPlaylistError
+from src.read_handlers.readchromejsonhandler import ReadChromeJsonHandler, webkit_to_unix_seconds
+from src.read_handlers.readmultisourcehandler import read_handler_for_file
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg): self.logs.append(msg)
+
+    def error(self, msg): self.logs.append(msg)
+
+
+def url_node(name, url, date_added="13318315238000000"):
+    return {"type": "url", "name": name, "url": url, "date_added": date_added}
+
+
+CHROME_BOOKMARKS = {
+    "checksum": "0",
+    "version": 1,
+    "roots": {
+        "bookmark_bar": {
+            "type": "folder",
+            "name": "Bookmarks bar",
+            "children": [
+                url_node("Song One - YouTube", "https://www.youtube.com/watch?v=AQ4UffoLa0o"),
+                url_node("Not Music", "https://example.com/not-music"),
+                {
+                    "type": "folder",
+                    "name": "Synthwave",
+                    "children": [url_node("Song Two", "https://www.youtube.com/watch?v=LiPjDQUJfSM")],
+                },
+                url_node("Song Three", "https://www.youtube.com/watch?v=XTgMJFuf7ls", date_added=None),
+            ],
+        },
+        "other": {"type": "folder", "name": "Other bookmarks", "children": [
+            url_node("Song Four", "https://m.youtube.com/watch?v=AQ4UffoLa0o")
+        ]},
+        "synced": {"type": "folder", "name": "Mobile bookmarks", "children": []},
+    },
+}
+
+
+@pytest.fixture
+def chrome_bookmarks(tmp_path):
+    file = tmp_path / "Bookmarks"
+    file.write_text(json.dumps(CHROME_BOOKMARKS), encoding="utf-8")
+    return str(file)
+
+
+def test_get_songlist_keeps_order_folders_and_dates(chrome_bookmarks):
+    songs = ReadChromeJsonHandler(DummyLogger(), chrome_bookmarks).get_songlist(chrome_bookmarks)
+    assert songs["Song_Name"].tolist() == ["Song One - YouTube", "Song Two", "Song Three", "Song Four"]
+    assert songs["Song_Folder"].tolist() == ["Bookmarks bar", "Bookmarks bar/Synthwave", "Bookmarks bar",
+                                             "Other bookmarks"]
+    assert songs["Song_Add_Date"].tolist() == [1673841638, 1673841638, 0, 1673841638]
+
+
+def test_get_song_records_matches_iter_songs(chrome_bookmarks):
+    handler = ReadChromeJsonHandler(DummyLogger(), chrome_bookmarks)
+    assert handler.get_song_records(chrome_bookmarks) == list(handler.iter_songs(chrome_bookmarks))
+
+
+def test_empty_and_invalid_files(tmp_path):
+    empty = tmp_path / "empty.json"
+    empty.write_text(json.dumps({"roots": {}}), encoding="utf-8")
+    with pytest.raises(EmptyPlaylistError):
+        ReadChromeJsonHandler(DummyLogger(), str(empty)).get_song_records(str(empty))
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text("<html>", encoding="utf-8")
+    with pytest.raises(ValueError):
+        ReadChromeJsonHandler(DummyLogger(), str(invalid)).get_song_records(str(invalid))
+    with pytest.raises(FileNotFoundError):
+        ReadChromeJsonHandler(DummyLogger(), "x").get_song_records(str(tmp_path / "missing.json"))
+
+
+def test_chrome_bookmarks_file_is_registered(chrome_bookmarks):
+    assert isinstance(read_handler_for_file(DummyLogger(), chrome_bookmarks), ReadChromeJsonHandler)
+    assert isinstance(read_handler_for_file(DummyLogger(), "bookmarks.json"), ReadChromeJsonHandler)
+
+
+def test_webkit_to_unix_seconds():
+    assert webkit_to_unix_seconds("11644473600000000") == 0
+    assert webkit_to_unix_seconds("bad") == 0
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+from src.read_handlers.readcsvhandler import ReadCSVHandler
+from src.read_handlers.readexcelhandler import ReadExcelHandler
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg): self.logs.append(msg)
+
+    def error(self, msg): self.logs.append(msg)
+
+
+@pytest.fixture
+def songs():
+    return pd.DataFrame({
+        "Song_Name": [f"Song{i}" for i in range(5)],
+        "Song_URL": [f"https://www.youtube.com/watch?v={i:011d}" for i in range(5)],
+    })
+
+
+def test_csv_iter_songs_in_chunks(tmp_path, songs, monkeypatch):
+    file = tmp_path / "songs.csv"
+    songs.to_csv(file, index_label="Index")
+    monkeypatch.setattr(ReadCSVHandler, "CHUNK_SIZE", 2)
+    handler = ReadCSVHandler(DummyLogger(), str(file))
+    assert list(handler.iter_songs(str(file))) == list(zip(songs["Song_Name"], songs["Song_URL"]))
+
+
+def test_csv_not_utf8_raises_value_error(tmp_path):
+    file = tmp_path / "songs.csv"
+    file.write_bytes(b"Index,Song_Name,Song_URL\n0,\xff\xfeSong,https://www.youtube.com/watch?v=AQ4UffoLa0o\n")
+    handler = ReadCSVHandler(DummyLogger(), str(file))
+    with pytest.raises(ValueError, match="UTF-8"):
+        handler.get_song_records(str(file))
+    with pytest.raises(ValueError, match="UTF-8"):
+        handler.get_songlist(str(file))
+    with pytest.raises(ValueError, match="UTF-8"):
+        list(handler.iter_songs(str(file)))
+
+
+def test_csv_iter_songs_bad_row_in_later_chunk(tmp_path, monkeypatch):
+    file = tmp_path / "songs.csv"
+    file.write_text(
+        "Index,Song_Name,Song_URL\n"
+        "0,Song1,https://www.youtube.com/watch?v=AQ4UffoLa0o\n"
+        '1,"Song2,https://www.youtube.com/watch?v=LiPjDQUJfSM\n'
+    )
+    monkeypatch.setattr(ReadCSVHandler, "CHUNK_SIZE", 1)
+    handler = ReadCSVHandler(DummyLogger(), str(file))
+    with pytest.raises(pd.errors.ParserError, match="not parsing as a csv"):
+        list(handler.iter_songs(str(file)))
+
+
+def test_excel_iter_songs_read_only(tmp_path, songs):
+    file = tmp_path / "songs.xlsx"
+    songs.to_excel(file, index_label="Index")
+    handler = ReadExcelHandler(DummyLogger(), str(file))
+    assert list(handler.iter_songs(str(file))) == list(zip(songs["Song_Name"], songs["Song_URL"]))
+
+
+def test_excel_iter_songs_missing_columns(tmp_path):
+    file = tmp_path / "songs.xlsx"
+    pd.DataFrame({"Other": [1]}).to_excel(file)
+    handler = ReadExcelHandler(DummyLogger(), str(file))
+    with pytest.raises(ValueError):
+        list(handler.iter_songs(str(file)))
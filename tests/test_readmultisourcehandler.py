@@ -0,0 +1,82 @@
+import pytest
+from src.exceptions import EmptyPlaylistError
+from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler
+from src.read_handlers.readmultisourcehandler import ReadMultiSourceHandler, read_handler_for_file
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg): self.logs.append(msg)
+
+    def error(self, msg): self.logs.append(msg)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    (tmp_path / "a.html").write_text(
+        '<DL><p>\n'
+        '<DT><A HREF="https://www.youtube.com/watch?v=AAAAAAAAAAA">Song A</A>\n'
+        '<DT><A HREF="https://www.youtube.com/watch?v=BBBBBBBBBBB&list=PL1">Song B</A>\n'
+        '</DL><p>\n'
+    )
+    (tmp_path / "b.html").write_text(
+        '<DL><p>\n'
+        '<DT><A HREF="https://youtu.be/BBBBBBBBBBB">Song B again</A>\n'
+        '<DT><A HREF="https://www.youtube.com/watch?v=CCCCCCCCCCC">Song C</A>\n'
+        '</DL><p>\n'
+    )
+    (tmp_path / "c.csv").write_text(
+        "Index,Song_Name,Song_URL\n"
+        "0,Song A copy,https://m.youtube.com/watch?v=AAAAAAAAAAA\n"
+        "1,Song D,https://www.youtube.com/watch?v=DDDDDDDDDDD\n"
+    )
+    return tmp_path
+
+
+def test_read_handler_for_file():
+    assert isinstance(read_handler_for_file(DummyLogger(), "bookmarks.HTML"), ReadBookmarksHandler)
+    with pytest.raises(ValueError):
+        read_handler_for_file(DummyLogger(), "songs.txt")
+
+
+def test_expand_sources_keeps_order_and_drops_repeats(sources):
+    file_names = ReadMultiSourceHandler.expand_sources([str(sources / "c.csv"), str(sources / "*.*")])
+    assert [name.split("/")[-1] for name in file_names] == ["c.csv", "a.html", "b.html"]
+
+
+def test_get_songlist_merges_and_deduplicates(sources):
+    handler = ReadMultiSourceHandler(DummyLogger(), [str(sources / "*.html"), str(sources / "c.csv")], max_workers=2)
+    songs = handler.get_songlist(handler.read_file_name)
+    assert songs[handler.SONG_NAME_COLUMN].tolist() == ["Song A", "Song B", "Song C", "Song D"]
+
+
+def test_get_songlist_no_songs(tmp_path):
+    (tmp_path / "empty.csv").write_text("Index,Song_Name,Song_URL\n")
+    handler = ReadMultiSourceHandler(DummyLogger(), [str(tmp_path / "empty.csv")], max_workers=1)
+    with pytest.raises(EmptyPlaylistError):
+        handler.get_songlist(handler.read_file_name)
+
+
+def test_get_songlist_keeps_folders_and_add_dates(tmp_path):
+    (tmp_path / "a.html").write_text(
+        '<DL><p>\n'
+        '<DT><H3>Rock</H3>\n'
+        '<DL><p>\n'
+        '<DT><A HREF="https://www.youtube.com/watch?v=AAAAAAAAAAA" ADD_DATE="1600000000">Song A</A>\n'
+        '</DL><p>\n'
+        '</DL><p>\n'
+    )
+    (tmp_path / "b.csv").write_text(
+        "Index,Song_Name,Song_URL\n"
+        "0,Song A copy,https://youtu.be/AAAAAAAAAAA\n"
+        "1,Song B,https://www.youtube.com/watch?v=BBBBBBBBBBB\n"
+    )
+    logger = DummyLogger()
+    handler = ReadMultiSourceHandler(logger, [str(tmp_path / "*.*")], max_workers=1)
+    songs = handler.get_songlist(handler.read_file_name)
+    assert songs[handler.SONG_NAME_COLUMN].tolist() == ["Song A", "Song B"]
+    assert songs[handler.SONG_FOLDER_COLUMN].tolist() == ["Rock", ""]
+    assert songs[handler.SONG_ADD_DATE_COLUMN].tolist() == [1600000000, 0]
+    assert "loaded 2 songs from 2 sources into the song list" in logger.logs
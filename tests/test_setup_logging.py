@@ -0,0 +1,73 @@
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import pytest
+from src import setup_logging
+from src.Browser import Browser
+
+
+@pytest.fixture
+def log_stream():
+    stream = io.StringIO()
+    yield stream
+    setup_logging.stop_logging()
+    setup_logging.configure_logging()
+
+
+def flushed(stream: io.StringIO) -> list[str]:
+    setup_logging.stop_logging()
+    return stream.getvalue().splitlines()
+
+
+def test_each_message_is_written_once(log_stream):
+    setup_logging.configure_logging(stream=log_stream)
+    setup_logging.configure_logging(stream=log_stream)
+    setup_logging.start_logging()
+    setup_logging.start_logging()
+    setup_logging.logger.info("loaded %d songs", 3)
+    lines = flushed(log_stream)
+    assert len(lines) == 1
+    assert lines[0].endswith("INFO - loaded 3 songs")
+
+
+def test_records_are_written_directly_until_started(log_stream):
+    setup_logging.configure_logging(stream=log_stream)
+    setup_logging.logger.info("before the listener")
+    assert log_stream.getvalue().endswith("INFO - before the listener\n")
+
+
+def test_import_starts_no_listener_thread():
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = "import threading\nimport src.setup_logging\nprint(threading.active_count())\n"
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=repo_root, capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.strip() == "1"
+
+
+def test_json_output(log_stream):
+    setup_logging.configure_logging(json_output=True, stream=log_stream)
+    setup_logging.logger.error("no songs in %s", "songs.csv")
+    entry = json.loads(flushed(log_stream)[0])
+    assert entry["level"] == "ERROR"
+    assert entry["message"] == "no songs in songs.csv"
+
+
+def test_disabled_levels_are_not_formatted(log_stream):
+    class ExplodingArgument:
+        def __str__(self):
+            raise AssertionError("formatted a disabled message")
+
+    setup_logging.configure_logging(level=logging.WARNING, stream=log_stream)
+    setup_logging.logger.info("opening %s", ExplodingArgument())
+    assert flushed(log_stream) == []
+
+
+def test_browser_logs_url_without_logging_error(log_stream, monkeypatch):
+    setup_logging.configure_logging(stream=log_stream)
+    monkeypatch.setattr("webbrowser.get", lambda path: type("Controller", (), {"open": lambda self, url, new: True})())
+    Browser("chrome %s", setup_logging.logger).open_browser_with_url("https://www.youtube.com/watch?v=AQ4UffoLa0o")
+    assert flushed(log_stream)[0].endswith("opening https://www.youtube.com/watch?v=AQ4UffoLa0o with chrome %s")
@@ -0,0 +1,96 @@
+import os
+import sqlite3
+import pandas as pd
+import pytest
+from src.exceptions import EmptyPlaylistError
+from src.playlist_shared_utils import canonical_video_url, extract_video_id
+from src.read_handlers.readhandler import ReadHandler
+from src.songlibrary import SongLibrary
+
+
+class DummyLogger:
+    def __init__(self):
+        self.logs = []
+
+    def info(self, msg): self.logs.append(msg)
+
+    def error(self, msg): self.logs.append(msg)
+
+
+class DummyReadHandler(ReadHandler):
+    def __init__(self, source_file_name, songs):
+        super().__init__(DummyLogger(), source_file_name)
+        self.songs = songs
+        self.reads = 0
+
+    def get_songlist(self, source):
+        self.reads += 1
+        return self.songs
+
+    def iter_songs(self, source):
+        yield from zip(self.songs[self.SONG_NAME_COLUMN], self.songs[self.SONG_URL_COLUMN])
+
+
+def make_songs(rows):
+    return pd.DataFrame(rows, columns=[
+        ReadHandler.SONG_NAME_COLUMN, ReadHandler.SONG_URL_COLUMN, ReadHandler.SONG_ADD_DATE_COLUMN,
+        ReadHandler.SONG_FOLDER_COLUMN
+    ])
+
+
+@pytest.fixture
+def library():
+    conn = sqlite3.connect(":memory:")
+    yield SongLibrary(conn, DummyLogger())
+    conn.close()
+
+
+@pytest.fixture
+def source(tmp_path):
+    file = tmp_path / "bookmarks.html"
+    file.write_text("placeholder")
+    return file
+
+
+def test_canonical_video_url():
+    assert extract_video_id("https://youtu.be/AQ4UffoLa0o?t=3") == "AQ4UffoLa0o"
+    assert canonical_video_url("https://m.youtube.com/watch?v=AQ4UffoLa0o&list=PL1") == (
+        "https://www.youtube.com/watch?v=AQ4UffoLa0o"
+    )
+    assert canonical_video_url(" https://example.com/a ") == "https://example.com/a"
+
+
+def test_sync_imports_and_skips_unchanged_source(library, source):
+    handler = DummyReadHandler(str(source), make_songs([
+        ("Song1", "https://www.youtube.com/watch?v=AAAAAAAAAAA", 10, "Music"),
+        ("Song1 again", "https://youtu.be/AAAAAAAAAAA", 10, "Music"),
+        ("Song2", "https://www.youtube.com/watch?v=BBBBBBBBBBB", 20, "Music"),
+    ]))
+    assert library.sync(handler) == 2
+    assert len(library) == 2
+    assert library.sync(handler) == 0
+    assert handler.reads == 1
+
+
+def test_sync_only_writes_new_songs(library, source):
+    handler = DummyReadHandler(str(source), make_songs([
+        ("Song1", "https://www.youtube.com/watch?v=AAAAAAAAAAA", 10, ""),
+    ]))
+    library.sync(handler)
+    handler.songs = make_songs([
+        ("Song1", "https://www.youtube.com/watch?v=AAAAAAAAAAA", 10, ""),
+        ("Song2", "https://www.youtube.com/watch?v=BBBBBBBBBBB", 20, ""),
+    ])
+    os.utime(source, ns=(1, 1))
+    assert library.sync(handler) == 1
+    assert len(library) == 2
+
+
+def test_pick_random(library, source):
+    library.import_songs(make_songs([("Song1", "https://www.youtube.com/watch?v=AAAAAAAAAAA", 1, "")]), str(source))
+    assert library.pick_random() == ("Song1", "https://www.youtube.com/watch?v=AAAAAAAAAAA")
+
+
+def test_pick_random_empty_library(library):
+    with pytest.raises(EmptyPlaylistError):
+        library.pick_random()
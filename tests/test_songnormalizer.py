@@ -0,0 +1,114 @@
+import pandas as pd
+import pytest
+from src import songnormalizer
+from src.playlist import PlayList
+from src.songnormalizer import normalize_records, normalize_song, normalize_songs
+
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+class TableReadHandler:
+    read_file_name = "songs.csv"
+
+    def __init__(self, songs):
+        self.songs = songs
+
+    def get_songlist(self, source):
+        return self.songs
+
+
+@pytest.fixture
+def songs():
+    return pd.DataFrame({
+        "Song_Name": [
+            " Rock &amp; Roll &#39;Classic&#39; - YouTube",
+            "Short",
+            None,
+            "Not A Video",
+            "Plain",
+            "Embedded",
+        ],
+        "Song_URL": [
+            "https://m.youtube.com/watch?v=dQw4w9WgXcQ&list=PL123&t=30s",
+            "https://youtu.be/AQ4UffoLa0o?t=3",
+            "https://www.youtube.com/watch?v=XTgMJFuf7ls",
+            "https://example.com/watch?v=tooshort",
+            "https://www.youtube.com/watch?v=LiPjDQUJfSM",
+            " https://www.youtube.com/embed/aaaaaaaaaaa ",
+        ],
+        "Song_Folder": ["a", "b", "c", "d", "e", "f"],
+    })
+
+
+@pytest.fixture(params=["python", "pyarrow"])
+def string_storage(request, monkeypatch):
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow", exc_type=ImportError)
+    else:
+        monkeypatch.setattr(songnormalizer, "_string_dtype", lambda: pd.StringDtype("python"))
+    return request.param
+
+
+def test_normalize_drops_invalid_songs(songs, string_storage):
+    normalized = normalize_songs(songs)
+    assert normalized["Song_Name"].tolist() == ["Rock & Roll 'Classic'", "Short", "Plain", "Embedded"]
+    assert normalized["Song_URL"].tolist() == [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?v=AQ4UffoLa0o",
+        "https://www.youtube.com/watch?v=LiPjDQUJfSM",
+        "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+    ]
+    assert normalized["Song_Folder"].tolist() == ["a", "b", "e", "f"]
+    assert normalized.index.tolist() == [0, 1, 2, 3]
+    assert songs["Song_Name"].iat[0] == " Rock &amp; Roll &#39;Classic&#39; - YouTube"
+
+
+def test_normalize_keeps_invalid_songs_when_asked(songs, string_storage):
+    normalized = normalize_songs(songs, drop_invalid=False)
+    assert len(normalized) == 6
+    assert pd.isna(normalized["Song_Name"].iat[2])
+    assert normalized["Song_URL"].iat[3] == "https://example.com/watch?v=tooshort"
+    assert normalized["Song_Name"].iat[3] == "Not A Video"
+
+
+def test_normalize_leaves_tables_without_song_columns(songs):
+    assert normalize_songs(songs.iloc[0:0]) is not None
+    folders_only = songs[["Song_Folder"]]
+    assert normalize_songs(folders_only) is folders_only
+
+
+def test_read_songs_normalizes(songs):
+    playlist = PlayList(None, DummyLogger(), seed=1)
+    playlist.read_songlist_handler = TableReadHandler(songs)
+    assert len(playlist.read_songs()) == 4
+    playlist.drop_invalid_songs = False
+    assert len(playlist.read_songs()) == 6
+
+
+def test_normalize_song_matches_normalize_songs(songs):
+    expected = normalize_songs(songs)
+    assert [
+        song for song in map(normalize_song, songs["Song_Name"], songs["Song_URL"]) if song is not None
+    ] == list(zip(expected["Song_Name"], expected["Song_URL"]))
+
+
+def test_normalize_records_keeps_invalid_songs_as_strings(songs):
+    records = list(zip(songs["Song_Name"], songs["Song_URL"]))
+    assert len(list(normalize_records(records))) == 4
+    kept = list(normalize_records(records, drop_invalid=False))
+    assert kept[2] == ("", "https://www.youtube.com/watch?v=XTgMJFuf7ls")
+    assert kept[3] == ("Not A Video", "https://example.com/watch?v=tooshort")
+
+
+def test_compact_read_songs_normalizes(songs):
+    playlist = PlayList(None, DummyLogger(), seed=1)
+    playlist.compact_songs = True
+    playlist.read_songlist_handler = TableReadHandler(songs.assign(Song_URL=songs["Song_URL"].where(songs.index != 3)))
+    assert playlist.read_songs()[0] == ("Rock & Roll 'Classic'", "https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    assert len(playlist.songs) == 4
+    playlist.drop_invalid_songs = False
+    assert playlist.read_songs()[3] == ("Not A Video", "")
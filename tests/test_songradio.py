@@ -0,0 +1,160 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.exceptions import EmptyPlaylistError
+from src.playlist import PlayList
+from src.playlist_shared_utils import extract_video_id, queue_url
+from src import songradio
+from src.songradio import SongRadio
+
+NAMES = [
+    "Blade Runner Main Titles",
+    "Blade Runner Love Theme",
+    "Blade Runner Tears In Rain",
+    "Moonlight Sonata First Movement",
+    "Moonlight Sonata Third Movement",
+    "Bohemian Rhapsody",
+    "Stairway To Heaven",
+    "Hotel California",
+]
+FOLDERS = ["Soundtracks", "Soundtracks", "Soundtracks", "Classical", "Classical", "Rock", "Rock", "Rock"]
+VIDEO_IDS = ["AQ4UffoLa0o", "LiPjDQUJfSM", "XTgMJFuf7ls", "dQw4w9WgXcQ", "aaaaaaaaaaa", "bbbbbbbbbbb",
+             "ccccccccccc", "ddddddddddd"]
+
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+class DummyBrowser:
+    def __init__(self):
+        self.opened = []
+        self.pages = []
+
+    def open_browser_with_url(self, url):
+        self.opened.append(url)
+
+    def open_playlist_page(self, songs, page_file_name=None):
+        self.pages.append(songs)
+
+
+class SourceReadHandler:
+    def __init__(self, read_file_name):
+        self.read_file_name = read_file_name
+
+
+@pytest.fixture
+def songs():
+    return pd.DataFrame({
+        "Song_Name": NAMES,
+        "Song_URL": [f"https://www.youtube.com/watch?v={video_id}" for video_id in VIDEO_IDS],
+        "Song_Folder": FOLDERS,
+    })
+
+
+@pytest.fixture
+def most_similar_only(monkeypatch):
+    monkeypatch.setattr(songradio, "TOP_CHOICES", 1)
+
+
+def test_related_songs_come_first(most_similar_only):
+    radio = SongRadio()
+    radio.update(NAMES, FOLDERS)
+    sequence = radio.sequence(0, 3, np.random.default_rng(1))
+    assert sequence[0] == 0
+    assert set(sequence[1:]) == {1, 2}
+
+
+def test_sequence_has_no_repeats_and_skips():
+    radio = SongRadio()
+    radio.update(NAMES, FOLDERS)
+    sequence = radio.sequence(3, 20, np.random.default_rng(2), skip=[4])
+    assert len(sequence) == len(NAMES) - 1
+    assert len(set(sequence)) == len(sequence)
+    assert 4 not in sequence
+
+
+def test_lsh_candidates_hold_the_query_song(monkeypatch):
+    monkeypatch.setattr(songradio, "EXACT_SEARCH_SONGS", 0)
+    radio = SongRadio()
+    radio.update(NAMES, FOLDERS)
+    for position in range(len(NAMES)):
+        assert position in radio.candidates(radio.vectors[position].astype(np.float32), np.random.default_rng(0))
+
+
+def test_index_is_saved_and_reused(tmp_path, monkeypatch):
+    file_name = str(tmp_path / "songs.csv.radio.npz")
+    saved = SongRadio(file_name)
+    saved.update(NAMES, FOLDERS)
+    assert os.path.exists(file_name)
+
+    def fail_vectorize(self, texts):
+        raise AssertionError("the saved vectors should have been reused")
+
+    monkeypatch.setattr(SongRadio, "_vectorize", fail_vectorize)
+    reused = SongRadio(file_name)
+    reused.update(NAMES, FOLDERS)
+    np.testing.assert_array_equal(reused.vectors, saved.vectors)
+    np.testing.assert_array_equal(reused.keys, saved.keys)
+
+
+def test_update_vectorises_only_new_songs(tmp_path, monkeypatch, most_similar_only):
+    file_name = str(tmp_path / "songs.csv.radio.npz")
+    SongRadio(file_name).update(NAMES, FOLDERS)
+    vectorised = []
+    original_vectorize = SongRadio._vectorize
+
+    def counting_vectorize(self, texts):
+        vectorised.extend(texts)
+        return original_vectorize(self, texts)
+
+    monkeypatch.setattr(SongRadio, "_vectorize", counting_vectorize)
+    radio = SongRadio(file_name)
+    radio.update(["Blade Runner End Titles"] + NAMES, ["Soundtracks"] + FOLDERS)
+    assert vectorised == [" blade runner end titles soundtracks "]
+    assert len(radio) == len(NAMES) + 1
+    assert set(radio.sequence(0, 3, np.random.default_rng(3))[1:]) <= {1, 2, 3}
+
+
+def test_settings_mismatch_rebuilds(tmp_path):
+    file_name = str(tmp_path / "songs.csv.radio.npz")
+    radio = SongRadio(file_name)
+    radio.update(NAMES, FOLDERS)
+    with np.load(file_name) as saved:
+        arrays = dict(saved)
+    arrays["settings"] = arrays["settings"] + 1
+    np.savez(file_name, **arrays)
+    rebuilt = SongRadio(file_name)
+    rebuilt.update(NAMES, FOLDERS)
+    assert len(rebuilt) == len(NAMES)
+
+
+def test_playlist_play_radio_queues_related_songs(tmp_path, songs, most_similar_only):
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=4)
+    playlist.read_songlist_handler = SourceReadHandler(str(tmp_path / "songs.csv"))
+    playlist.songs = songs
+    played = playlist.play_radio(3, query="love theme")
+    assert [name for name, _ in played][0] == "Blade Runner Love Theme"
+    assert {name for name, _ in played[1:]} == {"Blade Runner Main Titles", "Blade Runner Tears In Rain"}
+    assert playlist.browser.opened == [queue_url([extract_video_id(url) for _, url in played])]
+    assert os.path.exists(str(tmp_path / "songs.csv.radio.npz"))
+
+
+def test_playlist_play_radio_skips_dead_links(songs):
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=5)
+    playlist.songs = songs
+    playlist.dead_links = {"https://www.youtube.com/watch?v=AQ4UffoLa0o"}
+    played = playlist.play_radio(len(NAMES), as_page=True)
+    assert len(played) == len(NAMES) - 1
+    assert "https://www.youtube.com/watch?v=AQ4UffoLa0o" not in [url for _, url in played]
+    assert playlist.browser.pages == [played]
+
+
+def test_playlist_play_radio_without_matches(songs):
+    playlist = PlayList(DummyBrowser(), DummyLogger())
+    playlist.songs = songs
+    with pytest.raises(EmptyPlaylistError):
+        playlist.play_radio(query="no such song")
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+from src.playlist import PlayList
+from src.playlist_write_handlers import CSVWriteHandler
+from src.songstore import SongStore
+
+SONGS = [
+    ("Song One", "https://www.youtube.com/watch?v=AQ4UffoLa0o"),
+    ("Sóng Twö", "https://youtu.be/LiPjDQUJfSM"),
+    ("Song Three", "https://www.youtube.com/watch?v=XTgMJFuf7ls&list=PL1"),
+    ("Not Music", "https://example.com/page"),
+]
+
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+
+    def error(self, msg, *args): pass
+
+
+class DummyBrowser:
+    def __init__(self):
+        self.opened = []
+
+    def open_browser_with_url(self, url):
+        self.opened.append(url)
+
+
+def test_round_trip_records():
+    store = SongStore.from_records(SONGS)
+    assert len(store) == 4
+    assert list(store) == SONGS
+    assert store[-1] == SONGS[-1]
+    with pytest.raises(IndexError):
+        store[4]
+
+
+def test_shared_prefix_is_interned():
+    store = SongStore.from_records(
+        (f"Song{i}", f"https://www.youtube.com/watch?v={i:011d}") for i in range(1000)
+    )
+    assert store._prefixes == ["https://www.youtube.com/watch?v="]
+    songs = store.to_dataframe()
+    assert store.nbytes < songs.memory_usage(deep=True).sum() / 4
+
+
+def test_dataframe_round_trip():
+    songs = pd.DataFrame(SONGS, columns=[SongStore.SONG_NAME_COLUMN, SongStore.SONG_URL_COLUMN])
+    assert SongStore.from_dataframe(songs).to_dataframe().equals(songs)
+
+
+def test_playlist_picks_from_song_store():
+    playlist = PlayList(DummyBrowser(), DummyLogger(), seed=1)
+    playlist.songs = SongStore.from_records(SONGS)
+    assert playlist.play_random()
+    assert playlist.browser.opened[0] in [url for _, url in SONGS]
+    assert set(playlist.pick_many(4, replace=False)) == set(SONGS)
+
+
+def test_write_handler_expands_song_store(tmp_path):
+    file = tmp_path / "songs.csv"
+    CSVWriteHandler(str(file)).write_songlist(SongStore.from_records(SONGS))
+    assert pd.read_csv(file)["Song_URL"].tolist() == [url for _, url in SONGS]
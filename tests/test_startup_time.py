@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = {"pandas", "numpy", "openpyxl"}
+# generous wall budget for importing the fast start path; a pandas import alone blows through it
+PICK_ONE_IMPORT_BUDGET_US = 400_000
+
+
+def import_times(module: str) -> dict:
+    """Imports a module in a fresh interpreter under -X importtime.
+
+    Args:
+        module (str): Dotted name of the module to import.
+
+    Returns:
+        dict: Cumulative import time in microseconds of every module imported, keyed on module name.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([REPO_ROOT, os.path.join(REPO_ROOT, "src")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", [
+    "src.pick_one",
+    "src.jukebox_client",
+    "src.main",
+    "src.read_handlers.readbookmarkshandler",
+    "src.read_handlers.readcsvhandler",
+    "src.read_handlers.readexcelhandler",
+])
+def test_fast_start_path_does_not_import_pandas(module):
+    times = import_times(module)
+    assert module in times
+    assert not HEAVY_MODULES & set(times)
+
+
+def test_playlist_defers_mode_indexes():
+    times = import_times("src.playlist")
+    assert not {"src.songradio", "src.songindex", "src.read_handlers.offsetindex"} & set(times)
+
+
+def test_pick_one_import_time_budget():
+    times = import_times("src.pick_one")
+    assert times["src.pick_one"] < PICK_ONE_IMPORT_BUDGET_US
+
+
+def test_get_song_records_without_pandas(tmp_path):
+    bookmarks = tmp_path / "bookmarks.html"
+    bookmarks.write_text('<DL><p>\n<DT><A HREF="https://www.youtube.com/watch?v=AQ4UffoLa0o">Song1</A>\n</DL><p>\n')
+    songs = tmp_path / "songs.csv"
+    songs.write_text("Index,Song_Name,Song_URL\n0,Song2,https://www.youtube.com/watch?v=LiPjDQUJfSM\n")
+    script = (
+        "import sys\n"
+        "from src.read_handlers.readbookmarkshandler import ReadBookmarksHandler\n"
+        "from src.read_handlers.readcsvhandler import ReadCSVHandler\n"
+        "from src.setup_logging import logger\n"
+        f"print(ReadBookmarksHandler(logger, 'x').get_song_records({str(bookmarks)!r}))\n"
+        f"print(ReadCSVHandler(logger, 'x').get_song_records({str(songs)!r}))\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([REPO_ROOT, os.path.join(REPO_ROOT, "src")]))
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.splitlines() == [
+        "[('Song1', 'https://www.youtube.com/watch?v=AQ4UffoLa0o')]",
+        "[('Song2', 'https://www.youtube.com/watch?v=LiPjDQUJfSM')]",
+        "False",
+    ]
@@ -0,0 +1,128 @@
+import os
+import pandas as pd
+import pytest
+from src.playlist_write_handlers import CSVWriteHandler, ExcelWriteHandler, MultiWriteHandler
+
+
+def make_songs(count):
+    return pd.DataFrame({
+        "Song_Name": [f"Song{i}" for i in range(count)],
+        "Song_URL": [f"https://www.youtube.com/watch?v={i:011d}" for i in range(count)],
+    })
+
+
+def test_unchanged_song_list_is_not_rewritten(tmp_path):
+    file = tmp_path / "songs.csv"
+    handler = CSVWriteHandler(str(file))
+    handler.write_songlist(make_songs(3))
+    os.utime(file, ns=(1, 1))
+    assert handler.write_songlist(make_songs(3))
+    assert os.stat(file).st_mtime_ns == 1
+    CSVWriteHandler(str(file), skip_unchanged=False).write_songlist(make_songs(3))
+    assert os.stat(file).st_mtime_ns != 1
+
+
+def test_append_writes_only_new_songs(tmp_path):
+    file = tmp_path / "songs.csv"
+    handler = CSVWriteHandler(str(file), append=True)
+    handler.write_songlist(make_songs(3))
+    handler.write_songlist(make_songs(5))
+    written = pd.read_csv(file)
+    assert written["Index"].tolist() == [0, 1, 2, 3, 4]
+    assert written["Song_Name"].tolist() == [f"Song{i}" for i in range(5)]
+
+
+def test_append_rewrites_when_earlier_songs_changed(tmp_path):
+    file = tmp_path / "songs.csv"
+    handler = CSVWriteHandler(str(file), append=True)
+    handler.write_songlist(make_songs(3))
+    changed = make_songs(4)
+    changed.loc[0, "Song_Name"] = "Renamed"
+    handler.write_songlist(changed)
+    assert pd.read_csv(file)["Song_Name"].tolist() == ["Renamed", "Song1", "Song2", "Song3"]
+
+
+def test_append_after_interrupted_write_does_not_duplicate(tmp_path, monkeypatch):
+    file = tmp_path / "songs.csv"
+    CSVWriteHandler(str(file), append=True).write_songlist(make_songs(3))
+
+    def die_before_fingerprint(self, row_hashes):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(CSVWriteHandler, "write_fingerprint", die_before_fingerprint)
+        with pytest.raises(KeyboardInterrupt):
+            CSVWriteHandler(str(file), append=True).write_songlist(make_songs(5))
+    CSVWriteHandler(str(file), append=True).write_songlist(make_songs(5))
+    assert pd.read_csv(file)["Song_Name"].tolist() == [f"Song{i}" for i in range(5)]
+
+
+def test_failed_write_leaves_existing_file(tmp_path, monkeypatch):
+    file = tmp_path / "songs.csv"
+    CSVWriteHandler(str(file)).write_songlist(make_songs(2))
+    before = file.read_text()
+
+    def fail_to_csv(self, *args, **kwargs):
+        raise IOError("disk full")
+
+    monkeypatch.setattr(pd.DataFrame, "to_csv", fail_to_csv)
+    with pytest.raises(IOError):
+        CSVWriteHandler(str(file)).write_songlist(make_songs(3))
+    assert file.read_text() == before
+    assert sorted(os.listdir(tmp_path)) == ["songs.csv", "songs.csv.fingerprint"]
+
+
+def test_failed_write_removes_temporary_file(tmp_path, monkeypatch):
+    file = tmp_path / "songs.xlsx"
+
+    def fail_mid_write(self, songs, file_name):
+        with open(file_name, "w") as partial_handle:
+            partial_handle.write("partial")
+        raise ValueError("cannot convert cell")
+
+    monkeypatch.setattr(ExcelWriteHandler, "_write_rows", fail_mid_write)
+    with pytest.raises(ValueError):
+        ExcelWriteHandler(str(file)).write_songlist(make_songs(3))
+    assert os.listdir(tmp_path) == []
+
+
+def test_excel_skips_unchanged(tmp_path):
+    file = tmp_path / "songs.xlsx"
+    handler = ExcelWriteHandler(str(file))
+    handler.write_songlist(make_songs(2))
+    os.utime(file, ns=(1, 1))
+    handler.write_songlist(make_songs(2))
+    assert os.stat(file).st_mtime_ns == 1
+    assert pd.read_excel(file)["Song_Name"].tolist() == ["Song0", "Song1"]
+
+
+def test_excel_streams_rows_like_to_excel(tmp_path):
+    songs = make_songs(25)
+    songs["Song_Folder"] = ["Synthwave", float("nan")] * 12 + ["Ambient"]
+    file = tmp_path / "songs.xlsx"
+    handler = ExcelWriteHandler(str(file))
+    handler.CHUNK_SIZE = 10
+    handler.write_songlist(songs)
+    written = pd.read_excel(file, index_col="Index")
+    pd.testing.assert_frame_equal(written, songs, check_names=False)
+
+
+def test_multi_write_handler_writes_every_output(tmp_path):
+    songs = make_songs(5)
+    handler = MultiWriteHandler([
+        ExcelWriteHandler(str(tmp_path / "songs.xlsx")),
+        CSVWriteHandler(str(tmp_path / "songs.csv")),
+    ])
+    assert handler.write_songlist(songs)
+    assert pd.read_excel(tmp_path / "songs.xlsx")["Song_Name"].tolist() == songs["Song_Name"].tolist()
+    assert pd.read_csv(tmp_path / "songs.csv")["Song_URL"].tolist() == songs["Song_URL"].tolist()
+
+
+def test_multi_write_handler_reports_a_failed_write(tmp_path):
+    handler = MultiWriteHandler([
+        CSVWriteHandler(str(tmp_path / "songs.csv")),
+        CSVWriteHandler(str(tmp_path / "songs.txt")),
+    ])
+    with pytest.raises(ValueError):
+        handler.write_songlist(make_songs(2))
+    assert (tmp_path / "songs.csv").exists()